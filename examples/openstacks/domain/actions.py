@@ -28,99 +28,121 @@ The state is described with following properties:
 from ipyhop import Actions
 from typing import List, Dict, Set
 
-def make_product( state, p, rigid ):
+# Every action has a precondition function with the same arguments, holding the type check and the preconditions of
+# the action. IPyHOP evaluates it on the current state before copying the state and applying the action.
+
+def make_product_precondition( state, p, rigid ):
     type_dict = rigid[ "type_dict" ]
     made = state.made
     started = state.started
     included_in = rigid[ "included_in" ]
     # type check
-    if type_check( [ p ], [ "product" ], type_dict ):
-        # preconditions
-        # p has not been made yet
-        # started all orders that contain p
-        if not( made[ p ] ) and all( [ started[ o ] for o in included_in[ p ] ] ):
-            # effects
-            # p is made
-            state.made[ p ] = True
-            return state
+    # preconditions
+    # p has not been made yet
+    # started all orders that contain p
+    return type_check( [ p ], [ "product" ], type_dict ) and \
+        ( not( made[ p ] ) and all( [ started[ o ] for o in included_in[ p ] ] ) )
 
-def start_order( state, o, rigid ):
+def make_product( state, p, rigid ):
+    if make_product_precondition( state, p, rigid ):
+        # effects
+        # p is made
+        state.made[ p ] = True
+        return state
+
+def start_order_precondition( state, o, rigid ):
     type_dict = rigid[ "type_dict" ]
     waiting = state.waiting
     stacks_open = state.stacks_open
     max_stacks = rigid[ "max_stacks"]
     # type check
-    if type_check( [ o ], [ "order" ], type_dict ):
-        # precondtions
-        # waiting on order
-        # fewer open stacks than the maximum
-        if waiting[ o ] and stacks_open < max_stacks:
-            # effects
-            # no longer waiting for order
-            state.waiting[ o ] = False
-            # started order
-            state.started[ o ] = True
-            # open new stack
-            state.stacks_open += 1
-            return state
+    # precondtions
+    # waiting on order
+    # fewer open stacks than the maximum
+    return type_check( [ o ], [ "order" ], type_dict ) and \
+        ( waiting[ o ] and stacks_open < max_stacks )
 
-def ship_order( state, o, rigid ):
+def start_order( state, o, rigid ):
+    if start_order_precondition( state, o, rigid ):
+        # effects
+        # no longer waiting for order
+        state.waiting[ o ] = False
+        # started order
+        state.started[ o ] = True
+        # open new stack
+        state.stacks_open += 1
+        return state
+
+def ship_order_precondition( state, o, rigid ):
     type_dict = rigid[ "type_dict" ]
     made = state.made
     started = state.started
     stacks_open = state.stacks_open
     includes = rigid[ "includes" ]
     # type check
-    if type_check( [ o ], [ "order" ], type_dict ):
-        # preconditions
-        # order is started
-        # all products included in order are made
-        # a stack is open
-        # print("SHIP")
-        # print( o )
-        # print( started[ o ] and all( [ made[ p ] for p in includes[ o ] ] ) and stacks_open > 0 )
-        if started[ o ] and all( [ made[ p ] for p in includes[ o ] ] ) and stacks_open > 0:
-            # effects
-            # order is no longer started
-            state.started[ o ] = False
-            # order is shipped
-            state.shipped[ o ] = True
-            # an open stack is closed
-            state.stacks_open -= 1
-            return state
+    # preconditions
+    # order is started
+    # all products included in order are made
+    # a stack is open
+    # print("SHIP")
+    # print( o )
+    # print( started[ o ] and all( [ made[ p ] for p in includes[ o ] ] ) and stacks_open > 0 )
+    return type_check( [ o ], [ "order" ], type_dict ) and \
+        ( started[ o ] and all( [ made[ p ] for p in includes[ o ] ] ) and stacks_open > 0 )
 
-# special replanning action
-def reset( state, o, rigid ):
+def ship_order( state, o, rigid ):
+    if ship_order_precondition( state, o, rigid ):
+        # effects
+        # order is no longer started
+        state.started[ o ] = False
+        # order is shipped
+        state.shipped[ o ] = True
+        # an open stack is closed
+        state.stacks_open -= 1
+        return state
+
+def reset_precondition( state, o, rigid ):
     started = state.started
     shipped = state.shipped
     type_dict = rigid[ "type_dict" ]
     waiting = state.waiting
     # type check
-    if type_check( [ o ], [ "order" ], type_dict ):
-        # preconditions
-        # o is started
-        # o is not shipped
-        # o is not waiting
-        if started[ o ] and not( shipped[ o ] ) and not( waiting[ o ] ):
-            # effects
-            # o is waiting
-            state.waiting[ o ] = True
-            # o is not started
-            state.started[ o ] = False
-            return state
+    # preconditions
+    # o is started
+    # o is not shipped
+    # o is not waiting
+    return type_check( [ o ], [ "order" ], type_dict ) and \
+        ( started[ o ] and not( shipped[ o ] ) and not( waiting[ o ] ) )
+
+# special replanning action
+def reset( state, o, rigid ):
+    if reset_precondition( state, o, rigid ):
+        # effects
+        # o is waiting
+        state.waiting[ o ] = True
+        # o is not started
+        state.started[ o ] = False
+        return state
 
 # action that exists for verify-orders to cause failure in plan when missing unshipped orders
-def verify_orders( state, multigoal, rigid ):
+def verify_orders_precondition( state, multigoal, rigid ):
     shipped = state.shipped
     want_shipped = multigoal.shipped
     need_shipped = { *want_shipped.items() } - { *shipped.items() }
     # print(need_shipped)
-    if len( need_shipped ) == 0:
+    return len( need_shipped ) == 0
+
+def verify_orders( state, multigoal, rigid ):
+    if verify_orders_precondition( state, multigoal, rigid ):
         return state
 
 # Create a IPyHOP Actions object. An Actions object stores all the actions defined for the planning domain.
 actions = Actions()
-actions.declare_actions( [ make_product, start_order, ship_order, reset, verify_orders ] )
+actions.declare_actions( [ make_product, start_order, ship_order, reset, verify_orders ],
+                         preconditions={ "make_product": make_product_precondition,
+                                         "start_order": start_order_precondition,
+                                         "ship_order": ship_order_precondition, "reset": reset_precondition,
+                                         "verify_orders": verify_orders_precondition } )
 
 p_fail = 1
 action_probability = {
@@ -13,6 +13,7 @@ task ('a_pickup', b).
 from typing import List, Dict, Set
 from examples.satellite.domain.actions import type_check
 import random
+from bisect import bisect_left, insort
 from functools import partial
 from networkx import dfs_preorder_nodes
 from copy import deepcopy
@@ -27,28 +28,75 @@ class shopfixer_deviation_handler():
         self.determine_deviation_time = 0
         self.deviation_max = 0
         self.base_probability = 0.1
+        self.deviation_operators = []
+        self.indexed_plan = None
+        self.indexed_plan_index = 0
 
     def determine_deviation( self, act_tuple, state ):
         start = time.process_time_ns()
-        # find all valid deviations in original plan
-        # print( act_insts )
-        deviation_states = []
-        # getting all valid deviation for current state and ation
+        # getting all valid deviation for current state and action
+        # deviation operators yield lightweight descriptors ( mutation, *args ), no state is copied here
+        # indexed operators only report their candidate count, a descriptor is built for the chosen candidate
+        candidates = []
+        self.deviation_state_count = 0
         for d_operator in self.deviation_operators:
-            for d_state in d_operator( act_tuple, state ):
-                if d_state is not None:
-                    deviation_states.append(d_state)
-        self.deviation_state_count = len( deviation_states )
+            if isinstance( d_operator, DeviationIndex ):
+                deviations = None
+                count = d_operator.count( act_tuple, state )
+            else:
+                deviations = [ *d_operator( act_tuple, state ) ]
+                count = len( deviations )
+            candidates.append( ( d_operator, deviations, count ) )
+            self.deviation_state_count += count
+        chosen_deviation = None
         if self.deviation_state_count > 0:
-            chosen_deviation = random.choice( deviation_states )
-        else:
-            chosen_deviation = None
+            # same draw as random.choice over all the deviations
+            k = random.randrange( self.deviation_state_count )
+            for d_operator, deviations, count in candidates:
+                if k < count:
+                    chosen_deviation = d_operator.get( k, state ) if deviations is None else deviations[ k ]
+                    break
+                k -= count
         self.chosen_deviation = chosen_deviation
         self.deviation_max = max(self.deviation_state_count, self.deviation_max)
         self.determine_deviation_time += time.process_time_ns() - start
 
+    def start_execution( self, state, plan ):
+        # called by MonteCarloExecutor before plan is executed from state
+        self.rebuild_indexes( state, plan, 0 )
+
+    def rebuild_indexes( self, state, plan, plan_index ):
+        start = time.process_time_ns()
+        self.indexed_plan = plan
+        self.indexed_plan_index = plan_index
+        for d_operator in self.deviation_operators:
+            if isinstance( d_operator, DeviationIndex ):
+                d_operator.rebuild( state )
+        self.determine_deviation_time += time.process_time_ns() - start
+
+    def update_indexes( self, plan_index, plan, state ):
+        # replay the writes of the actions executed since the last call on the candidate indexes
+        if plan is not self.indexed_plan or plan_index < self.indexed_plan_index:
+            self.rebuild_indexes( state, plan, plan_index )
+            return
+        start = time.process_time_ns()
+        indexes = [ d_operator for d_operator in self.deviation_operators if isinstance( d_operator, DeviationIndex ) ]
+        for act_tuple in plan[ self.indexed_plan_index:plan_index ]:
+            for index in indexes:
+                index.update( act_tuple, state )
+        self.indexed_plan_index = plan_index
+        self.determine_deviation_time += time.process_time_ns() - start
+
+    @staticmethod
+    def materialize_deviation( deviation, state ):
+        # only the chosen deviation is applied, to a copy of the state
+        new_state = state.copy()
+        deviation[ 0 ]( new_state, *deviation[ 1: ] )
+        return new_state
+
     def __call__( self, plan_index, plan, state ):
         # print( (act_tuple, self.chosen_pair[ 0 ]) )
+        self.update_indexes( plan_index, plan, state )
         self.determine_deviation( plan[plan_index], state )
         # regularize deviation possibility
         # we want states with many deviations to be more likely to produce a mutation
@@ -59,11 +107,39 @@ class shopfixer_deviation_handler():
             # we want all deviations over the course of the plan to trigger with equal likelihood
             have_deviation = random.uniform(0,1)
             if have_deviation < self.base_probability * self.deviation_state_count / self.deviation_max:
-                return self.chosen_deviation
+                new_state = self.materialize_deviation( self.chosen_deviation, state )
+                # the applied mutation is a write like any other
+                for d_operator in self.deviation_operators:
+                    if isinstance( d_operator, DeviationIndex ):
+                        d_operator.update( self.chosen_deviation, new_state )
+                return new_state
             else:
                 return state
 
 
+# incremental candidate set of a deviation operator
+# rebuilt once per execution, then kept up to date from the writes of the executed actions and applied deviations
+class DeviationIndex():
+    def __init__( self, rigid ):
+        self.rigid = rigid
+
+    # recompute all candidates from state
+    def rebuild( self, state ):
+        raise NotImplementedError
+
+    # act_tuple is an executed action or an applied deviation descriptor, state already contains its effects
+    def update( self, act_tuple, state ):
+        raise NotImplementedError
+
+    # number of deviations applicable for act_tuple in state
+    def count( self, act_tuple, state ):
+        raise NotImplementedError
+
+    # descriptor of the k-th deviation, in the order the equivalent deviation operator yields them
+    def get( self, k, state ):
+        raise NotImplementedError
+
+
 # openstacks deviation handler
 class deviation_handler( shopfixer_deviation_handler ):
 
@@ -72,10 +148,8 @@ class deviation_handler( shopfixer_deviation_handler ):
         self.deviation_operators = [
             # original says this can make unfixable plan, but still present and no work around given
             # d_unmake_product,
-            d_unship_order
+            UnshipOrderIndex( self.rigid )
         ]
-        self.deviation_operators = [ partial( d_operator, rigid=self.rigid ) for d_operator in
-                                     self.deviation_operators ]
 
 
 
@@ -89,9 +163,10 @@ def d_unmake_product( act_tuple, state, rigid ):
     # random.shuffle( products )
     for p in products:
         if made[ p ] and all([ not( shipped[ o ] ) for o in included_in[ p ] ] ):
-            new_state = state.copy()
-            new_state.made[ p ] = False
-            yield new_state
+            yield ( _d_unmake_product, p )
+
+def _d_unmake_product( state, p ):
+    state.made[ p ] = False
 
 def d_unship_order( act_tuple, state, rigid ):
     shipped = state.shipped
@@ -104,11 +179,44 @@ def d_unship_order( act_tuple, state, rigid ):
         # random.shuffle( orders )
         for o in orders:
             if shipped[ o ]:
-                new_state = state.copy()
-                new_state.started[ o ] = False
-                new_state.shipped[ o ] = False
-                new_state.waiting[ o ] = True
-                yield new_state
+                yield ( _d_unship_order, o )
+
+def _d_unship_order( state, o ):
+    state.started[ o ] = False
+    state.shipped[ o ] = False
+    state.waiting[ o ] = True
+
+# incremental version of d_unship_order
+# shipped orders are kept as positions in the order list so they are enumerated in d_unship_order order
+class UnshipOrderIndex( DeviationIndex ):
+    def __init__( self, rigid ):
+        super().__init__( rigid )
+        self.orders = [ *rigid[ "type_dict" ][ "order" ] ]
+        self.position = { o: i for i, o in enumerate( self.orders ) }
+        self.shipped = []
+
+    def rebuild( self, state ):
+        shipped = state.shipped
+        self.shipped = [ i for i, o in enumerate( self.orders ) if shipped[ o ] ]
+
+    def update( self, act_tuple, state ):
+        if act_tuple[ 0 ] == "ship_order" or act_tuple[ 0 ] is _d_unship_order:
+            self.recheck( act_tuple[ 1 ], state )
+
+    def recheck( self, o, state ):
+        i = self.position[ o ]
+        j = bisect_left( self.shipped, i )
+        indexed = j < len( self.shipped ) and self.shipped[ j ] == i
+        if state.shipped[ o ] and not indexed:
+            insort( self.shipped, i )
+        elif not state.shipped[ o ] and indexed:
+            del self.shipped[ j ]
+
+    def count( self, act_tuple, state ):
+        return len( self.shipped ) if state.stacks_open < self.rigid[ "max_stacks" ] else 0
+
+    def get( self, k, state ):
+        return ( _d_unship_order, self.orders[ self.shipped[ k ] ] )
 
 
 
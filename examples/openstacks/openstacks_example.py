@@ -7,7 +7,7 @@ File Description: Openstacks World example file. Run this file to solve the Open
 from examples.openstacks.domain.actions import actions
 from examples.openstacks.domain.methods import methods
 from examples.openstacks.domain.deviations import deviation_handler
-from ipyhop import IPyHOP, State
+from ipyhop import IPyHOP, State, Symbols, intern_bool_vars
 from ipyhop.mulitgoal import MultiGoal
 from ipyhop.actor import Actor
 from ipyhop.mc_executor import MonteCarloExecutor
@@ -18,7 +18,7 @@ import os
 # ******************************************        Helper Functions        ****************************************** #
 
 # create sat pyhop problem
-def init_openstacks( pddl_str, actions, methods ):
+def init_openstacks( pddl_str, actions, methods, compiled=False ):
     # create intial state
     state_0 = State("state_0")
     # create multigoal
@@ -78,6 +78,12 @@ def init_openstacks( pddl_str, actions, methods ):
     methods.multigoal_method_dict.update(
         { l: [ partial( m, rigid=rigid ) for m in ms ] for l, ms in methods.multigoal_method_dict.items() } )
     actions.action_dict.update( { l: partial( a, rigid=rigid ) for l, a in actions.action_dict.items() } )
+    actions.action_precond.update( { l: partial( p, rigid=rigid ) for l, p in actions.action_precond.items() } )
+    # compiled mode: objects are interned to integers and the boolean relations are stored as bitsets
+    if compiled:
+        symbols = Symbols()
+        intern_bool_vars( state_0, symbols )
+        intern_bool_vars( goal_a, symbols )
 
     goal_a.goal_tag = "mg_plan"
     return state_0, goal_a, rigid
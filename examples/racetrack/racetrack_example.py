@@ -10,6 +10,7 @@ from examples.racetrack.task_based.actions import actions
 from examples.racetrack.search.sample_probs import rect20, rect50, rectwall32a, twisty0
 from examples.racetrack.search.racetrack import main as search
 from examples.racetrack.search.sample_heuristics import h_esdist
+from examples.racetrack.search.segments import wall_grid
 from ipyhop import IPyHOP, MonteCarloExecutor, planar_plot, State
 from ipyhop.actor import Actor
 
@@ -19,6 +20,8 @@ def prob_to_state_and_task( prob ):
     init_state = State( 'init_state' )
     init_state.rigid = dict()
     init_state.rigid[ "walls" ] = tuple( [ tuple( x ) for x in prob[ 2: ][ 0 ] ] )
+    # spatial index of the walls for the crash and visibility tests, built once per problem
+    wall_grid( init_state.rigid )
     loc = prob[0]
     init_state.loc = loc
     f_line = tuple( prob[ 1 ] )
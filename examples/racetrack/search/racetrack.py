@@ -10,6 +10,7 @@ import examples.racetrack.search.tdraw as tdraw
 import turtle    # Code to use Python's "turtle drawing" package
 import math, sys
 import examples.racetrack.search.fsearch as fsearch
+import examples.racetrack.search.segments as segments
 import importlib
 
 
@@ -36,10 +37,13 @@ def main(problem, strategy, h, v_0=(0,0), verbose=2, draw=0, title=''):
     """
     s0 = (problem[0], v_0)    # initial state
     f_line = problem[1]
-    walls = problem[2]
+    # as a tuple, the walls are converted to an array once (see segments.segment_array)
+    walls = tuple(tuple(tuple(point) for point in wall) for wall in problem[2])
     # convert h, next_states, and goal_test to the one-arg functions fsearch wants
     h_for_fsearch = lambda state: h(state, f_line, walls)
-    next_for_fsearch = lambda state: [(s,1) for s in next_states(state,walls)]
+    # spatial index of the walls for the crash tests, built once per problem
+    wall_grid = segments.WallGrid(walls)
+    next_for_fsearch = lambda state: [(s,1) for s in next_states(state,wall_grid)]
     goal_for_fsearch = lambda state: goal_test(state,f_line)
 
     if draw:
@@ -73,25 +77,23 @@ def main(problem, strategy, h, v_0=(0,0), verbose=2, draw=0, title=''):
 
 def next_states(state,walls):
     """Return a list of states we can go to from state"""
-    states = []
     (loc,(vx,vy)) = state
+    candidates = []
     for dx in [0,-1,1]:
         for dy in [0,-1,1]:
             (wx,wy) = (vx+dx,vy+dy)
-            newloc = (loc[0]+wx,loc[1]+wy)
-            if not crash((loc,newloc),walls):
-                states.append((newloc,(wx,wy)))
-    return states
+            candidates.append(((loc[0]+wx,loc[1]+wy),(wx,wy)))
+    # all the moves are tested at once (walls can be a WallGrid)
+    crashed = segments.crashes(segments.moves_from(loc, [newloc for (newloc,w) in candidates]), walls)
+    return [candidate for (candidate,c) in zip(candidates,crashed) if not c]
 
 def goal_test(state,f_line):
     """Test whether state is on the finish line and has velocity (0,0)"""
     return state[1] == (0,0) and intersect((state[0],state[0]), f_line)
 
 def crash(move,walls):
-    """Test whether move intersects a wall in walls"""
-    for wall in walls:
-        if intersect(move,wall): return True
-    return False
+    """Test whether move intersects a wall in walls (a list of walls or a WallGrid over them)"""
+    return segments.crash(move,walls)
 
 
 def intersect(e1,e2):
@@ -21,6 +21,8 @@ the file nmoves.py, but (as explained in that file) I don't recommend using it.
 """
 
 import examples.racetrack.search.racetrack as racetrack
+import examples.racetrack.search.segments as segments
+import numpy as np
 import math
 import sys
 
@@ -56,6 +58,7 @@ infinity = float('inf')     # alternatively, we could import math.inf
 
 g_fline = False
 g_walls = False
+g_wall_grid = None
 grid = []
 
 
@@ -87,16 +90,26 @@ def h_walldist(state, fline, walls):
     if v < 0: sdv = -sdv
     sx = x + sdu
     sy = y + sdv
-    if racetrack.crash([(x,y),(sx,sy)],walls):
+    if racetrack.crash([(x,y),(sx,sy)],g_wall_grid):
         penalty += math.sqrt(au**2 + av**2)
     hval = max(hval+penalty,sd)
     return hval
 
 def edist_grid(fline,walls):
-    global grid, g_fline, g_walls, xmax, ymax
+    global grid, g_fline, g_walls, g_wall_grid, xmax, ymax
     xmax = max([max(x,x1) for ((x,y),(x1,y1)) in walls])
     ymax = max([max(y,y1) for ((x,y),(x1,y1)) in walls])
-    grid = [[edistw_to_finish((x,y), fline, walls) for y in range(ymax+1)] for x in range(xmax+1)]
+    xs, ys = np.meshgrid(np.arange(xmax+1), np.arange(ymax+1), indexing='ij')
+    points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+    # spatial index of the walls for the crash tests, built once per problem
+    g_wall_grid = segments.WallGrid(walls)
+    grid = edistw_to_finish_all(points, fline, g_wall_grid).reshape(xmax+1, ymax+1).tolist()
+    # clear[(dx,dy)][x][y] tells whether the move from (x,y) to (x+dx,y+dy) doesn't intersect a wall,
+    # all the moves are tested at once, each against the walls near it
+    offsets = [(dx,dy) for dx in (-1,0,1) for dy in (-1,0,1)]
+    moves = np.vstack([np.hstack([points, points + offset]) for offset in offsets])
+    crashed = segments.crashes(moves, g_wall_grid).reshape(len(offsets), xmax+1, ymax+1)
+    clear = {offset: (~crashed[i]).tolist() for (i,offset) in enumerate(offsets)}
     flag = True
     print('computing edist grid', end=' '); sys.stdout.flush()
     while flag:
@@ -106,7 +119,7 @@ def edist_grid(fline,walls):
             for y in range(ymax+1):
                 for y1 in range(max(0,y-1),min(ymax+1,y+2)):
                     for x1 in range(max(0,x-1),min(xmax+1,x+2)):
-                        if grid[x1][y1] != infinity and not racetrack.crash(((x,y),(x1,y1)),walls):
+                        if grid[x1][y1] != infinity and clear[(x1-x,y1-y)][x][y]:
                             if x == x1 or y == y1:
                                 d = grid[x1][y1] + 1
                             else:
@@ -129,16 +142,23 @@ def edistw_to_finish(point, fline, walls):
     """
 #   if min(x1,x2) <= x <= max(x1,x2) and  min(y1,y2) <= y <= max(y1,y2):
 #       return 0
-    (x,y) = point
+    return float(edistw_to_finish_all(np.asarray([point]), fline, walls)[0])
+
+
+def edistw_to_finish_all(points, fline, walls):
+    """
+    edistw_to_finish for each point of an (n,2) array of points, returned as an array of n distances.
+    The moves from all the points to all the points of fline are tested at once (walls can be a WallGrid).
+    """
     ((x1,y1),(x2,y2)) = fline
-    # make a list of distances to each reachable point in fline
     if x1 == x2:           # fline is vertical, so iterate over y
-        ds = [math.sqrt((x1-x)**2 + (y3-y)**2) \
-            for y3 in range(min(y1,y2),max(y1,y2)+1) \
-            if not racetrack.crash(((x,y),(x1,y3)), walls)]
+        f_points = [(x1,y3) for y3 in range(min(y1,y2),max(y1,y2)+1)]
     else:                  # fline is horizontal, so iterate over x
-        ds = [math.sqrt((x3-x)**2 + (y1-y)**2) \
-            for x3 in range(min(x1,x2),max(x1,x2)+1) \
-            if not racetrack.crash(((x,y),(x3,y1)), walls)]
-    ds.append(infinity)    # for the case where ds is empty
-    return min(ds)
+        f_points = [(x3,y1) for x3 in range(min(x1,x2),max(x1,x2)+1)]
+    f_points = np.asarray(f_points)
+    n, m = len(points), len(f_points)
+    moves = np.hstack([np.repeat(points, m, axis=0), np.tile(f_points, (n,1))])
+    crashed = segments.crashes(moves, walls).reshape(n, m)
+    ds = np.sqrt(((points[:,np.newaxis,:] - f_points[np.newaxis,:,:])**2).sum(axis=2))
+    # infinity for the points that can't reach fline without intersecting a wall
+    return np.where(crashed, infinity, ds).min(axis=1)
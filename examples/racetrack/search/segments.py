@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+"""
+File Description: Racetrack segments file. Vectorized segment intersection tests used for the crash and visibility
+checks of the Racetrack domain.
+
+A batch of segments (moves or walls) is an integer (or float) array of shape (n, 4), each row being
+(x_a, y_a, x_b, y_b). intersect_matrix tests every move of a batch against every wall of a batch in one array
+operation, with the same closed segment semantics as racetrack.intersect (touching at an end point or overlapping
+collinearly is an intersection), but computed exactly with integer orientation tests. A WallGrid (a uniform grid
+over the walls, built once per problem) restricts the tests of each move to the walls near it.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+import numpy as np
+
+# number of (move, wall) pairs tested per array operation, bounds the size of the temporary arrays
+CHUNK_PAIRS = 1 << 18
+
+# below this many (move, wall) pairs, a WallGrid tests a batch of moves against all the walls (which costs less)
+GRID_MIN_PAIRS = 1 << 11
+
+# walls tuple -> its segment array, for the walls tuple last converted (tuples of walls are never modified in place)
+_last_segments = [None, None]
+
+
+# ******************************************        Helper Functions        ****************************************** #
+def segment_array(segments) -> np.ndarray:
+    """
+    :param segments: Segments as ((x_a, y_a), (x_b, y_b)) pairs, or an array of shape (n, 4).
+    :return: The segments as an array of shape (n, 4). The array of the last tuple of segments converted is reused,
+        so walls given as a tuple (of tuples) are only converted once per problem. Lists are converted on every call.
+    """
+    if isinstance(segments, np.ndarray) and segments.ndim == 2 and segments.shape[1] == 4:
+        return segments
+    if _last_segments[0] is segments:
+        return _last_segments[1]
+    array = np.asarray(segments)
+    if array.dtype.kind in 'iub':
+        array = array.astype(np.int64)
+    else:
+        array = array.astype(float)
+    array = array.reshape(-1, 4)
+    if isinstance(segments, tuple):
+        _last_segments[0], _last_segments[1] = segments, array
+    return array
+
+
+def _orientation(ax, ay, bx, by, cx, cy) -> np.ndarray:
+    # sign of the cross product (b - a) x (c - a): 1 counterclockwise, -1 clockwise, 0 collinear
+    return np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+
+def _in_box(px, py, ax, ay, bx, by) -> np.ndarray:
+    # whether p is in the bounding box of segment a - b (inclusive)
+    return (np.minimum(ax, bx) <= px) & (px <= np.maximum(ax, bx)) & \
+        (np.minimum(ay, by) <= py) & (py <= np.maximum(ay, by))
+
+
+def _boxes(segments: np.ndarray) -> tuple:
+    # bounding boxes of a batch of segments, as the arrays (x_lo, y_lo, x_hi, y_hi)
+    return np.minimum(segments[:, 0], segments[:, 2]), np.minimum(segments[:, 1], segments[:, 3]), \
+        np.maximum(segments[:, 0], segments[:, 2]), np.maximum(segments[:, 1], segments[:, 3])
+
+
+def _intersect(x1a, y1a, x1b, y1b, x2a, y2a, x2b, y2b) -> np.ndarray:
+    # whether segments 1 and 2 intersect, elementwise over the broadcast coordinate arrays
+    o1 = _orientation(x1a, y1a, x1b, y1b, x2a, y2a)
+    o2 = _orientation(x1a, y1a, x1b, y1b, x2b, y2b)
+    o3 = _orientation(x2a, y2a, x2b, y2b, x1a, y1a)
+    o4 = _orientation(x2a, y2a, x2b, y2b, x1b, y1b)
+    # the end points of each segment are on different sides of (or on) the line of the other one
+    hit = (o1 != o2) & (o3 != o4)
+    # an end point of one segment is on the other segment (collinear and in its bounding box)
+    hit |= (o1 == 0) & _in_box(x2a, y2a, x1a, y1a, x1b, y1b)
+    hit |= (o2 == 0) & _in_box(x2b, y2b, x1a, y1a, x1b, y1b)
+    hit |= (o3 == 0) & _in_box(x1a, y1a, x2a, y2a, x2b, y2b)
+    hit |= (o4 == 0) & _in_box(x1b, y1b, x2a, y2a, x2b, y2b)
+    return hit
+
+
+def intersect_matrix(moves, walls) -> np.ndarray:
+    """
+    :param moves: Batch of m segments.
+    :param walls: Batch of w segments.
+    :return: Boolean array of shape (m, w), True where the move intersects the wall.
+    """
+    moves = segment_array(moves)
+    walls = segment_array(walls)
+    return _intersect(*(moves[:, i, np.newaxis] for i in range(4)), *(walls[np.newaxis, :, i] for i in range(4)))
+
+
+def intersect_pairs(moves, walls) -> np.ndarray:
+    """
+    :param moves: Batch of n segments.
+    :param walls: Batch of n segments.
+    :return: Boolean array of shape (n,), True where the i-th move intersects the i-th wall.
+    """
+    moves = segment_array(moves)
+    walls = segment_array(walls)
+    return _intersect(*(moves[:, i] for i in range(4)), *(walls[:, i] for i in range(4)))
+
+
+def crashes(moves, walls) -> np.ndarray:
+    """
+    :param moves: Batch of m segments, e.g. the moves from a point to many points.
+    :param walls: Batch of walls (a tuple of walls is converted once, see segment_array), or a WallGrid over them.
+    :return: Boolean array of shape (m,), True where the move intersects any wall.
+    """
+    if isinstance(walls, WallGrid):
+        return walls.crashes(moves)
+    moves = segment_array(moves)
+    walls = segment_array(walls)
+    result = np.zeros(moves.shape[0], dtype=bool)
+    if walls.shape[0] == 0:
+        return result
+    chunk = max(1, CHUNK_PAIRS // walls.shape[0])
+    for start in range(0, moves.shape[0], chunk):
+        result[start:start + chunk] = intersect_matrix(moves[start:start + chunk], walls).any(axis=1)
+    return result
+
+
+def crash(move, walls) -> bool:
+    """
+    :param move: A segment ((x_a, y_a), (x_b, y_b)).
+    :param walls: Batch of walls (a tuple of walls is converted once, see segment_array), or a WallGrid over them.
+    :return: True if move intersects any wall.
+    """
+    return bool(crashes(np.asarray(move).reshape(1, 4), walls)[0])
+
+
+def moves_from(point, points) -> np.ndarray:
+    """
+    :param point: Start point (x, y) of the moves.
+    :param points: Array of shape (n, 2) with the end points of the moves.
+    :return: Batch of the n moves from point to points.
+    """
+    points = np.asarray(points)
+    return np.hstack([np.broadcast_to(np.asarray(point, dtype=points.dtype), points.shape), points])
+
+
+def wall_grid(rigid: dict):
+    """
+    :param rigid: The rigid dict of a racetrack state, with the walls of the problem under "walls".
+    :return: The WallGrid over the walls, stored under "wall_grid" (it is built the first time).
+    """
+    if "wall_grid" not in rigid:
+        rigid["wall_grid"] = WallGrid(rigid["walls"])
+    return rigid["wall_grid"]
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class WallGrid(object):
+    """
+    Uniform grid over the walls of a racetrack problem. Every wall is registered in the cells its bounding box
+    overlaps, so a move is only tested against the walls registered in the cells its own bounding box overlaps
+    (instead of against all the walls). Batches of moves are still tested in a few array operations.
+
+    *   wall_grid = WallGrid(walls) builds the grid once per problem. It can be passed instead of the walls to crash
+        and crashes, e.g. state.rigid["wall_grid"] in the HTN methods, or the walls given to next_states by the
+        search based racetrack.
+
+    The grid is never modified, so copies (shallow or deep) of it are the grid itself.
+    """
+
+    def __init__(self, walls, cell_size: int = None):
+        """
+        WallGrid Constructor.
+
+        :param walls: Walls of the problem.
+        :param cell_size: [Optional] Side of the (square) cells. By default, the cells are chosen so that there are
+            about as many cells as walls.
+        """
+        self.walls = segment_array(walls)
+        n_walls = self.walls.shape[0]
+        if n_walls == 0:
+            self.walls = np.zeros((0, 4), dtype=np.int64)
+            corners = np.zeros((1, 2), dtype=np.int64)
+        else:
+            corners = self.walls.reshape(-1, 2)
+        self.origin = np.floor(corners.min(axis=0)).astype(np.int64)
+        extent = np.floor(corners.max(axis=0)).astype(np.int64) - self.origin + 1
+        if cell_size is None:
+            cell_size = int(np.ceil(np.sqrt(extent[0] * extent[1] / max(n_walls, 1))))
+        self.cell_size = max(int(cell_size), 1)
+        self.shape = tuple(int(n) for n in extent // self.cell_size + 1)
+        # (wall, cell) pairs, sorted by cell: the walls of cell c are cell_walls[cell_start[c]:cell_start[c + 1]]
+        self._boxes = _boxes(self.walls)
+        cell_ranges = self._cell_ranges(self._boxes)
+        wall_ids, cells_x, cells_y = self._expand(*cell_ranges)
+        cells = cells_x * self.shape[1] + cells_y
+        # first cell (x, y) and bounding box (x_lo, y_lo, x_hi, y_hi) of every wall
+        self._first_cells = (cell_ranges[0], cell_ranges[2])
+        order = np.argsort(cells, kind='stable')
+        self.cell_walls = wall_ids[order]
+        counts = np.bincount(cells, minlength=self.shape[0] * self.shape[1])
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)])
+        # 2D prefix sums of the wall counts of the cells, to count the candidate walls of a move in O(1)
+        self._count_prefix = np.zeros((self.shape[0] + 1, self.shape[1] + 1), dtype=np.int64)
+        self._count_prefix[1:, 1:] = counts.reshape(self.shape).cumsum(axis=0).cumsum(axis=1)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _cell_ranges(self, boxes: tuple):
+        # inclusive cell ranges (clipped to the grid) overlapped by the bounding boxes of segments, and whether each
+        # bounding box overlaps the grid at all
+        x_lo, y_lo, x_hi, y_hi = boxes
+        (ox, oy), size, (nx, ny) = self.origin, self.cell_size, self.shape
+        cx0 = np.floor_divide(x_lo - ox, size).astype(np.int64)
+        cx1 = np.floor_divide(x_hi - ox, size).astype(np.int64)
+        cy0 = np.floor_divide(y_lo - oy, size).astype(np.int64)
+        cy1 = np.floor_divide(y_hi - oy, size).astype(np.int64)
+        inside = (cx1 >= 0) & (cx0 < nx) & (cy1 >= 0) & (cy0 < ny)
+        return np.clip(cx0, 0, nx - 1), np.clip(cx1, 0, nx - 1), np.clip(cy0, 0, ny - 1), np.clip(cy1, 0, ny - 1), \
+            inside
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _expand(self, cx0, cx1, cy0, cy1, inside):
+        # (segment, cell) pairs of every cell in the cell range of every segment
+        n_cells = np.where(inside, (cx1 - cx0 + 1) * (cy1 - cy0 + 1), 0)
+        segment_ids = np.repeat(np.arange(n_cells.shape[0]), n_cells)
+        rank = np.arange(segment_ids.shape[0]) - np.repeat(np.cumsum(n_cells) - n_cells, n_cells)
+        cells_x, cells_y = np.divmod(rank, (cy1 - cy0 + 1)[segment_ids])
+        return segment_ids, cells_x + cx0[segment_ids], cells_y + cy0[segment_ids]
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def crashes(self, moves) -> np.ndarray:
+        """
+        :param moves: Batch of m segments.
+        :return: Boolean array of shape (m,), True where the move intersects any wall.
+        """
+        moves = segment_array(moves)
+        walls = self.walls
+        n_walls = walls.shape[0]
+        result = np.zeros(moves.shape[0], dtype=bool)
+        if n_walls == 0 or moves.shape[0] == 0:
+            return result
+        if moves.shape[0] * n_walls < GRID_MIN_PAIRS:
+            return crashes(moves, walls)
+        boxes = _boxes(moves)
+        cx0, cx1, cy0, cy1, inside = self._cell_ranges(boxes)
+        prefix = self._count_prefix
+        n_candidates = np.where(inside, prefix[cx1 + 1, cy1 + 1] - prefix[cx0, cy1 + 1] - prefix[cx1 + 1, cy0] +
+                                prefix[cx0, cy0], 0)
+        # moves whose cells hold (with repetitions) at least as many walls as there are are tested against all walls
+        dense = n_candidates >= n_walls
+        if dense.any():
+            result[dense] = crashes(moves[dense], walls)
+        sparse = np.flatnonzero(~dense & (n_candidates > 0))
+        chunk = max(1, CHUNK_PAIRS // n_walls)
+        for start in range(0, sparse.shape[0], chunk):
+            move_ids = sparse[start:start + chunk]
+            pair_move_ids, cells_x, cells_y = self._expand(cx0[move_ids], cx1[move_ids], cy0[move_ids],
+                                                           cy1[move_ids], inside[move_ids])
+            # (move, wall) pairs of the walls registered in the cells
+            cells = cells_x * self.shape[1] + cells_y
+            first = self.cell_start[cells]
+            n_pairs = self.cell_start[cells + 1] - first
+            pair_move_ids = np.repeat(move_ids[pair_move_ids], n_pairs)
+            rank = np.arange(pair_move_ids.shape[0]) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+            pair_wall_ids = self.cell_walls[np.repeat(first, n_pairs) + rank]
+            # a pair is kept in one cell only, the first cell of both cell ranges, and only if the bounding boxes of
+            # the move and the wall overlap
+            keep = np.repeat(cells_x, n_pairs) == np.maximum(cx0[pair_move_ids], self._first_cells[0][pair_wall_ids])
+            keep &= np.repeat(cells_y, n_pairs) == np.maximum(cy0[pair_move_ids], self._first_cells[1][pair_wall_ids])
+            for i in range(2):
+                keep &= boxes[i][pair_move_ids] <= self._boxes[i + 2][pair_wall_ids]
+                keep &= self._boxes[i][pair_wall_ids] <= boxes[i + 2][pair_move_ids]
+            pair_move_ids, pair_wall_ids = pair_move_ids[keep], pair_wall_ids[keep]
+            hit = intersect_pairs(moves[pair_move_ids], walls[pair_wall_ids])
+            result[pair_move_ids[hit]] = True
+        return result
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def crash(self, move) -> bool:
+        """
+        :param move: A segment ((x_a, y_a), (x_b, y_b)).
+        :return: True if move intersects any wall.
+        """
+        return bool(self.crashes(np.asarray(move).reshape(1, 4))[0])
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __copy__(self):
+        return self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __deepcopy__(self, memo):
+        return self
+
+
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    test_walls = [((0, 0), (10, 0)), ((10, 0), (10, 10))]
+    print(crashes(moves_from((5, 5), [(5, -5), (5, 0), (9, 9), (15, 5)]), test_walls))
+    print(crashes(moves_from((5, 5), [(5, -5), (5, 0), (9, 9), (15, 5)]), WallGrid(test_walls, cell_size=2)))
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+Organization: University of Maryland at College Park
+"""
@@ -16,6 +16,7 @@ The racetrack actions use three state variables:
 """
 
 from ipyhop import Actions
+from examples.racetrack.search import segments
 import numpy as np
 
 # all actions are usable on condition that there is no crash
@@ -23,7 +24,7 @@ import numpy as np
 def set_v( state, new_v ):
     loc = state.loc
     v = state.v
-    walls = state.rigid[ "walls" ]
+    walls = segments.wall_grid( state.rigid )
     # can only adjust v by one step
     if np.linalg.norm( np.asarray( new_v ) - np.asarray( v ) ) < 1.9:
         # location after one step
@@ -76,10 +77,8 @@ def goal_test(state, f_line):
 
 
 def crash(move, walls):
-    """Test whether move intersects a wall in walls"""
-    for wall in walls:
-        if intersect(move, wall): return True
-    return False
+    """Test whether move intersects a wall in walls (a list of walls or a WallGrid over them)"""
+    return segments.crash(move, walls)
 
 
 def intersect(e1, e2):
@@ -8,11 +8,13 @@ in which the first argument is the class instance). The rest of the arguments mu
 task that the method is for. For example, the task ('get', b1) has a method "tm_get(state, b1)", as shown below.
 """
 from typing import List
+from heapq import heapify, heappop, heappush
 
 import numpy as np
 
 from ipyhop import Methods
-from examples.racetrack.search.racetrack import crash, intersect, goal_test
+from examples.racetrack.search.racetrack import intersect, goal_test
+from examples.racetrack.search.segments import crashes, moves_from, wall_grid
 from examples.racetrack.search.racetrack import main as search
 from examples.racetrack.search.sample_heuristics import h_esdist
 import numpy
@@ -33,13 +35,31 @@ def get_next_possible_attitude( loc, v, walls ):
     new_locs = np.asarray( loc ) + new_vs
     # print(new_loc)
     # print(new_loc in vis_points)
-    for i in range( new_locs.shape[ 0 ] ):
-        new_loc = tuple( new_locs[ i ] )
-        new_v = tuple( new_vs[ i ] )
-        if not crash( ( loc, new_loc ), walls ):
-            pos_next_attitude[ new_loc ] = new_v
+    # test the moves to all the next locations at once (walls can be a WallGrid)
+    crashed = crashes( moves_from( loc, new_locs ), walls )
+    for i in np.flatnonzero( ~crashed ):
+        pos_next_attitude[ tuple( new_locs[ i ].tolist() ) ] = tuple( new_vs[ i ].tolist() )
     return pos_next_attitude
 
+# shortest distances to the source points over the weighted edges ( Dijkstra with a binary heap, O(E log V) )
+def shortest_dists( edges, sources ):
+    dists = dict()
+    best = { pt: 0.0 for pt in sources }
+    heap = [ ( 0.0, pt ) for pt in best ]
+    heapify( heap )
+    while heap:
+        dist, curr_pt = heappop( heap )
+        # skip stale entries of points already settled with a shorter distance
+        if curr_pt in dists:
+            continue
+        dists[ curr_pt ] = dist
+        for pt, length in edges.get( curr_pt, () ):
+            new_dist = dist + length
+            if pt not in dists and new_dist < best.get( pt, np.inf ):
+                best[ pt ] = new_dist
+                heappush( heap, ( new_dist, pt ) )
+    return dists
+
 # ******************************************        Method Definitions        **************************************** #
 
 # Create a IPyHOP Methods object. A Methods object stores all the methods defined for the planning domain.
@@ -68,6 +88,13 @@ def tm_generate_visibility_graph(state, f_line):
     # get all points in problem
     loc = state.loc
     walls = state.rigid[ "walls" ]
+    # replanning from a point of the cached visibility graph reuses it and its distances, the cache is stored in
+    # state.rigid ( like the wall grid ) so it is kept per problem, as f_line -> visibility graph, distances and goals
+    cached = state.rigid.get( "vis_cache", dict() ).get( f_line )
+    if cached is not None and loc in cached[ "dist_dict" ]:
+        state.rigid.update( cached )
+        return [ ( "hill_climb", ) ]
+    wall_index = wall_grid( state.rigid )
     wall_points = set()
     for line in walls:
         wall_points.add( line[ 0 ] )
@@ -90,7 +117,10 @@ def tm_generate_visibility_graph(state, f_line):
     points_array = points_array[ :, :, np.newaxis ] + np.transpose( offset )[ np.newaxis, : , :]
     points_array = np.reshape( points_array, ( points_array.shape[ 0 ] * points_array.shape[ 2 ], points_array.shape[ 1 ] ), order="F" )
 
-    points = { tuple( pt ) for pt in points_array }
+    points = { tuple( pt ) for pt in points_array.tolist() }
+    # candidate end points in the iteration order of points, tested against the walls near each move
+    point_list = [ *points ]
+    point_list_array = np.asarray( point_list )
     # points_array = []
     # for pt in points:
     #     adj_pts = np.asarray( pt ) + offset
@@ -100,71 +130,53 @@ def tm_generate_visibility_graph(state, f_line):
 
     # generate visibility graph
     vis_graph = dict()
+    # visible point -> [ ( pt, length of the edge to pt ), ... ]
+    vis_edges = dict()
     start_pt = loc
     unexpanded_pts = [ start_pt ]
-    visited_pts = set()
+    # points that are or were in unexpanded_pts
+    encountered_pts = { start_pt }
     # continue expansion until all nodes reachable by start
     while unexpanded_pts != []:
-        print(len(visited_pts))
         curr_pt = unexpanded_pts.pop()
-        visited_pts.add( curr_pt )
         vis_graph[ curr_pt ] = set()
         # rng = np.random.default_rng()
         # N = 1
         # check each int point in bounding box for visibility
-        for pt in points:
-            move = ( curr_pt, pt )
-            # print( move )
-            # print( crash( move, walls ) )
-            # visible if move would not cause crash
-            if not crash( move, walls ):
-                vis_graph[ curr_pt ].add( pt )
-                # if pt in vis_graph.keys():
-                #     vis_graph[ pt ].add( curr_pt )
-                # else:
-                #     vis_graph[ pt ] = { curr_pt }
-                # add node to unexpanded if not previously encountered
-                if pt not in visited_pts and pt not in unexpanded_pts:
-                    unexpanded_pts.append( pt )
+        # visible if move would not cause crash
+        crashed = crashes( moves_from( curr_pt, point_list_array ), wall_index )
+        visible = np.flatnonzero( ~crashed )
+        # lengths of the edges to all the visible points at once
+        lengths = np.sqrt( ( ( point_list_array[ visible ] - np.asarray( curr_pt ) ) ** 2 ).sum( axis=1 ) )
+        vis_edges[ curr_pt ] = [ ( point_list[ i ], length ) for i, length in zip( visible, lengths.tolist() ) ]
+        for i in visible:
+            pt = point_list[ i ]
+            vis_graph[ curr_pt ].add( pt )
+            # if pt in vis_graph.keys():
+            #     vis_graph[ pt ].add( curr_pt )
+            # else:
+            #     vis_graph[ pt ] = { curr_pt }
+            # add node to unexpanded if not previously encountered
+            if pt not in encountered_pts:
+                encountered_pts.add( pt )
+                unexpanded_pts.append( pt )
     # no path exists
     if all(  [ goal_pt not in vis_graph.keys() for goal_pt in goal_pts ] ):
         print("No GOAL PT IN VIS_GRAPH")
         print( goal_pts )
         print(vis_graph.keys())
         return
-    # iterate over points in visibility graph to get minimum distance to
-    # create dict of min distance to start point of finish line
-    dist_dict = dict()
-    # start with points directly reachable by finish line start
-    unexpanded_pts = [ *goal_pts ]
-    dist_dict.update( { pt: 0 for pt in goal_pts } )
-    visited_pts = set()
-    # continue expansion until all nodes have min cost
-    while unexpanded_pts != []:
-        curr_pt = unexpanded_pts.pop()
-        visited_pts.add( curr_pt )
-        # get visible points
-        vis_points = vis_graph[ curr_pt ]
-        # print("DIST_DICT CALC")
-        # print(vis_points)
-        # get distance to visible points
-        dist_to = { pt: np.linalg.norm( np.asarray( curr_pt ) - np.asarray( pt ) )
-                      for pt in vis_points }
-        dist_from = dist_dict[ curr_pt ]
-        # update dist_dict for all visible points
-        for pt in vis_points:
-            dist = dist_to[ pt ] + dist_from
-            if pt in dist_dict.keys():
-                dist_dict[ pt ] = min( dist_dict[ pt ], dist )
-            else:
-                dist_dict[ pt ] = dist
-                unexpanded_pts.append( pt )
+    # dict of min distance to the finish line of all the points in the visibility graph
+    # ( visibility is symmetric, so the edges from a point are also the edges to it )
+    dist_dict = shortest_dists( vis_edges, goal_pts )
     if loc not in dist_dict.keys():
         print( "LOC NOT IN DIST_DICT")
         print( dist_dict.keys() )
         return
     state.rigid[ "vis_graph" ] = vis_graph
     state.rigid[ "dist_dict" ] = dist_dict
+    state.rigid.setdefault( "vis_cache", dict() )[ f_line ] = { "vis_graph": vis_graph, "dist_dict": dist_dict,
+                                                                "goal_pts": goal_pts }
     return [ ("hill_climb",) ]
 
 methods.declare_task_methods( "generate_visibility_graph", [tm_generate_visibility_graph])
@@ -207,7 +219,7 @@ def move_to( state, target_loc, stop_at=False, depth=1 ):
     print(depth)
     loc = state.loc
     v = state.v
-    walls= state.rigid[ "walls" ]
+    walls= wall_grid( state.rigid )
     # vis_graph = state.vis_graph
     state_chains = { ( ( loc, v ), ) }
     unique_states = { ( loc, v ) }
@@ -45,26 +45,33 @@ The state is described with following properties:
 from ipyhop import Actions
 from typing import List, Dict, Set
 
-def navigate( state, r, p_0, p_1, rigid ):
+# Every action (but retract) has a precondition function with the same arguments, holding the type check and the
+# preconditions of the action. IPyHOP evaluates it on the current state before copying the state and applying the
+# action.
+
+def navigate_precondition( state, r, p_0, p_1, rigid ):
     type_dict = rigid[ "type_dict" ]
     can_traverse = rigid[ "can_traverse" ]
     available = state.available
     at = state.at
     visible = rigid[ "visible" ]
     # type check
-    if type_check( [ r, p_0, p_1 ], [ "rover", "waypoint", "waypoint" ], type_dict ):
-        # preconditions
-        # r can traverse from p_0 to p_1
-        # r is available
-        # r is at p_0
-        # w_1 is visible from p_0
-        if r in available and at[ r ] == p_0 and p_1 in visible[ p_0 ] and (p_0, p_1) in can_traverse[ r ]:
-            # effects
-            # location of r is now p_1
-            state.at[ r ] = p_1
-            return state
+    # preconditions
+    # r can traverse from p_0 to p_1
+    # r is available
+    # r is at p_0
+    # w_1 is visible from p_0
+    return type_check( [ r, p_0, p_1 ], [ "rover", "waypoint", "waypoint" ], type_dict ) and \
+        ( r in available and at[ r ] == p_0 and p_1 in visible[ p_0 ] and (p_0, p_1) in can_traverse[ r ] )
 
-def sample_soil( state, r, s, p, rigid ):
+def navigate( state, r, p_0, p_1, rigid ):
+    if navigate_precondition( state, r, p_0, p_1, rigid ):
+        # effects
+        # location of r is now p_1
+        state.at[ r ] = p_1
+        return state
+
+def sample_soil_precondition( state, r, s, p, rigid ):
     type_dict = rigid[ "type_dict" ]
     at = state.at
     at_soil_sample = state.at_soil_sample
@@ -72,27 +79,30 @@ def sample_soil( state, r, s, p, rigid ):
     store_of = rigid[ "store_of" ]
     empty = state.empty
     # type check
-    if type_check( [ r, s, p ], [ "rover", "store", "waypoint" ], type_dict ):
-        # preconditions
-        # r is at p
-        # p is at soil sample
-        # r is equipped for soil analysis
-        # s is a store of r
-        # s is empty
-        if s in empty and equipped_for_soil_analysis[ r ] and \
-                p in at_soil_sample and at[ r ] == p and store_of[ s ] == r:
-            # effects
-            # s is not emptu
-            # s is full
-            # have soil analysis ( r, p )
-            # p is not at soil_sample
-            state.empty.remove( s )
-            state.full.add( s )
-            state.have_soil_analysis[ r ].add( p )
-            state.at_soil_sample.remove( p )
-            return state
+    # preconditions
+    # r is at p
+    # p is at soil sample
+    # r is equipped for soil analysis
+    # s is a store of r
+    # s is empty
+    return type_check( [ r, s, p ], [ "rover", "store", "waypoint" ], type_dict ) and \
+        ( s in empty and equipped_for_soil_analysis[ r ] and
+          p in at_soil_sample and at[ r ] == p and store_of[ s ] == r )
 
-def sample_rock( state, r, s, p, rigid ):
+def sample_soil( state, r, s, p, rigid ):
+    if sample_soil_precondition( state, r, s, p, rigid ):
+        # effects
+        # s is not emptu
+        # s is full
+        # have soil analysis ( r, p )
+        # p is not at soil_sample
+        state.empty.remove( s )
+        state.full.add( s )
+        state.have_soil_analysis[ r ].add( p )
+        state.at_soil_sample.remove( p )
+        return state
+
+def sample_rock_precondition( state, r, s, p, rigid ):
     type_dict = rigid[ "type_dict" ]
     at = state.at
     at_rock_sample = state.at_rock_sample
@@ -100,44 +110,50 @@ def sample_rock( state, r, s, p, rigid ):
     store_of = rigid[ "store_of" ]
     empty = state.empty
     # type check
-    if type_check( [ r, s, p ], [ "rover", "store", "waypoint" ], type_dict ):
-        # preconditions
-        # r is at p
-        # p is at rock sample
-        # r is equipped for rock analysis
-        # s is a store of r
-        # s is empty
-        if s in empty and equipped_for_rock_analysis[ r ] and \
-                p in at_rock_sample and at[ r ] == p and store_of[ s ] == r:
-            # effects
-            # s is not emptu
-            # s is full
-            # have rock analysis ( r, p )
-            # p is not at rock_sample
-            state.empty.remove( s )
-            state.full.add( s )
-            state.have_rock_analysis[ r ].add( p )
-            state.at_rock_sample.remove( p )
-            return state
+    # preconditions
+    # r is at p
+    # p is at rock sample
+    # r is equipped for rock analysis
+    # s is a store of r
+    # s is empty
+    return type_check( [ r, s, p ], [ "rover", "store", "waypoint" ], type_dict ) and \
+        ( s in empty and equipped_for_rock_analysis[ r ] and
+          p in at_rock_sample and at[ r ] == p and store_of[ s ] == r )
 
-def drop( state, r, s, rigid ):
+def sample_rock( state, r, s, p, rigid ):
+    if sample_rock_precondition( state, r, s, p, rigid ):
+        # effects
+        # s is not emptu
+        # s is full
+        # have rock analysis ( r, p )
+        # p is not at rock_sample
+        state.empty.remove( s )
+        state.full.add( s )
+        state.have_rock_analysis[ r ].add( p )
+        state.at_rock_sample.remove( p )
+        return state
+
+def drop_precondition( state, r, s, rigid ):
     type_dict = rigid[ "type_dict" ]
     store_of = rigid[ "store_of" ]
     full = state.full
     # type check
-    if type_check( [ r, s ], [ "rover", "store" ], type_dict ):
-        # preconditions
-        # s is store of r
-        # s is full
-        if s in full and store_of[ s ] == r:
-            # effects
-            # s is not full
-            # s is empty
-            state.full.remove( s )
-            state.empty.add( s )
-            return state
+    # preconditions
+    # s is store of r
+    # s is full
+    return type_check( [ r, s ], [ "rover", "store" ], type_dict ) and \
+        ( s in full and store_of[ s ] == r )
 
-def calibrate( state, r, i, t, w, rigid ):
+def drop( state, r, s, rigid ):
+    if drop_precondition( state, r, s, rigid ):
+        # effects
+        # s is not full
+        # s is empty
+        state.full.remove( s )
+        state.empty.add( s )
+        return state
+
+def calibrate_precondition( state, r, i, t, w, rigid ):
     type_dict = rigid[ "type_dict" ]
     equipped_for_imaging = rigid[ "equipped_for_imaging" ]
     calibration_target = rigid[ "calibration_target" ]
@@ -145,21 +161,24 @@ def calibrate( state, r, i, t, w, rigid ):
     visible_from = state.visible_from
     on_board = rigid[ "on_board" ]
     # type check
-    if type_check( [ r, i, t, w ], [ "rover", "camera", "objective", "waypoint" ], type_dict ):
-        # preconditions
-        # r is equipped for imagining
-        # t is the calibration target of i
-        # r is at w
-        # t is visible from w
-        # i is on r
-        if equipped_for_imaging[ r ] and calibration_target[ i ] == t and at[ r ] == w and \
-            on_board[ i ] == r and w in visible_from[ t ]:
-            # effects
-            # calibrate i on r
-            state.calibrated[ ( i, r ) ] = True
-            return state
+    # preconditions
+    # r is equipped for imagining
+    # t is the calibration target of i
+    # r is at w
+    # t is visible from w
+    # i is on r
+    return type_check( [ r, i, t, w ], [ "rover", "camera", "objective", "waypoint" ], type_dict ) and \
+        ( equipped_for_imaging[ r ] and calibration_target[ i ] == t and at[ r ] == w and
+          on_board[ i ] == r and w in visible_from[ t ] )
 
-def take_image( state, r, p, o, i, m, rigid ):
+def calibrate( state, r, i, t, w, rigid ):
+    if calibrate_precondition( state, r, i, t, w, rigid ):
+        # effects
+        # calibrate i on r
+        state.calibrated[ ( i, r ) ] = True
+        return state
+
+def take_image_precondition( state, r, p, o, i, m, rigid ):
     type_dict = rigid[ "type_dict" ]
     equipped_for_imaging = rigid[ "equipped_for_imaging" ]
     at = state.at
@@ -169,23 +188,26 @@ def take_image( state, r, p, o, i, m, rigid ):
     supports = rigid[ "supports" ]
 
     # type check
-    if type_check( [ r, p, o, i , m ], [ "rover", "waypoint", "objective", "camera", "mode" ], type_dict ):
-        # preconditions
-        # i on r calibrated
-        # i on r
-        # i supports m
-        # o visible from p
-        # r at p
-        if calibrated[ ( i, r ) ] and equipped_for_imaging[ r ] and on_board[ i ] == r and at[ r ] == p and \
-            m in supports[ i ] and p in visible_from[ o ]:
-            # effects
-            # r has image ( o, m )
-            # ( i, r ) no longer calibrated
-            state.have_image[ r ].add( ( o, m ) )
-            state.calibrated[ ( i, r ) ] = False
-            return state
+    # preconditions
+    # i on r calibrated
+    # i on r
+    # i supports m
+    # o visible from p
+    # r at p
+    return type_check( [ r, p, o, i , m ], [ "rover", "waypoint", "objective", "camera", "mode" ], type_dict ) and \
+        ( calibrated[ ( i, r ) ] and equipped_for_imaging[ r ] and on_board[ i ] == r and at[ r ] == p and
+          m in supports[ i ] and p in visible_from[ o ] )
 
-def communicate_soil_data( state, r, l, p_0, p_1, p_2, rigid ):
+def take_image( state, r, p, o, i, m, rigid ):
+    if take_image_precondition( state, r, p, o, i, m, rigid ):
+        # effects
+        # r has image ( o, m )
+        # ( i, r ) no longer calibrated
+        state.have_image[ r ].add( ( o, m ) )
+        state.calibrated[ ( i, r ) ] = False
+        return state
+
+def communicate_soil_data_precondition( state, r, l, p_0, p_1, p_2, rigid ):
     type_dict = rigid[ "type_dict" ]
     at = state.at
     visible= rigid[ "visible" ]
@@ -194,24 +216,28 @@ def communicate_soil_data( state, r, l, p_0, p_1, p_2, rigid ):
     available = state.available
     channel_free = state.channel_free
     # type check
-    if type_check( [ r, l, p_0, p_1, p_2 ], [ "rover", "lander", "waypoint", "waypoint", "waypoint" ], type_dict ):
-        # preconditions
-        # r at p_1
-        # l at p_2
-        # have soil analysis ( r, p_0 )
-        # p_2 visible from p_1
-        # r available
-        # l has free channel
-        if r in available  and at[ r ] == p_1 and at_lander[ l ] == p_2 and l in channel_free and \
-                p_0 in have_soil_analysis[ r ] and p_2 in visible[ p_1 ]:
-            # effects
-            # soil data of p_0 has been communicated
-            state.communicated_soil_data[ p_0 ] = True
-            state.available.add( r )
-            state.channel_free.add( l )
-            return state
+    # preconditions
+    # r at p_1
+    # l at p_2
+    # have soil analysis ( r, p_0 )
+    # p_2 visible from p_1
+    # r available
+    # l has free channel
+    return type_check( [ r, l, p_0, p_1, p_2 ], [ "rover", "lander", "waypoint", "waypoint", "waypoint" ],
+                       type_dict ) and \
+        ( r in available  and at[ r ] == p_1 and at_lander[ l ] == p_2 and l in channel_free and
+          p_0 in have_soil_analysis[ r ] and p_2 in visible[ p_1 ] )
 
-def communicate_rock_data( state, r, l, p_0, p_1, p_2, rigid ):
+def communicate_soil_data( state, r, l, p_0, p_1, p_2, rigid ):
+    if communicate_soil_data_precondition( state, r, l, p_0, p_1, p_2, rigid ):
+        # effects
+        # soil data of p_0 has been communicated
+        state.communicated_soil_data[ p_0 ] = True
+        state.available.add( r )
+        state.channel_free.add( l )
+        return state
+
+def communicate_rock_data_precondition( state, r, l, p_0, p_1, p_2, rigid ):
     type_dict = rigid[ "type_dict" ]
     at = state.at
     visible= rigid[ "visible" ]
@@ -220,24 +246,28 @@ def communicate_rock_data( state, r, l, p_0, p_1, p_2, rigid ):
     available = state.available
     channel_free = state.channel_free
     # type check
-    if type_check( [ r, l, p_0, p_1, p_2 ], [ "rover", "lander", "waypoint", "waypoint", "waypoint" ], type_dict ):
-        # preconditions
-        # r at p_1
-        # l at p_2
-        # have rock analysis ( r, p_0 )
-        # p_2 visible from p_1
-        # r available
-        # l has free channel
-        if r in available and at[ r ] == p_1 and at_lander[ l ] == p_2 and l in channel_free and \
-                p_0 in have_rock_analysis[ r ] and p_2 in visible[ p_1 ]:
-            # effects
-            # rock data of p_0 has been communicated
-            state.communicated_rock_data[ p_0 ] = True
-            state.available.add( r )
-            state.channel_free.add( l )
-            return state
+    # preconditions
+    # r at p_1
+    # l at p_2
+    # have rock analysis ( r, p_0 )
+    # p_2 visible from p_1
+    # r available
+    # l has free channel
+    return type_check( [ r, l, p_0, p_1, p_2 ], [ "rover", "lander", "waypoint", "waypoint", "waypoint" ],
+                       type_dict ) and \
+        ( r in available and at[ r ] == p_1 and at_lander[ l ] == p_2 and l in channel_free and
+          p_0 in have_rock_analysis[ r ] and p_2 in visible[ p_1 ] )
 
-def communicate_image_data( state, r, l, o, m, p_0, p_1, rigid ):
+def communicate_rock_data( state, r, l, p_0, p_1, p_2, rigid ):
+    if communicate_rock_data_precondition( state, r, l, p_0, p_1, p_2, rigid ):
+        # effects
+        # rock data of p_0 has been communicated
+        state.communicated_rock_data[ p_0 ] = True
+        state.available.add( r )
+        state.channel_free.add( l )
+        return state
+
+def communicate_image_data_precondition( state, r, l, o, m, p_0, p_1, rigid ):
     type_dict = rigid[ "type_dict" ]
     at = state.at
     visible= rigid[ "visible" ]
@@ -246,23 +276,26 @@ def communicate_image_data( state, r, l, o, m, p_0, p_1, rigid ):
     available = state.available
     channel_free = state.channel_free
     # type check
-    if type_check( [ r, l, o, m, p_0, p_1 ],
-                   [ "rover", "lander", "objective", "mode", "waypoint", "waypoint" ], type_dict ):
-        # preconditions
-        # r at p_0
-        # l at p_1
-        # have rock analysis ( r, p_0 )
-        # p_2 visible from p_1
-        # r available
-        # l has free channel
-        if r in available  and at[ r ] == p_0 and at_lander[ l ] == p_1 and l in channel_free and \
-                ( o, m ) in have_image[ r ] and p_1 in visible[ p_0 ]:
-            # effects
-            # rock data of p_0 has been communicated
-            state.communicated_image_data[ ( o, m ) ] = True
-            state.available.add( r )
-            state.channel_free.add( l )
-            return state
+    # preconditions
+    # r at p_0
+    # l at p_1
+    # have rock analysis ( r, p_0 )
+    # p_2 visible from p_1
+    # r available
+    # l has free channel
+    return type_check( [ r, l, o, m, p_0, p_1 ],
+                       [ "rover", "lander", "objective", "mode", "waypoint", "waypoint" ], type_dict ) and \
+        ( r in available  and at[ r ] == p_0 and at_lander[ l ] == p_1 and l in channel_free and
+          ( o, m ) in have_image[ r ] and p_1 in visible[ p_0 ] )
+
+def communicate_image_data( state, r, l, o, m, p_0, p_1, rigid ):
+    if communicate_image_data_precondition( state, r, l, o, m, p_0, p_1, rigid ):
+        # effects
+        # rock data of p_0 has been communicated
+        state.communicated_image_data[ ( o, m ) ] = True
+        state.available.add( r )
+        state.channel_free.add( l )
+        return state
 
 # replicate !!retract macro effect without having state changes in method
 def retract( state, field, key, rigid ):
@@ -276,7 +309,16 @@ def retract( state, field, key, rigid ):
 # Create a IPyHOP Actions object. An Actions object stores all the actions defined for the planning domain.
 actions = Actions()
 actions.declare_actions( [ navigate, sample_soil, sample_rock, drop, calibrate, take_image, communicate_soil_data,
-                           communicate_rock_data, communicate_image_data, retract ] )
+                           communicate_rock_data, communicate_image_data, retract ],
+                         preconditions={ "navigate": navigate_precondition,
+                                         "sample_soil": sample_soil_precondition,
+                                         "sample_rock": sample_rock_precondition,
+                                         "drop": drop_precondition,
+                                         "calibrate": calibrate_precondition,
+                                         "take_image": take_image_precondition,
+                                         "communicate_soil_data": communicate_soil_data_precondition,
+                                         "communicate_rock_data": communicate_rock_data_precondition,
+                                         "communicate_image_data": communicate_image_data_precondition } )
 
 p_fail = 1
 action_probability = {
@@ -10,7 +10,8 @@ from examples.satellite.domain.actions import type_check
 import random
 from functools import partial
 from itertools import product
-from examples.openstacks.domain.deviations import shopfixer_deviation_handler
+from examples.openstacks.domain.deviations import shopfixer_deviation_handler, DeviationIndex
+from bisect import bisect_left, insort
 from copy import deepcopy
 
 # rovers deviation handler
@@ -19,14 +20,15 @@ class deviation_handler( shopfixer_deviation_handler ):
     def __init__( self, actions, planner, rigid ):
         super().__init__( actions, planner, rigid )
         self.deviation_operators = [
-            d_lost_soil_analysis,
+            LostSoilAnalysisIndex( self.rigid ),
             d_lost_rock_analysis,
-            d_lost_image,
+            LostImageIndex( self.rigid ),
             d_decalibration,
             d_cannot_see_to_calibrate,
             d_cannot_see_to_take_image
         ]
-        self.deviation_operators = [ partial( d_operator, rigid=self.rigid ) for d_operator in
+        self.deviation_operators = [ d_operator if isinstance( d_operator, DeviationIndex ) else
+                                     partial( d_operator, rigid=self.rigid ) for d_operator in
                                      self.deviation_operators ]
 
 def d_lost_soil_analysis( act_tuple, state, rigid ):
@@ -40,10 +42,66 @@ def d_lost_soil_analysis( act_tuple, state, rigid ):
         # random.shuffle( wp_list )
         for wp in wp_list:
             if not( communicated_soil_data[ wp ] ) and wp in have_soil_analysis[ r ]:
-                new_state = state.copy()
-                new_state.have_soil_analysis[ r ].remove( wp )
-                new_state.at_soil_sample.add( wp )
-                yield new_state
+                yield ( _d_lost_soil_analysis, r, wp )
+
+def _d_lost_soil_analysis( state, r, wp ):
+    state.have_soil_analysis[ r ].remove( wp )
+    state.at_soil_sample.add( wp )
+
+# incremental version of d_lost_soil_analysis
+# candidates are the soil analyses of each rover that have not been communicated
+class LostSoilAnalysisIndex( DeviationIndex ):
+    def __init__( self, rigid ):
+        super().__init__( rigid )
+        self.candidates = dict()
+        self.total = 0
+        self.rover_order = []
+
+    def rebuild( self, state ):
+        communicated_soil_data = state.communicated_soil_data
+        self.candidates = { r: { wp for wp in wp_set if not( communicated_soil_data[ wp ] ) }
+                            for r, wp_set in state.have_soil_analysis.items() }
+        self.total = sum( map( len, self.candidates.values() ) )
+
+    def update( self, act_tuple, state ):
+        act_name = act_tuple[ 0 ]
+        if act_name == "sample_soil":
+            self.recheck( act_tuple[ 1 ], act_tuple[ 3 ], state )
+        elif act_name is _d_lost_soil_analysis:
+            self.recheck( act_tuple[ 1 ], act_tuple[ 2 ], state )
+        elif act_name == "communicate_soil_data":
+            for r in self.candidates:
+                self.recheck( r, act_tuple[ 3 ], state )
+        elif act_name == "retract":
+            self.rebuild( state )
+
+    def recheck( self, r, wp, state ):
+        candidates = self.candidates[ r ]
+        valid = wp in state.have_soil_analysis[ r ] and not( state.communicated_soil_data[ wp ] )
+        if valid and wp not in candidates:
+            candidates.add( wp )
+            self.total += 1
+        elif not valid and wp in candidates:
+            candidates.remove( wp )
+            self.total -= 1
+
+    def count( self, act_tuple, state ):
+        # d_lost_soil_analysis visits the rovers in random order, shuffle them the same way
+        self.rover_order = [ *state.have_soil_analysis ]
+        random.shuffle( self.rover_order )
+        return self.total
+
+    def get( self, k, state ):
+        for r in self.rover_order:
+            candidates = self.candidates[ r ]
+            if k < len( candidates ):
+                # only the chosen rover's analyses are scanned, in set order like d_lost_soil_analysis
+                for wp in state.have_soil_analysis[ r ]:
+                    if wp in candidates:
+                        if k == 0:
+                            return ( _d_lost_soil_analysis, r, wp )
+                        k -= 1
+            k -= len( candidates )
 
 def d_lost_rock_analysis( act_tuple, state, rigid ):
     rock_analysis = [ *state.have_rock_analysis.items() ]
@@ -56,10 +114,11 @@ def d_lost_rock_analysis( act_tuple, state, rigid ):
         # random.shuffle( wp_list )
         for wp in wp_list:
             if not( communicated_rock_data[ wp ] ) and wp in have_rock_analysis[ r ]:
-                new_state = state.copy()
-                new_state.have_rock_analysis[ r ].remove( wp )
-                new_state.at_rock_sample.add( wp )
-                yield new_state
+                yield ( _d_lost_rock_analysis, r, wp )
+
+def _d_lost_rock_analysis( state, r, wp ):
+    state.have_rock_analysis[ r ].remove( wp )
+    state.at_rock_sample.add( wp )
 
 def d_lost_image( act_tuple, state, rigid ):
     type_dict = rigid[ "type_dict"]
@@ -84,10 +143,71 @@ def d_lost_image( act_tuple, state, rigid ):
     for r, o, m, i in quad_tuples:
         image = ( o, m )
         if on_board[ i ] == r and image in have_image[ r ] and not communicated_image_data[ image ]:
-            new_state = state.copy()
-            new_state.have_image[ r ].remove( image )
-            new_state.calibrated[ ( i, r ) ] = False
-            yield new_state
+            yield ( _d_lost_image, r, image, i )
+
+def _d_lost_image( state, r, image, i ):
+    state.have_image[ r ].remove( image )
+    state.calibrated[ ( i, r ) ] = False
+
+# incremental version of d_lost_image
+# candidates are kept sorted by their position in the ( rover, objective, mode, camera ) product of d_lost_image
+class LostImageIndex( DeviationIndex ):
+    def __init__( self, rigid ):
+        super().__init__( rigid )
+        type_dict = rigid[ "type_dict"]
+        on_board = rigid[ "on_board" ]
+        self.rovers_list = [ *type_dict[ "rover" ] ]
+        objectives_list = [ *type_dict[ "objective" ] ]
+        modes_list = [ *type_dict[ "mode" ] ]
+        cameras_list = [ *type_dict[ "camera" ] ]
+        self.rover_position = { r: i for i, r in enumerate( self.rovers_list ) }
+        self.objective_position = { o: i for i, o in enumerate( objectives_list ) }
+        self.mode_position = { m: i for i, m in enumerate( modes_list ) }
+        self.cameras_of = { r: [ ( c_i, i ) for c_i, i in enumerate( cameras_list ) if on_board[ i ] == r ]
+                            for r in self.rovers_list }
+        self.candidates = []
+
+    def rebuild( self, state ):
+        self.candidates = []
+        have_image = state.have_image
+        communicated_image_data = state.communicated_image_data
+        for r in self.rovers_list:
+            for image in have_image[ r ]:
+                if not communicated_image_data[ image ]:
+                    self.recheck( r, image, state )
+
+    def update( self, act_tuple, state ):
+        act_name = act_tuple[ 0 ]
+        if act_name == "take_image":
+            self.recheck( act_tuple[ 1 ], ( act_tuple[ 3 ], act_tuple[ 5 ] ), state )
+        elif act_name is _d_lost_image:
+            self.recheck( act_tuple[ 1 ], act_tuple[ 2 ], state )
+        elif act_name == "communicate_image_data":
+            for r in self.rovers_list:
+                self.recheck( r, ( act_tuple[ 3 ], act_tuple[ 4 ] ), state )
+        elif act_name == "retract":
+            self.rebuild( state )
+
+    def recheck( self, r, image, state ):
+        valid = image in state.have_image[ r ] and not state.communicated_image_data[ image ]
+        position = ( self.rover_position[ r ], self.objective_position[ image[ 0 ] ],
+                     self.mode_position[ image[ 1 ] ] )
+        candidates = self.candidates
+        for c_i, i in self.cameras_of[ r ]:
+            key = ( *position, c_i, r, image, i )
+            j = bisect_left( candidates, key )
+            indexed = j < len( candidates ) and candidates[ j ] == key
+            if valid and not indexed:
+                insort( candidates, key )
+            elif not valid and indexed:
+                del candidates[ j ]
+
+    def count( self, act_tuple, state ):
+        return len( self.candidates )
+
+    def get( self, k, state ):
+        _, _, _, _, r, image, i = self.candidates[ k ]
+        return ( _d_lost_image, r, image, i )
 
 def d_decalibration( act_tuple, state, rigid ):
     calibrated = state.calibrated
@@ -95,9 +215,10 @@ def d_decalibration( act_tuple, state, rigid ):
     calibrated_pairs = [ *filter( lambda x: calibrated[ x ], calibrated.keys() ) ]
     for calibrated_pair in calibrated_pairs:
         # calibrated_pair = random.choice( calibrated_pairs )
-        new_state = state.copy()
-        new_state.calibrated[ calibrated_pair ] = False
-        yield new_state
+        yield ( _d_decalibration, calibrated_pair )
+
+def _d_decalibration( state, calibrated_pair ):
+    state.calibrated[ calibrated_pair ] = False
 
 def d_cannot_see_to_calibrate( act_tuple, state, rigid ):
     act_name =  act_tuple[ 0 ]
@@ -129,9 +250,7 @@ def d_cannot_see_to_calibrate( act_tuple, state, rigid ):
                 r_i_m = product( rovers, { o }, modes )
                 have_image_check = map( lambda x: ( x[ 1 ], x[ 2 ] ) in have_image[ x[ 0 ] ], r_i_m )
                 if not any( have_image_check ):
-                    new_state = state.copy()
-                    new_state.visible_from[ o ].remove( w )
-                    yield new_state
+                    yield ( _d_cannot_see, o, w )
 
 def d_cannot_see_to_take_image( act_tuple, state, rigid ):
     act_name =  act_tuple[ 0 ]
@@ -159,9 +278,10 @@ def d_cannot_see_to_take_image( act_tuple, state, rigid ):
             w in visible_from_o and image not in have_image[ r ]:
             # avoid making objective unreachable
             if len( visible_from_o ) > 1:
-                new_state = state.copy()
-                new_state.visible_from[ o ].remove( w )
-                yield new_state
+                yield ( _d_cannot_see, o, w )
+
+def _d_cannot_see( state, o, w ):
+    state.visible_from[ o ].remove( w )
 
 
 # ******************************************    Helper Functions            ****************************************** #
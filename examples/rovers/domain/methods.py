@@ -11,34 +11,63 @@ task that the method is for. For example, the task ('get', b1) has a method "tm_
 from ipyhop import Methods
 from examples.rovers.domain.actions import type_check
 from typing import TypeVar, Tuple, Set, Dict
+from collections import deque
 
 # ******************************************    Helper Functions                     ********************************* #
 
 rover = TypeVar( "rover" )
 waypoint = TypeVar( "waypoint" )
 
-# returns path if a path exists else returns None
-def path( can_traverse: Dict[ Tuple[ waypoint ], bool ], r: rover, f: waypoint, t: waypoint ):
-    rover_can_traverse = can_traverse[ r ]
-    curr_wp = f
-    paths = [ *map( lambda y: ( y, ), filter( lambda x: x[ 0 ] == curr_wp, rover_can_traverse ) ) ]
-    new_paths = paths
-    visited = set()
-    # keep expanding frontier until either we no longer have any new reachable waypoints or t is in path
-    while True:
-        if any( map( lambda x: x[ -1 ][ 1 ] == t, new_paths ) ) or paths == []:
-            break
-        active_path = paths.pop( 0 )
-        curr_wp = active_path[ -1 ][ 1 ]
-        viable_traversals = filter( lambda x: x[ 0 ] == curr_wp and x[ 1 ] not in visited, rover_can_traverse )
-        new_paths = [ ( *active_path, traversal ) for traversal in viable_traversals ]
-        paths += new_paths
-        visited.add( curr_wp )
-    usable_paths = [ *filter( lambda x: x[ -1 ][ 1 ] == t, new_paths ) ]
-    if len( usable_paths ) > 0:
-        return usable_paths[ 0 ]
-    else:
-        return None
+# navigation index of a problem, built once from the rigid can_traverse relation and stored in rigid[ "navigation" ]
+# so that methods and the deviation handler share it
+class NavigationIndex:
+    def __init__( self, can_traverse: Dict[ rover, Set[ Tuple[ waypoint, waypoint ] ] ] ):
+        # per rover adjacency lists, in the iteration order of the traversal sets
+        self.adjacency = dict()
+        for r, rover_can_traverse in can_traverse.items():
+            rover_adjacency = dict()
+            for traversal in rover_can_traverse:
+                rover_adjacency.setdefault( traversal[ 0 ], [] ).append( traversal )
+            self.adjacency[ r ] = rover_adjacency
+        # ( rover, source ) -> BFS predecessor table, computed on first use
+        self.predecessors = dict()
+
+    # BFS predecessor table of rover r from waypoint f: reachable waypoint -> traversal reaching it ( None for f )
+    def predecessor_table( self, r: rover, f: waypoint ) -> Dict[ waypoint, Tuple[ waypoint, waypoint ] ]:
+        table = self.predecessors.get( ( r, f ) )
+        if table is None:
+            rover_adjacency = self.adjacency.get( r, dict() )
+            table = { f: None }
+            frontier = deque( [ f ] )
+            while frontier:
+                curr_wp = frontier.popleft()
+                for traversal in rover_adjacency.get( curr_wp, () ):
+                    if traversal[ 1 ] not in table:
+                        table[ traversal[ 1 ] ] = traversal
+                        frontier.append( traversal[ 1 ] )
+            self.predecessors[ ( r, f ) ] = table
+        return table
+
+    # returns a shortest path ( tuple of traversals ) from f to t if a path exists else returns None
+    def path( self, r: rover, f: waypoint, t: waypoint ):
+        table = self.predecessor_table( r, f )
+        if t not in table:
+            return None
+        links = []
+        curr_wp = t
+        while curr_wp != f:
+            traversal = table[ curr_wp ]
+            links.append( traversal )
+            curr_wp = traversal[ 0 ]
+        return tuple( reversed( links ) )
+
+    def reachable( self, r: rover, f: waypoint, t: waypoint ) -> bool:
+        return t in self.predecessor_table( r, f )
+
+    # number of traversals of a shortest path, None if t is not reachable
+    def distance( self, r: rover, f: waypoint, t: waypoint ):
+        p = self.path( r, f, t )
+        return None if p is None else len( p )
 
 # ******************************************    Methods                     ****************************************** #
 N = 1
@@ -109,11 +138,11 @@ def gm_navigate_0( state, r, to, rigid ):
 
 def gm_navigate_1( state, r, to, rigid ):
     at = state.at
-    can_traverse = rigid[ "can_traverse" ]
+    navigation = rigid[ "navigation" ]
     # recursively call move task until to has been reached
     f = at[ r ]
     if f != to:
-        p = path( can_traverse, r, f, to )
+        p = navigation.path( r, f, to )
         if p is not None:
             yield [ ( "t_move", r, p ) ]
 
@@ -5,9 +5,9 @@ File Description: Rovers example file. Run this file to solve the Openstacks pla
 
 # ******************************************    Libraries to be imported    ****************************************** #
 from examples.rovers.domain.actions import actions
-from examples.rovers.domain.methods import methods
+from examples.rovers.domain.methods import methods, NavigationIndex
 from examples.rovers.domain.deviations import deviation_handler
-from ipyhop import IPyHOP, State
+from ipyhop import IPyHOP, State, Symbols, intern_bool_vars
 from ipyhop.mulitgoal import MultiGoal
 from ipyhop.actor import Actor
 from ipyhop.mc_executor import MonteCarloExecutor
@@ -19,7 +19,7 @@ from functools import partial
 # ******************************************        Helper Functions        ****************************************** #
 
 # create sat pyhop problem
-def init_rovers( pddl_str, actions, methods ):
+def init_rovers( pddl_str, actions, methods, compiled=False ):
     # create intial state
     state_0 = State("state_0")
     # create multigoal
@@ -99,6 +99,7 @@ def init_rovers( pddl_str, actions, methods ):
     for var, val_0, val_1, val_2 in trinary_re_matches:
         if var in { "can_traverse" }:
             rigid[ var ][ val_0 ].add( ( val_1, val_2 ) )
+    rigid[ "navigation" ] = NavigationIndex( rigid[ "can_traverse" ] )
 
     # set default values
     state_0.have_soil_analysis = { r: set() for r in type_dict[ "rover" ] }
@@ -117,6 +118,12 @@ def init_rovers( pddl_str, actions, methods ):
     methods.multigoal_method_dict.update(
         { l: [ partial( m, rigid=rigid ) for m in ms ] for l, ms in methods.multigoal_method_dict.items() } )
     actions.action_dict.update( { l: partial( a, rigid=rigid ) for l, a in actions.action_dict.items() } )
+    actions.action_precond.update( { l: partial( p, rigid=rigid ) for l, p in actions.action_precond.items() } )
+    # compiled mode: objects are interned to integers and the boolean relations are stored as bitsets
+    if compiled:
+        symbols = Symbols()
+        intern_bool_vars( state_0, symbols )
+        intern_bool_vars( goal_a, symbols )
 
     return state_0, goal_a, rigid
 # ******************************************        Main Program Start       ***************************************** #
@@ -25,96 +25,107 @@ The state is described with following properties:
 from ipyhop import Actions
 from typing import List, Dict, Set
 
-def turn_to( state, s, d_new, d_prev, rigid ):
+# Every action has a precondition function with the same arguments, holding the type check and the preconditions of
+# the action. IPyHOP evaluates it on the current state before copying the state and applying the action.
+
+def turn_to_precondition( state, s, d_new, d_prev, rigid ):
     type_dict = rigid[ "type_dict" ]
     pointing = state.pointing
     # type check
-    if type_check(
+    # precondtions
+    # s pointing at d_prev
+    # d_new not d_prev
+    return type_check(
             [ s, d_new, d_prev ],
             [ "satellite", "direction", "direction" ],
-            type_dict ):
-        # precondtions
-        # s pointing at d_prev
-        # d_new not d_prev
-        if pointing[ s ] == d_prev and d_new != d_prev:
-            # effects
-            # s now pointing at _new
-            state.pointing[ s ] = d_new
-            return state
+            type_dict ) and pointing[ s ] == d_prev and d_new != d_prev
 
-def switch_on( state, i, s, rigid ):
+def turn_to( state, s, d_new, d_prev, rigid ):
+    if turn_to_precondition( state, s, d_new, d_prev, rigid ):
+        # effects
+        # s now pointing at _new
+        state.pointing[ s ] = d_new
+        return state
+
+def switch_on_precondition( state, i, s, rigid ):
     type_dict = rigid[ "type_dict" ]
     on_board = rigid[ "on_board" ]
     power_avail = state.power_avail
     # type check
-    if type_check(
+    # preconditions
+    # i on s
+    # s has power available
+    return type_check(
         [ i, s ],
         [ "instrument", "satellite" ],
         type_dict
-    ):
-        # preconditions
-        # i on s
-        # s has power available
-        if i in on_board[ s ] and power_avail[ s ]:
-            # effects
-            # i is powered on
-            state.power_on[ i ] = True
-            # i in uncalibrated
-            state.calibrated[ i ] = False
-            # s has no power available
-            state.power_avail[ s ] = False
-            return state
+    ) and i in on_board[ s ] and power_avail[ s ]
 
-def switch_off( state, i, s, rigid ):
+def switch_on( state, i, s, rigid ):
+    if switch_on_precondition( state, i, s, rigid ):
+        # effects
+        # i is powered on
+        state.power_on[ i ] = True
+        # i in uncalibrated
+        state.calibrated[ i ] = False
+        # s has no power available
+        state.power_avail[ s ] = False
+        return state
+
+def switch_off_precondition( state, i, s, rigid ):
     type_dict = rigid[ "type_dict" ]
     on_board = rigid[ "on_board" ]
     power_on = state.power_on
     # type check
-    if type_check(
+    # preconditions
+    # i on s
+    # i is powered on
+    return type_check(
         [ i, s ],
         [ "instrument", "satellite" ],
         type_dict
-    ):
-        # preconditions
-        # i on s
-        # i is powered on
-        if i in on_board[ s ] and power_on[ i ]:
-            # effects
-            # i is powered off
-            state.power_on[ i ] = False
-            # s has power available
-            state.power_avail[ s ] = True
-            return state
+    ) and i in on_board[ s ] and power_on[ i ]
 
-def calibrate( state, s, i, d, rigid ):
+def switch_off( state, i, s, rigid ):
+    if switch_off_precondition( state, i, s, rigid ):
+        # effects
+        # i is powered off
+        state.power_on[ i ] = False
+        # s has power available
+        state.power_avail[ s ] = True
+        return state
+
+def calibrate_precondition( state, s, i, d, rigid ):
     type_dict = rigid[ "type_dict" ]
     on_board = rigid[ "on_board" ]
     power_on = state.power_on
     calibration_target = rigid[ "calibration_target" ]
     pointing = state.pointing
     # type check
-    if type_check(
+    # preconditions
+    # i is on s
+    # d is calibration target for i
+    # s is pointing at d
+    # i has power_on
+    return type_check(
         [ s, i, d ],
         [ "satellite", "instrument", "direction" ],
         type_dict
-    ):
-        # preconditions
-        # i is on s
-        # d is calibration target for i
-        # s is pointing at d
-        # i has power_on
-        if all( [
-            i in on_board[ s ],
-            calibration_target[ i ] == d,
-            pointing[ s ] == d,
-            power_on[ i ]
-        ] ):
-            # effects
-            # i is calibrated
-            state.calibrated[ i ] = True
-            return state
+    ) and all( [
+        i in on_board[ s ],
+        calibration_target[ i ] == d,
+        pointing[ s ] == d,
+        power_on[ i ]
+    ] )
 
-def take_image( state, s, d, i, m, rigid ):
+def calibrate( state, s, i, d, rigid ):
+    if calibrate_precondition( state, s, i, d, rigid ):
+        # effects
+        # i is calibrated
+        state.calibrated[ i ] = True
+        return state
+
+def take_image_precondition( state, s, d, i, m, rigid ):
     type_dict = rigid[ "type_dict" ]
     on_board = rigid[ "on_board" ]
     calibrated = state.calibrated
@@ -122,34 +133,39 @@ def take_image( state, s, d, i, m, rigid ):
     supports = rigid[ "supports" ]
     pointing = state.pointing
     # type check
-    if type_check(
+    # preconditions
+    # i calibrated
+    # i on s
+    # i supports m
+    # i is powered on
+    # s pointing at d
+    return type_check(
             [ s, d, i, m ],
             [ "satellite", "direction", "instrument", "mode" ],
             type_dict
-    ):
-        # preconditions
-        # i calibrated
-        # i on s
-        # i supports m
-        # i is powered on
-        # s pointing at d
-        if all( [
-            calibrated[ i ],
-            i in on_board[ s ],
-            m in supports[ i ],
-            power_on[ i ],
-            pointing[ s ] == d
-        ] ):
-            # effects
-            # have image ( d, m )
-            image = ( d, m )
-            state.have_image[ image ] = True
-            return state
+    ) and all( [
+        calibrated[ i ],
+        i in on_board[ s ],
+        m in supports[ i ],
+        power_on[ i ],
+        pointing[ s ] == d
+    ] )
+
+def take_image( state, s, d, i, m, rigid ):
+    if take_image_precondition( state, s, d, i, m, rigid ):
+        # effects
+        # have image ( d, m )
+        image = ( d, m )
+        state.have_image[ image ] = True
+        return state
 
 
 # Create a IPyHOP Actions object. An Actions object stores all the actions defined for the planning domain.
 actions = Actions()
-actions.declare_actions( [ turn_to, switch_on, switch_off, calibrate, take_image ] )
+actions.declare_actions( [ turn_to, switch_on, switch_off, calibrate, take_image ],
+                         preconditions={ "turn_to": turn_to_precondition, "switch_on": switch_on_precondition,
+                                         "switch_off": switch_off_precondition, "calibrate": calibrate_precondition,
+                                         "take_image": take_image_precondition } )
 
 p_fail = 1
 action_probability = {
@@ -61,9 +61,10 @@ def d_change_direction( act_tuple, state, rigid ):
         for d_new in directions:
             # change satellite pointing
             # print( ( "d_change_direction", s, d_new, d ) )
-            new_state = state.copy()
-            new_state.pointing[ s ] = d_new
-            yield new_state
+            yield ( _d_change_direction, s, d_new )
+
+def _d_change_direction( state, s, d_new ):
+    state.pointing[ s ] = d_new
 
 # decalibrate random instrument
 def d_decalibration( act_tuple, state, rigid ):
@@ -76,9 +77,10 @@ def d_decalibration( act_tuple, state, rigid ):
     #     decalibrated_instrument = random.choice( calibrated_instruments )
     for decalibrated_instrument in calibrated_instruments:
         # print( ( "d_decalibration", decalibrated_instrument ) )
-        new_state = state.copy()
-        new_state.calibrated[ decalibrated_instrument ] = False
-        yield new_state
+        yield ( _d_decalibration, decalibrated_instrument )
+
+def _d_decalibration( state, decalibrated_instrument ):
+    state.calibrated[ decalibrated_instrument ] = False
 
 # cause random powered instrument to lose power
 def d_power_loss( act_tuple, state, rigid ):
@@ -95,11 +97,12 @@ def d_power_loss( act_tuple, state, rigid ):
         # set power avail for associated satellite
         for s in satellites:
             if power_loss_instrument in on_board[ s ]:
-                new_state = state.copy()
-                new_state.power_on[ power_loss_instrument ] = False
-                new_state.power_avail[ s ] = True
                 # print( ( "d_power_loss", power_loss_instrument ) )
-                yield new_state
+                yield ( _d_power_loss, power_loss_instrument, s )
+
+def _d_power_loss( state, power_loss_instrument, s ):
+    state.power_on[ power_loss_instrument ] = False
+    state.power_avail[ s ] = True
 
 
 # ******************************************    Helper Functions            ****************************************** #
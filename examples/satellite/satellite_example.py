@@ -114,6 +114,7 @@ def init_sat( pddl_str, actions, methods ):
     methods.multigoal_method_dict.update(
         { l: [ partial( m, rigid=rigid ) for m in ms ] for l, ms in methods.multigoal_method_dict.items() } )
     actions.action_dict.update( { l: partial( a, rigid=rigid ) for l, a in actions.action_dict.items() } )
+    actions.action_precond.update( { l: partial( p, rigid=rigid ) for l, p in actions.action_precond.items() } )
 
     return state_0, goal_a, rigid
 # ******************************************        Main Program Start       ***************************************** #
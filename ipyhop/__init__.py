@@ -10,10 +10,21 @@ Derived from:
     Copyright (c) 2022, Yash Bansod
 """
 from ipyhop.mc_executor import MonteCarloExecutor
-from ipyhop.state import State
+from ipyhop.state import State, state_schema, SCALAR, SET, DICT, DICT_OF_SETS
+from ipyhop.bitset import Symbols, BoolMap, intern_bool_vars
+from ipyhop.array_state import ArrayState, array_state
 from ipyhop.mulitgoal import MultiGoal
 from ipyhop.methods import Methods, mgm_split_multigoal
-from ipyhop.actions import Actions
+from ipyhop.actions import Actions, precondition
+from ipyhop.method_policy import MethodPolicy, AdaptiveMethodPolicy
+from ipyhop.search_strategies import SearchStrategy, DepthFirstSearch, LimitedDiscrepancySearch, BestFirstSearch, \
+    BeamSearch
+from ipyhop.budget import PlanningBudget, BudgetExhausted
+from ipyhop.session import PlanningSession
+from ipyhop.snapshot_store import StateSnapshotStore
+from ipyhop.rigid import infer_rigid
+from ipyhop.instrumentation import PlannerInstrumentation
+from ipyhop.memory import SnapshotPolicy, ChoicePointSnapshotPolicy, memory_report
 from ipyhop.planner import IPyHOP
 from ipyhop.plotter import planar_plot
 # from ipyhop.failure_handler import post_failure_tasks
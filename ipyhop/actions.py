@@ -5,7 +5,7 @@ File Description: File used for definition of Actions Class.
 
 # ******************************************    Libraries to be imported    ****************************************** #
 from __future__ import print_function, division
-from typing import List, Callable, Union, Any, Dict
+from typing import List, Callable, Union, Any, Dict, Optional
 from ipyhop.state import State
 
 
@@ -24,12 +24,19 @@ class Actions(object):
         {op_name_1: [op_func_a, ...], op_name_2: [op_func_x, ...]...}
 
     Use the member function declare_actions to add actions to the action_dict.
+
+    An action can optionally have a precondition: a function with the same arguments as the action, returning True
+    if the action is applicable. Preconditions are called on the current state, which they must not modify, so that
+    IPyHOP and MonteCarloExecutor only copy the state for actions that are applicable. The action itself must still
+    fail (return None) when it is not applicable. Preconditions are stored in action_precond, keyed by action name,
+    and are declared with declare_actions or with the @precondition(check) decorator on the action.
     """
 
     def __init__(self):
         self.action_dict = dict()
         self.action_prob = dict()
         self.action_cost = dict()
+        self.action_precond = dict()
 
     # ******************************        Class Method Declaration        ****************************************** #
     def __str__(self):
@@ -43,14 +50,17 @@ class Actions(object):
     _action_list_type = List[Callable[[Any], Union[State, bool]]]
     _act_prob_dict_type = Dict[str, List]
     _act_cost_dict_type = Dict[str, float]
+    _act_precond_dict_type = Dict[str, Callable[[Any], bool]]
 
     # ******************************        Class Method Declaration        ****************************************** #
-    def declare_actions(self, action_list: _action_list_type):
+    def declare_actions(self, action_list: _action_list_type, preconditions: Optional[_act_precond_dict_type] = None):
         """
         declare_actions([a1, a2, ..., ak]) tells IPyHOP that [a1, a2, ..., ak] are all of the planning actions.
         This supersedes any previous call to declare_actions.
 
         :param action_list: List of actions in the
+        :param preconditions: [Optional] Dictionary with action names as keys and precondition functions as values.
+            They take precedence over the preconditions declared with the @precondition decorator.
         """
         assert type(action_list) == list, "action_list must be a list."
         for action in action_list:
@@ -58,6 +68,16 @@ class Actions(object):
         self.action_dict.update({action.__name__: action for action in action_list})
         self.action_prob.update({action.__name__: [1, 0] for action in action_list})
         self.action_cost.update({action.__name__: 1.0 for action in action_list})
+        for action in action_list:
+            if getattr(action, 'precondition', None) is not None:
+                self.action_precond[action.__name__] = action.precondition
+            else:
+                self.action_precond.pop(action.__name__, None)
+        if preconditions is not None:
+            for action_name, check in preconditions.items():
+                assert action_name in self.action_dict, "precondition declared for an undeclared action."
+                assert callable(check), "precondition should be callable."
+            self.action_precond.update(preconditions)
 
     # ******************************        Class Method Declaration        ****************************************** #
     def declare_action_models(self, act_prob_dict: _act_prob_dict_type, act_cost_dict: _act_cost_dict_type):
@@ -68,6 +88,25 @@ class Actions(object):
         assert (len(self.action_cost.keys()) == len(self.action_dict.keys()))
 
 
+# ******************************************    Function Declaration Start  ****************************************** #
+def precondition(check: Callable[[Any], bool]):
+    """
+    Decorator declaring the precondition of an action, e.g.::
+
+        @precondition(lambda state, b: state.clear[b])
+        def a_pickup(state, b): ...
+
+    :param check: Function with the same arguments as the action, returning True if the action is applicable.
+    :return: The decorator.
+    """
+    assert callable(check), "precondition should be callable."
+
+    def decorate(action):
+        action.precondition = check
+        return action
+    return decorate
+
+
 # ******************************************    Class Declaration End       ****************************************** #
 # ******************************************    Demo / Test Routine         ****************************************** #
 if __name__ == '__main__':
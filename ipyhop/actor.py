@@ -107,7 +107,7 @@ class Actor:
                         fail_node_id = plan_node_ids[ exec_index  ]
                     assert self.planner.sol_tree.nodes[ fail_node_id ][ "info" ] == action_list[ action_index ]
                     replan_result = self.planner.replan( curr_state, fail_node_id, verbose )
-                    replan_result = plan, plan_node_ids
+                    plan, plan_node_ids = replan_result
                     exec_index = 0
                 else:
                     raise( ValueError( "Invalid Planner" ) )
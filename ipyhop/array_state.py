@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the NumPy array backed State classes of numeric domains.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from copy import deepcopy
+from typing import Dict, Tuple, Type, Union
+import numpy as np
+from ipyhop.state import State
+
+# layout (class name, variables, dtype) -> generated ArrayState subclass
+_array_classes = dict()
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class _ArrayField(object):
+    # data descriptor of a numeric variable: reads return the view of the variable in the state array, assignments
+    # write into it, so the variable never stops being a view of the array
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, state, owner):
+        if state is None:
+            return self
+        return state.__dict__[self.name]
+
+    def __set__(self, state, value):
+        state.__dict__[self.name][...] = value
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class ArrayState(State):
+    """
+    A state whose numeric variables live in one preallocated NumPy array (the state array): every numeric variable
+    is a view of a slice of it. Copying the numeric variables is a single ndarray.copy of the state array. The other
+    variables are stored in the instance __dict__ and deep-copied like the variables of a State (rigid variables
+    are shared), so array states only copy faster than States when most of their variables are numeric.
+
+    Classes are generated by array_state, which fixes the numeric variables, their shapes and the dtype. Reading a
+    numeric variable returns its view (an ndarray, so it can't be used as a dict key without tuple()), and assigning
+    it writes the assigned values into the view.
+
+    The state arrays of many candidate successor states can be evaluated in one vectorized step:
+        *   candidates = state.array + deltas builds one candidate state array per row of deltas,
+            candidates[:, state.fields['loc'][0]] selects their loc variables, and state.with_array(candidates[i])
+            turns a chosen row into a state.
+    """
+    # the state array is not a variable, so it is kept out of the instance __dict__ (that holds the variables)
+    __slots__ = ('_array',)
+    # numeric variable name -> (slice of the state array, shape)
+    fields = dict()
+    size = 0
+    dtype = np.dtype(float)
+
+    def __init__(self, name: str, **numeric):
+        """
+        ArrayState Constructor. The numeric variables are zero unless given.
+
+        :param name: Name of the state.
+        :param numeric: [Optional] Values of the numeric variables.
+        """
+        super().__init__(name)
+        self._set_array(np.zeros(self.size, dtype=self.dtype))
+        for var_name, value in numeric.items():
+            setattr(self, var_name, value)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _set_array(self, array: np.ndarray):
+        # makes array the state array and points the numeric variables to their views
+        self._array = array
+        variables = self.__dict__
+        for name, (part, shape) in self.fields.items():
+            variables[name] = array[part].reshape(shape)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @property
+    def array(self) -> np.ndarray:
+        """
+        :return: The state array (not a copy, writes modify the numeric variables).
+        """
+        return self._array
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _copy_others(self, new):
+        # copies the variables that are not numeric into new, sharing the rigid ones
+        variables = self.__dict__
+        rigid = variables.get('__rigid__', ())
+        new_variables = new.__dict__
+        others = dict()
+        for name, value in variables.items():
+            if name in rigid or name == '__name__' or name == '__rigid__':
+                new_variables[name] = value
+            elif name not in self.fields:
+                others[name] = value
+        if others:
+            # like State.copy, references to rigid values are not copied
+            memo = {id(variables[name]): variables[name] for name in rigid if name in variables}
+            new_variables.update(deepcopy(others, memo))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def copy(self):
+        new = object.__new__(type(self))
+        self._copy_others(new)
+        new._set_array(self._array.copy())
+        return new
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def with_array(self, array: np.ndarray):
+        """
+        :param array: A state array, e.g. a row of a batch of candidate state arrays. It is copied.
+        :return: A copy of the state with array as its state array.
+        """
+        new = object.__new__(type(self))
+        self._copy_others(new)
+        new._set_array(np.array(array, dtype=self.dtype).reshape(self.size))
+        return new
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def update(self, state):
+        # like State.update, the variables (and the state array) of state are taken over, not copied
+        self.__dict__.update(state.__dict__)
+        self._array = state._array
+        return self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @classmethod
+    def from_vars(cls, variables: Dict):
+        state = cls.__new__(cls)
+        state._set_array(np.zeros(cls.size, dtype=cls.dtype))
+        for name, value in variables.items():
+            if name in cls.fields:
+                state.__dict__[name][...] = value
+            else:
+                state.__dict__[name] = value
+        return state
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return False
+        if not np.array_equal(self._array, other._array):
+            return False
+        fields = self.fields
+        return {name: value for name, value in self.__dict__.items() if name not in fields} == \
+            {name: value for name, value in other.__dict__.items() if name not in fields}
+
+    __hash__ = None
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __reduce__(self):
+        variables = {name: value.copy() if name in self.fields else value for name, value in self.__dict__.items()}
+        layout = tuple((name, shape) for name, (_, shape) in self.fields.items())
+        return _array_state, (type(self).__name__, layout, self.dtype.str, variables)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def array_state(class_name: str, variables: Dict[str, Union[int, Tuple[int, ...]]],
+                dtype=float) -> Type[ArrayState]:
+    """
+    Generates an ArrayState subclass with the given numeric variables, laid out in order in the state array.
+
+    *   RaceState = array_state('RaceState', {'loc': 2, 'v': 2}, dtype=int) creates the class, and
+        RaceState('state_0', loc=(3, 4)) a state with loc = [3, 4] and v = [0, 0]. Other variables are set as usual.
+
+    The same layout always generates the same class, so array states can be pickled.
+
+    :param class_name: Name of the generated class.
+    :param variables: Dictionary with the numeric variable names as keys and their shapes (or sizes) as values.
+    :param dtype: [Optional] dtype of the state array.
+    :return: The generated class.
+    """
+    layout = tuple((name, (shape,) if isinstance(shape, int) else tuple(shape)) for name, shape in variables.items())
+    dtype = np.dtype(dtype)
+    key = (class_name, layout, dtype.str)
+    cls = _array_classes.get(key)
+    if cls is not None:
+        return cls
+    fields, size = dict(), 0
+    body = dict(__module__=__name__)
+    for name, shape in layout:
+        assert name.isidentifier() and not name.startswith('__'), "Invalid state variable name: " + repr(name)
+        length = int(np.prod(shape))
+        fields[name] = (slice(size, size + length), shape)
+        size += length
+        body[name] = _ArrayField(name)
+    body.update(fields=fields, size=size, dtype=dtype)
+    cls = type(class_name, (ArrayState,), body)
+    _array_classes[key] = cls
+    return cls
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _array_state(class_name: str, layout: tuple, dtype: str, variables: Dict) -> ArrayState:
+    # unpickles an array state, generating its class if needed
+    return array_state(class_name, dict(layout), dtype).from_vars(variables)
+
+
+# ******************************************    Function Declaration End    ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of an ArrayState class ...")
+    RaceState = array_state('RaceState', {'loc': 2, 'v': 2}, dtype=int)
+    test_state = RaceState('test_state', loc=(3, 4), v=(1, 0))
+    test_state.walls = ((0, 0), (0, 10))
+    print(test_state)
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,17 @@
+"""
+Benchmark suite of IPyHOP. Runs pinned problem sets of the example domains under fixed seeds with IPyHOP and
+IPyHOP_Old, and writes machine readable results that can be compared across commits:
+
+    python -m ipyhop.bench run --suite quick --out results.json
+    python -m ipyhop.bench compare baseline.json results.json
+
+The example domains are imported from the examples directory of the repository, so run it from the repository root.
+The domains iterate over sets, so set PYTHONHASHSEED as well for runs to be reproducible.
+"""
+from ipyhop.bench.problems import BenchProblem, suite, SUITES
+from ipyhop.bench.runner import run_problem, run_suite, summarize, compare, percentiles, count_state_copies
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
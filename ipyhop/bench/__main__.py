@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+File Description: Command line interface of the IPyHOP benchmark suite (python -m ipyhop.bench).
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+import argparse
+import json
+import sys
+from ipyhop.bench.problems import suite, SUITES
+from ipyhop.bench.runner import run_suite, compare, PLANNERS
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m ipyhop.bench', description='IPyHOP benchmark suite.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run a problem set and write the results as JSON')
+    run_parser.add_argument('--suite', choices=SUITES, default='quick')
+    run_parser.add_argument('--domain', action='append', help='only run the problems of this domain (repeatable)')
+    run_parser.add_argument('--planner', action='append', choices=sorted(PLANNERS),
+                            help='planner to benchmark (repeatable, default: all)')
+    run_parser.add_argument('--seeds', type=int, default=1, help='number of seeds (0, 1, ...) per problem')
+    run_parser.add_argument('--no-diagnostics', action='store_true',
+                            help='skip the peak memory and state copy measurement run')
+    run_parser.add_argument('--out', help='output file (default: stdout)')
+
+    compare_parser = commands.add_parser('compare', help='report regressions of results against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='relative change reported (0.1 = 10%%)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        problems = suite(args.suite)
+        if args.domain:
+            problems = [problem for problem in problems if problem.domain in args.domain]
+        results = run_suite(problems, planners=args.planner or sorted(PLANNERS), seeds=range(args.seeds),
+                            diagnostics=not args.no_diagnostics, progress=args.out is not None)
+        if args.out is None:
+            json.dump(results, sys.stdout, indent=1)
+        else:
+            with open(args.out, 'w') as out_file:
+                json.dump(results, out_file, indent=1)
+        return 0
+
+    with open(args.baseline, 'r') as baseline_file, open(args.current, 'r') as current_file:
+        regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+    for regression in regressions:
+        print('{group}: {metric} {baseline:.6g} -> {current:.6g} ({change:+.1%})'.format(**regression))
+    return 1 if regressions else 0
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    sys.exit(main())
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the pinned benchmark problem sets.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from importlib import import_module, reload
+from typing import Callable, Dict, List
+import os
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class BenchProblem(object):
+    """
+    A benchmark problem. setup() builds a fresh instance of the problem, so that the problems do not share any
+    state (the example domains bind their rigid relations into the methods and actions they are given).
+
+    setup() returns a dictionary with:
+        *   'methods', 'actions'   : The Methods and Actions instances of the problem.
+        *   'state', 'task_list'   : The initial state and the task list.
+        *   'deviation_handler'    : None, or a callable(actions, planner) returning the deviation handler used by the
+            MonteCarloExecutor.
+        *   'branch_cycle_check'   : Value of IPyHOP.branch_cycle_check_flag for the problem.
+    """
+
+    def __init__(self, domain: str, name: str, setup: Callable[[], Dict]):
+        """
+        BenchProblem Constructor.
+
+        :param domain: Name of the domain of the problem.
+        :param name: Name of the problem, unique within the domain.
+        :param setup: Callable returning a fresh instance of the problem (see the class doc string).
+        """
+        self.domain = domain
+        self.name = name
+        self.setup = setup
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "BenchProblem({}/{})".format(self.domain, self.name)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _examples_dir() -> str:
+    return list(import_module('examples').__path__)[0]
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _pddl_problem(domain: str, init_name: str, number: int, branch_cycle_check: bool = True) -> BenchProblem:
+    # openstacks, rovers and satellite problems parsed from examples/<domain>/problems/pXX.pddl
+    name = 'p{:02d}'.format(number)
+
+    def setup():
+        actions_module = reload(import_module('examples.{}.domain.actions'.format(domain)))
+        methods_module = reload(import_module('examples.{}.domain.methods'.format(domain)))
+        deviations_module = reload(import_module('examples.{}.domain.deviations'.format(domain)))
+        example_module = import_module('examples.{0}.{0}_example'.format(domain))
+        with open(os.path.join(_examples_dir(), domain, 'problems', name + '.pddl'), 'r') as problem_file:
+            problem_str = problem_file.read()
+        actions, methods = actions_module.actions, methods_module.methods
+        state, goal, rigid = getattr(example_module, init_name)(problem_str, actions, methods)
+        return {'methods': methods, 'actions': actions, 'state': state, 'task_list': [goal],
+                'deviation_handler': lambda a, planner: deviations_module.deviation_handler(a, planner, rigid),
+                'branch_cycle_check': branch_cycle_check}
+
+    return BenchProblem(domain, name, setup)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _sampled_problem(domain: str, actions_path: str, methods_path: str, sampler_path: str,
+                     seed_val: int, branch_cycle_check: bool = True) -> BenchProblem:
+    # rescue and robosub problems drawn by their StateSampler with a pinned seed
+    def setup():
+        actions = reload(import_module(actions_path)).actions
+        methods = reload(import_module(methods_path)).methods
+        state_sampler = import_module(sampler_path).StateSampler(seed_val=seed_val)
+        state, task_list = state_sampler.sample(actions, methods, state_name='state_0')
+        return {'methods': methods, 'actions': actions, 'state': state, 'task_list': task_list,
+                'deviation_handler': None, 'branch_cycle_check': branch_cycle_check}
+
+    return BenchProblem(domain, 's{:02d}'.format(seed_val), setup)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _blocks_world_problem(number: int) -> BenchProblem:
+    # the three task based blocks world problems of examples/blocks_world/task_based
+    def setup():
+        actions = reload(import_module('examples.blocks_world.task_based.blocks_world_actions')).actions
+        methods = reload(import_module('examples.blocks_world.task_based.blocks_world_methods_1')).methods
+        problem = import_module('examples.blocks_world.task_based.blocks_world_problem')
+        state, goal = [(problem.init_state_1, problem.goal1a), (problem.init_state_2, problem.goal2a),
+                       (problem.init_state_3, problem.goal3)][number - 1]
+        return {'methods': methods, 'actions': actions, 'state': state, 'task_list': [('move_blocks', goal)],
+                'deviation_handler': None, 'branch_cycle_check': True}
+
+    return BenchProblem('blocks_world', 'p{:02d}'.format(number), setup)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def blocks_world(numbers=range(1, 4)) -> List[BenchProblem]:
+    return [_blocks_world_problem(number) for number in numbers]
+
+
+def openstacks(numbers=range(1, 31)) -> List[BenchProblem]:
+    # as in the openstacks example, branch cycle checking is disabled
+    return [_pddl_problem('openstacks', 'init_openstacks', number, branch_cycle_check=False) for number in numbers]
+
+
+def rovers(numbers=range(1, 21)) -> List[BenchProblem]:
+    return [_pddl_problem('rovers', 'init_rovers', number) for number in numbers]
+
+
+def satellite(numbers=range(1, 21)) -> List[BenchProblem]:
+    return [_pddl_problem('satellite', 'init_sat', number) for number in numbers]
+
+
+def rescue(seeds=range(10)) -> List[BenchProblem]:
+    # rescue plans revisit states (e.g. a robot moving back to a location), which branch cycle checking prunes
+    return [_sampled_problem('rescue', 'examples.rescue.domain.rescue_actions',
+                             'examples.rescue.domain.rescue_methods', 'examples.rescue.problem.rescue_prob_gen',
+                             seed_val, branch_cycle_check=False) for seed_val in seeds]
+
+
+def robosub(seeds=range(10)) -> List[BenchProblem]:
+    return [_sampled_problem('robosub', 'examples.robosub.domain.robosub_mod_actions',
+                             'examples.robosub.domain.robosub_mod_methods',
+                             'examples.robosub.problem.robosub_mod_prob_gen', seed_val) for seed_val in seeds]
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def suite(name: str) -> List[BenchProblem]:
+    """
+    :param name: 'full' (blocks world, openstacks p01-p30, rovers p01-p20, satellite p01-p20, rescue and robosub
+        with sampler seeds 0-9) or 'quick' (a few small problems of every domain).
+    :return: The pinned problem set.
+    """
+    if name == 'full':
+        return blocks_world() + openstacks() + rovers() + satellite() + rescue() + robosub()
+    if name == 'quick':
+        return blocks_world() + openstacks(range(1, 3)) + rovers(range(1, 4)) + satellite(range(1, 4)) + \
+            rescue(range(3)) + robosub(range(3))
+    raise ValueError("Unknown benchmark suite: " + repr(name))
+
+
+SUITES = ('quick', 'full')
+
+
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    for suite_name in SUITES:
+        print(suite_name, suite(suite_name))
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
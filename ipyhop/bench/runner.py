@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the benchmark runner, its summary statistics and regression checks.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from contextlib import contextmanager, redirect_stdout
+from time import perf_counter, strftime
+from typing import List, Dict, Optional, Sequence
+import io
+import os
+import platform
+import random
+import subprocess
+import tracemalloc
+import numpy as np
+from ipyhop.state import State
+from ipyhop.planner import IPyHOP
+from ipyhop.planner_old import IPyHOP_Old
+from ipyhop.actor import Actor
+from ipyhop.mc_executor import MonteCarloExecutor
+from ipyhop.bench.problems import BenchProblem
+
+PLANNERS = {'IPyHOP': IPyHOP, 'IPyHOP_Old': IPyHOP_Old}
+RESULTS_VERSION = 1
+PERCENTILES = (50, 90, 99)
+# summary metrics compared by compare(), and whether higher values are better
+SUMMARY_METRICS = {'plan_latency_p50': False, 'plan_latency_p90': False, 'replan_latency_p50': False,
+                   'replan_latency_p90': False, 'expansions_per_second': True, 'peak_memory': False,
+                   'state_copies': False, 'errors': False}
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+@contextmanager
+def count_state_copies():
+    """
+    Counts the calls of State.copy while the context is active (for all states, in all planners).
+
+    :return: A one element list holding the count.
+    """
+    counter = [0]
+    state_copy = State.copy
+
+    def counted_copy(self):
+        counter[0] += 1
+        return state_copy(self)
+
+    State.copy = counted_copy
+    try:
+        yield counter
+    finally:
+        State.copy = state_copy
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _timed(method, latencies: List[float]):
+    # wraps a bound planner method, appending the wall-clock latency of every call to latencies
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            latencies.append(perf_counter() - start)
+    return timed
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _act(problem: BenchProblem, planner_name: str, seed: int) -> Dict:
+    # plans and acts once (with replanning on failures), under a fixed seed
+    instance = problem.setup()
+    planner = PLANNERS[planner_name](instance['methods'], instance['actions'])
+    planner.branch_cycle_check_flag = instance['branch_cycle_check']
+    plan_latencies, replan_latencies = [], []
+    planner.plan = _timed(planner.plan, plan_latencies)
+    planner.replan = _timed(planner.replan, replan_latencies)
+    deviation_handler = None
+    if instance['deviation_handler'] is not None:
+        deviation_handler = instance['deviation_handler'](instance['actions'], planner)
+    random.seed(seed)
+    actor = Actor(planner, MonteCarloExecutor(instance['actions'], deviation_handler, seed=seed))
+    start = perf_counter()
+    # planners and actors report progress with print
+    with redirect_stdout(io.StringIO()):
+        history = actor.complete_to_do(instance['state'], instance['task_list'])
+    return {'total_time': perf_counter() - start, 'plan_latency': plan_latencies[0],
+            'replan_latencies': replan_latencies, 'node_expansions': planner.node_expansions,
+            'iterations': planner.iterations, 'history_length': None if history is False else len(history),
+            'status': 'no_plan' if history is False else 'ok'}
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def run_problem(problem: BenchProblem, planner_name: str, seed: int, diagnostics: bool = True) -> Dict:
+    """
+    Benchmarks one planner on one problem.
+
+    The timed run is not instrumented. With diagnostics, the run is repeated with the same seed while tracemalloc
+    and a State.copy counter are active, to measure the peak memory and the number of state copies.
+
+    :param problem: The problem.
+    :param planner_name: 'IPyHOP' or 'IPyHOP_Old'.
+    :param seed: Seed of random, numpy.random and the MonteCarloExecutor.
+    :param diagnostics: If True, peak_memory and state_copies are measured.
+    :return: A JSON serializable record of the run.
+    """
+    record = {'domain': problem.domain, 'problem': problem.name, 'planner': planner_name, 'seed': seed}
+    try:
+        record.update(_act(problem, planner_name, seed))
+        # expansions of the planning and replanning calls over the time spent in them
+        planning_time = record['plan_latency'] + sum(record['replan_latencies'])
+        record['expansions_per_second'] = record['node_expansions'] / planning_time if planning_time > 0 else None
+        if diagnostics:
+            tracemalloc.start()
+            try:
+                with count_state_copies() as copies:
+                    _act(problem, planner_name, seed)
+                record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+                record['state_copies'] = copies[0]
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        record.update(status='error', error='{}: {}'.format(type(e).__name__, e))
+    return record
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """
+    :return: {'p50': ..., 'p90': ..., 'p99': ...} of values (None if values is empty).
+    """
+    if len(values) == 0:
+        return {'p{}'.format(q): None for q in PERCENTILES}
+    return {'p{}'.format(q): float(np.percentile(values, q)) for q in PERCENTILES}
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def summarize(records: List[Dict]) -> Dict[str, Dict]:
+    """
+    Aggregates run records per domain and planner.
+
+    :param records: Records returned by run_problem.
+    :return: {'<domain>/<planner>': summary} with latency percentiles, the median expansions per second, the largest
+        peak memory, the mean number of state copies and the number of failed (no plan) and erroneous runs.
+    """
+    groups = dict()
+    for record in records:
+        groups.setdefault('{}/{}'.format(record['domain'], record['planner']), []).append(record)
+    summary = dict()
+    for key, group in sorted(groups.items()):
+        ok = [record for record in group if record['status'] != 'error']
+        entry = {'runs': len(group), 'errors': len(group) - len(ok),
+                 'no_plan': sum(record['status'] == 'no_plan' for record in ok)}
+        for name, value in percentiles([record['plan_latency'] for record in ok]).items():
+            entry['plan_latency_' + name] = value
+        replan_latencies = [latency for record in ok for latency in record['replan_latencies']]
+        entry['replans'] = len(replan_latencies)
+        for name, value in percentiles(replan_latencies).items():
+            entry['replan_latency_' + name] = value
+        rates = [record['expansions_per_second'] for record in ok if record['expansions_per_second'] is not None]
+        entry['expansions_per_second'] = float(np.median(rates)) if rates else None
+        memory = [record['peak_memory'] for record in ok if 'peak_memory' in record]
+        entry['peak_memory'] = max(memory) if memory else None
+        copies = [record['state_copies'] for record in ok if 'state_copies' in record]
+        entry['state_copies'] = float(np.mean(copies)) if copies else None
+        summary[key] = entry
+    return summary
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def run_suite(problems: List[BenchProblem], planners: Sequence[str] = ('IPyHOP', 'IPyHOP_Old'),
+              seeds: Sequence[int] = (0,), diagnostics: bool = True, progress: bool = False) -> Dict:
+    """
+    Benchmarks every planner on every problem, once per seed.
+
+    :param problems: The problems, see ipyhop.bench.problems.suite.
+    :param planners: Names of the planners ('IPyHOP' and/or 'IPyHOP_Old').
+    :param seeds: The seeds.
+    :param diagnostics: If True, peak memory and state copies are measured in a second run (see run_problem).
+    :param progress: If True, prints every record as it is completed.
+    :return: A JSON serializable dictionary with the metadata of the run, the records and their summary.
+    """
+    records = []
+    for problem in problems:
+        for planner_name in planners:
+            for seed in seeds:
+                records.append(run_problem(problem, planner_name, seed, diagnostics))
+                if progress:
+                    print(records[-1], flush=True)
+    return {'version': RESULTS_VERSION, 'commit': _commit(), 'time': strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(), 'machine': platform.platform(), 'seeds': list(seeds),
+            'python_hash_seed': os.environ.get('PYTHONHASHSEED'),
+            'records': records, 'summary': summarize(records)}
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    Compares the summaries of two results of run_suite.
+
+    :param baseline: The baseline results.
+    :param current: The results to check.
+    :param threshold: Relative change beyond which a metric is reported (0.1 is 10%).
+    :return: A list of {'group', 'metric', 'baseline', 'current', 'change'} for every metric of a domain/planner group
+        present in both results that got worse by more than threshold.
+    """
+    regressions = []
+    for group, entry in sorted(current['summary'].items()):
+        base_entry = baseline['summary'].get(group)
+        if base_entry is None:
+            continue
+        for metric, higher_is_better in SUMMARY_METRICS.items():
+            base_value, value = base_entry.get(metric), entry.get(metric)
+            if base_value is None or value is None:
+                continue
+            if base_value == 0:
+                change = 0.0 if value == 0 else float('inf')
+            else:
+                change = (value - base_value) / base_value
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append({'group': group, 'metric': metric, 'baseline': base_value, 'current': value,
+                                    'change': change})
+    return regressions
+
+
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    raise NotImplementedError("Test run / Demo routine for the benchmark runner isn't implemented, "
+                              "use python -m ipyhop.bench.")
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
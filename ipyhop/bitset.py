@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the interned symbol tables and the bitset backed boolean state variables.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Hashable, Iterable, List, Optional
+from uuid import uuid4
+from weakref import WeakValueDictionary
+
+# table id -> symbol table, so that unpickled symbol tables are the table of the process with the same id
+_symbol_tables = WeakValueDictionary()
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class Symbols(object):
+    """
+    A symbol table interning hashable objects (e.g. the object names parsed from a PDDL problem, or tuples of them)
+    to consecutive integers. Symbols are only ever added, so the integer of an object never changes.
+
+    *   symbols = Symbols(['o1', 'o2']) creates a table where symbols.index['o2'] == 1 and symbols.names[1] == 'o2'.
+
+    Copies (shallow or deep) of a symbol table are the table itself: the bitsets of all the copies of a state keep
+    indexing the same table. Every table has a unique table_id, and unpickling a table returns the table with the
+    same id if the process has one (interning the symbols it is missing), so the BoolMaps restored from a
+    checkpoint share the table of the live states.
+    """
+
+    def __init__(self, names: Iterable[Hashable] = (), table_id: Optional[str] = None):
+        """
+        Symbols Constructor.
+
+        :param names: [Optional] Objects to intern, in order.
+        :param table_id: [Optional] Unique id of the table, a new one by default.
+        """
+        self.table_id = uuid4().hex if table_id is None else table_id
+        self.names = []
+        self.index = dict()
+        for name in names:
+            self.intern(name)
+        _symbol_tables[self.table_id] = self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def intern(self, name: Hashable) -> int:
+        """
+        :param name: Any hashable object.
+        :return: The integer of name, interning it first if it is new.
+        """
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __len__(self):
+        return len(self.names)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __copy__(self):
+        return self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __deepcopy__(self, memo):
+        return self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __reduce__(self):
+        return _symbols, (self.table_id, self.names)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "Symbols({})".format(self.names)
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _symbols(table_id: str, names: List[Hashable]) -> Symbols:
+    # unpickles a symbol table: symbols are only ever added, so the names of the tables with the same id share a prefix
+    symbols = _symbol_tables.get(table_id)
+    if symbols is None:
+        return Symbols(names, table_id)
+    for name in names[len(symbols.names):]:
+        symbols.intern(name)
+    return symbols
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class BoolMap(MutableMapping):
+    """
+    A dict from interned objects to booleans, stored as two Python int bitsets over a symbol table: the bits of the
+    keys present and the bits of the True values. It supports the dict interface used by state variables (items,
+    keys, values, get, ...), but its values must be True or False and it iterates its keys in the order they were
+    interned.
+
+    Copies only copy two ints, and two BoolMaps over the same symbol table are compared (and hashed) with two ints.
+    BoolMaps over different symbol tables are never equal, a BoolMap and a dict are equal if they have the same
+    items. Like a dict key, a hashed BoolMap must not be modified.
+    mismatches() finds the unachieved goals of a multigoal variable with a few bitwise operations.
+    """
+    __slots__ = ('symbols', 'keys_mask', 'values_mask')
+
+    def __init__(self, symbols: Symbols, items=()):
+        """
+        BoolMap Constructor.
+
+        :param symbols: The symbol table indexing the keys.
+        :param items: [Optional] A dict (or iterable of key, value pairs) with the initial items.
+        """
+        self.symbols = symbols
+        self.keys_mask = 0
+        self.values_mask = 0
+        for key, value in dict(items).items():
+            self[key] = value
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __getitem__(self, key):
+        index = self.symbols.index.get(key)
+        if index is None or not self.keys_mask >> index & 1:
+            raise KeyError(key)
+        return bool(self.values_mask >> index & 1)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def get(self, key, default=None):
+        index = self.symbols.index.get(key)
+        if index is None or not self.keys_mask >> index & 1:
+            return default
+        return bool(self.values_mask >> index & 1)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __contains__(self, key):
+        index = self.symbols.index.get(key)
+        return index is not None and bool(self.keys_mask >> index & 1)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __setitem__(self, key, value):
+        if value is not True and value is not False:
+            raise TypeError("BoolMap values must be True or False, not " + repr(value))
+        bit = 1 << self.symbols.intern(key)
+        self.keys_mask |= bit
+        if value:
+            self.values_mask |= bit
+        else:
+            self.values_mask &= ~bit
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __delitem__(self, key):
+        index = self.symbols.index.get(key)
+        if index is None or not self.keys_mask >> index & 1:
+            raise KeyError(key)
+        self.keys_mask &= ~(1 << index)
+        self.values_mask &= ~(1 << index)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __iter__(self):
+        return iter(self._names(self.keys_mask))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __len__(self):
+        return bin(self.keys_mask).count('1')
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _names(self, mask: int) -> List[Hashable]:
+        # the interned objects of the bits set in mask, in interning order
+        names = self.symbols.names
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(names[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def copy(self):
+        new = BoolMap.__new__(BoolMap)
+        new.symbols = self.symbols
+        new.keys_mask = self.keys_mask
+        new.values_mask = self.values_mask
+        return new
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __copy__(self):
+        return self.copy()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __eq__(self, other):
+        if type(other) is BoolMap:
+            return other.symbols is self.symbols and self.keys_mask == other.keys_mask and \
+                self.values_mask == other.values_mask
+        return Mapping.__eq__(self, other)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __hash__(self):
+        return hash((id(self.symbols), self.keys_mask, self.values_mask))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def mismatches(self, other: Mapping) -> Dict:
+        """
+        :param other: A BoolMap or dict, e.g. the state variable of which self is the multigoal variable.
+        :return: A dict with the items of self whose key is missing from other or has another value in other.
+        """
+        if type(other) is BoolMap and other.symbols is self.symbols:
+            # keys of self that other has with the same value
+            matched = other.keys_mask & ~(self.values_mask ^ other.values_mask)
+            mask = self.keys_mask & ~matched
+            values_mask = self.values_mask
+            index = self.symbols.index
+            return {name: bool(values_mask >> index[name] & 1) for name in self._names(mask)}
+        return {key: value for key, value in self.items() if other.get(key) != value}
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def intern_bool_vars(obj, symbols: Symbols, names: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Replaces the boolean valued dict variables of a State or MultiGoal with BoolMaps over symbols (in place). A
+    multigoal must be interned with the symbol table of the states it is checked against, so that its goals are
+    checked with bitwise operations.
+
+    *   symbols = Symbols(); intern_bool_vars(state_0, symbols); intern_bool_vars(goal_a, symbols) compiles a problem.
+
+    :param obj: A State or MultiGoal.
+    :param symbols: The symbol table.
+    :param names: [Optional] Names of the variables to intern. By default, every non empty dict variable whose values
+        are all True or False is interned.
+    :return: The names of the interned variables.
+    """
+    interned = []
+    for name, value in list(vars(obj).items()):
+        if name.startswith('__') or not isinstance(value, dict) or (names is not None and name not in names):
+            continue
+        if names is None and (not value or any(val is not True and val is not False for val in value.values())):
+            continue
+        setattr(obj, name, BoolMap(symbols, value))
+        interned.append(name)
+    return interned
+
+
+# ******************************************    Function Declaration End    ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of BoolMap class ...")
+    test_map = BoolMap(Symbols(), {'o1': True, 'o2': False})
+    test_map['o3'] = True
+    print(test_map, test_map.mismatches({'o1': True, 'o2': True}))
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
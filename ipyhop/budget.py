@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of planning budgets and the result returned when they are exhausted.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from time import perf_counter, process_time
+from typing import Optional
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class PlanningBudget(object):
+    """
+    A planning budget limits the wall-clock time, the CPU time and/or the number of node expansions that IPyHOP may
+    spend in a single call. The limits are relative to the moment the budget is created.
+
+    *   budget = PlanningBudget(time_limit=1.0, node_expansions=planner.node_expansions) tells IPyHOP to stop
+        planning one second after the budget was created.
+    """
+
+    def __init__(self, time_limit: Optional[float] = None, cpu_time_limit: Optional[float] = None,
+                 max_expansions: Optional[int] = None, node_expansions: int = 0):
+        """
+        PlanningBudget Constructor.
+
+        :param time_limit: [Optional] Wall-clock time budget in seconds.
+        :param cpu_time_limit: [Optional] CPU time budget (of the current process) in seconds.
+        :param max_expansions: [Optional] Node expansion budget.
+        :param node_expansions: The node expansion count of the planner when the budget starts.
+        """
+        self.time_limit = time_limit
+        self.cpu_time_limit = cpu_time_limit
+        self.max_expansions = max_expansions
+        self.deadline = None if time_limit is None else perf_counter() + time_limit
+        self.cpu_deadline = None if cpu_time_limit is None else process_time() + cpu_time_limit
+        self.expansion_limit = None if max_expansions is None else node_expansions + max_expansions
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "PlanningBudget(time_limit={}, cpu_time_limit={}, max_expansions={})".format(
+            self.time_limit, self.cpu_time_limit, self.max_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def exhausted(self, node_expansions: int) -> Optional[str]:
+        """
+        :param node_expansions: The current node expansion count of the planner.
+        :return: 'expansions', 'time' or 'cpu_time' if the corresponding limit has been reached, else None.
+        """
+        if self.expansion_limit is not None and node_expansions >= self.expansion_limit:
+            return 'expansions'
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            return 'time'
+        if self.cpu_deadline is not None and process_time() >= self.cpu_deadline:
+            return 'cpu_time'
+        return None
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class BudgetExhausted(object):
+    """
+    Result returned by IPyHOP.plan, IPyHOP.replan and IPyHOP.resume when planning stopped because the budget ran out.
+    It is falsy, so `if not result` treats it like a failed planning call.
+
+    The planner keeps the partial solution tree (also available as result.sol_tree) and the suspended planning
+    loop. result.resume(...) (or planner.resume(...)) continues planning from exactly where it stopped, with a new
+    budget, and returns what the interrupted call would have returned.
+    """
+
+    def __init__(self, reason: str, planner):
+        """
+        BudgetExhausted Constructor.
+
+        :param reason: The limit that was reached: 'expansions', 'time' or 'cpu_time'.
+        :param planner: The IPyHOP instance whose planning call was interrupted.
+        """
+        self.reason = reason
+        self.planner = planner
+        self.sol_tree = planner.sol_tree
+        self.iterations = planner.iterations
+        self.node_expansions = planner.node_expansions
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __bool__(self):
+        return False
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "BudgetExhausted(reason={}, nodes={}, iterations={}, node_expansions={})".format(
+            repr(self.reason), len(self.sol_tree.nodes), self.iterations, self.node_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def resume(self, time_limit: Optional[float] = None, cpu_time_limit: Optional[float] = None,
+               max_expansions: Optional[int] = None):
+        """
+        Continues the interrupted planning call with a new budget. See IPyHOP.resume.
+        """
+        return self.planner.resume(time_limit=time_limit, cpu_time_limit=cpu_time_limit,
+                                   max_expansions=max_expansions)
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of PlanningBudget class ...")
+    test_budget = PlanningBudget(time_limit=1.0, max_expansions=10)
+    print(test_budget, test_budget.exhausted(10))
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
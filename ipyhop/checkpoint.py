@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the solution tree checkpoint format.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+from zlib import compress, decompress
+from networkx import DiGraph, dfs_preorder_nodes
+from ipyhop.mulitgoal import MultiGoal
+
+CHECKPOINT_VERSION = 1
+# node attributes that hold live objects, they are stored by index (or replay position) and rebuilt on load
+_LIVE_KEYS = ('state', 'methods', 'available_methods', 'selected_method', 'selected_method_instances', 'action')
+# planner attributes stored in a checkpoint
+_PLANNER_KEYS = ('task_list', 'sol_plan', 'blacklist', 'iterations', 'id_counter', 'node_expansions', 'max_depth',
+                 'depth_step_size', '_branch_cost', 'cost_bound')
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def save_checkpoint(planner) -> bytes:
+    """
+    Serializes the solution tree and the planning progress of an IPyHOP planner into a compact binary checkpoint.
+
+    Live objects are not stored: methods and actions are stored as indices into the planner's Methods and Actions,
+    and a method instance generator is stored as the number of instances consumed from it, so it can be rebuilt
+    by re-invoking the method. States are stored once per distinct value.
+
+    :param planner: An instance of IPyHOP class.
+    :return: The checkpoint as bytes.
+    """
+    states = []
+    state_ids = dict()
+
+    def state_id(state):
+        if state is None:
+            return None
+        blob = dumps(state, HIGHEST_PROTOCOL)
+        _id = state_ids.get(blob)
+        if _id is None:
+            _id = state_ids[blob] = len(states)
+            states.append(blob)
+        return _id
+
+    sol_tree = planner.sol_tree
+    nodes = []
+    for node_id in dfs_preorder_nodes(sol_tree, source=0):
+        node = sol_tree.nodes[node_id]
+        record = {key: val for key, val in node.items() if key not in _LIVE_KEYS}
+        if 'state' in node:
+            node_state = node['state']
+            if node_state is None and 'snapshot_dropped' in node and node['selected_method_instances'] is not None:
+                # the method instance generator is replayed from the state of the node, recompute the dropped snapshot
+                node_state = planner._recompute_snapshot(node_id)
+                del record['snapshot_dropped']
+            record['state'] = state_id(node_state)
+        if 'methods' in node:
+            methods = node['methods']
+            record['available_methods'] = [methods.index(method) for method in node['available_methods']]
+            selected_method = node['selected_method']
+            record['selected_method'] = None if selected_method is None else methods.index(selected_method)
+            if node['selected_method_instances'] is None:
+                record['instances_consumed'] = None
+        parent_id = next(sol_tree.predecessors(node_id), None)
+        nodes.append((node_id, parent_id, record))
+
+    checkpoint = {'version': CHECKPOINT_VERSION, 'states': states, 'nodes': nodes,
+                  'state': state_id(planner.state),
+                  'planner': {key: getattr(planner, key) for key in _PLANNER_KEYS}}
+    return compress(dumps(checkpoint, HIGHEST_PROTOCOL))
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def load_checkpoint(planner, data: bytes):
+    """
+    Restores the solution tree and the planning progress of an IPyHOP planner from a checkpoint created by
+    save_checkpoint. The planner must use the same methods and actions as the planner the checkpoint was taken from.
+
+    :param planner: An instance of IPyHOP class.
+    :param data: The checkpoint as bytes.
+    """
+    checkpoint = loads(decompress(data))
+    if checkpoint['version'] != CHECKPOINT_VERSION:
+        raise ValueError("Unsupported checkpoint version {}.".format(checkpoint['version']))
+    states = [loads(blob) for blob in checkpoint['states']]
+    for key, val in checkpoint['planner'].items():
+        setattr(planner, key, val)
+    methods = planner.methods
+    action_dict = planner.actions.action_dict
+
+    sol_tree = DiGraph()
+    replay = []
+    for node_id, parent_id, record in checkpoint['nodes']:
+        sol_tree.add_node(node_id, **record)
+        if parent_id is not None:
+            sol_tree.add_edge(parent_id, node_id)
+        node = sol_tree.nodes[node_id]
+        if 'state' in node:
+            node['state'] = None if node['state'] is None else states[node['state']]
+        node_type = node['type']
+        if node_type == 'A':
+            node['action'] = action_dict[node['info'][0]]
+        elif node_type in ('T', 'G', 'M'):
+            if node_type == 'T':
+                node_methods = methods.task_method_dict[node['info'][0]]
+            elif node_type == 'G':
+                node_methods = methods.goal_method_dict[node['info'][0]]
+            else:
+                node_methods = methods.multigoal_method_dict[node['info'].goal_tag]
+            node['methods'] = node_methods
+            node['available_methods'] = [node_methods[i] for i in node['available_methods']]
+            if node['selected_method'] is not None:
+                node['selected_method'] = node_methods[node['selected_method']]
+            node['selected_method_instances'] = None
+            if node.get('instances_consumed') is not None:
+                replay.append(node_id)
+    planner.sol_tree = sol_tree
+
+    # rebuild the method instance generators from the state each of them was created in, like the originals they
+    # hold the planner's (live) state
+    state = None if checkpoint['state'] is None else states[checkpoint['state']]
+    planner.state = None if state is None else state.copy()
+    for node_id in replay:
+        node = sol_tree.nodes[node_id]
+        planner.state.update(node['state'].copy())
+        method_args = (node['info'],) if isinstance(node['info'], MultiGoal) else node['info'][1:]
+        planner.search_strategy.replay_method_instances(planner, node, method_args, node['instances_consumed'])
+    if replay:
+        planner.state.update(state.copy())
+
+
+# ******************************************    Function Declaration End    ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    raise NotImplementedError("Test run / Demo routine for checkpoints isn't implemented.")
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the planner instrumentation (event sink with counters and timers).
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from collections import defaultdict
+from time import perf_counter
+from typing import Optional, List, Dict
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class PlannerInstrumentation(object):
+    """
+    An event sink for IPyHOP. It receives refine, backtrack, action, cycle check and replan events and keeps per
+    event counters and per category timers.
+
+    *   planner = IPyHOP(methods, actions, instrumentation=instrumentation) (or instrumentation.attach(planner))
+        tells IPyHOP to report to instrumentation.
+
+    Attaching shadows a few hot path helpers of the planner with timed versions that forward the events, and
+    detach(planner) removes them again. A planner without instrumentation runs its original code, so disabled
+    instrumentation costs nothing. Subclasses can override the on_* methods (calling super() keeps the counters)
+    to forward the events elsewhere.
+
+    The timer categories are:
+        *   'state_copy'  : copying states (restoring a node, the input of an action and node snapshots).
+        *   'method'      : getting method instances from the search strategy, i.e. running the method generators.
+        *   'action'      : running action functions.
+        *   'cycle_check' : branch cycle checking.
+        *   'networkx'    : solution tree edits (adding refinements and reopening choices when backtracking).
+        *   'replan'      : IPyHOP.replan calls (including the time spent in the categories above).
+    """
+
+    def __init__(self):
+        """
+        PlannerInstrumentation Constructor.
+        """
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "PlannerInstrumentation(counters={}, timers={})".format(dict(self.counters), dict(self.timers))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def reset(self):
+        """
+        Clears all counters and timers.
+        """
+        self.counters.clear()
+        self.timers.clear()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def report(self) -> Dict[str, Dict]:
+        """
+        :return: A dictionary with a copy of the counters and of the timers (in seconds).
+        """
+        return {'counters': dict(self.counters), 'timers': dict(self.timers)}
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def on_refine(self, planner, node_id: int, subtasks: Optional[List]):
+        """
+        Called every time a task, goal or multigoal node asks for its next method instance.
+
+        :param planner: The instrumented IPyHOP instance.
+        :param node_id: Id of the node being refined.
+        :param subtasks: The method instance used to refine the node, or None if the node could not be refined.
+        """
+        self.counters['refine' if subtasks is not None else 'refine_failed'] += 1
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def on_backtrack(self, planner, node_id: int, reopened_node_id: int):
+        """
+        Called every time planning backtracks.
+
+        :param planner: The instrumented IPyHOP instance.
+        :param node_id: Id of the node that failed.
+        :param reopened_node_id: Id of the node planning continues from (0 if it backtracked to the root).
+        """
+        self.counters['backtrack'] += 1
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def on_action(self, planner, node_id: int, action: tuple, new_state):
+        """
+        Called every time an action function is applied during planning.
+
+        :param planner: The instrumented IPyHOP instance.
+        :param node_id: Id of the action node.
+        :param action: The action tuple.
+        :param new_state: The resulting state, or None if the action failed.
+        """
+        self.counters['action' if new_state is not None else 'action_failed'] += 1
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def on_cycle_check(self, planner, node_id: int, cyclic: bool):
+        """
+        Called every time the branch cycle check runs (only when planner.branch_cycle_check_flag is True).
+
+        :param planner: The instrumented IPyHOP instance.
+        :param node_id: Id of the action node whose new state was checked.
+        :param cyclic: True if the new state repeats a state on the branch.
+        """
+        self.counters['cycle_check'] += 1
+        if cyclic:
+            self.counters['cycle_found'] += 1
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def on_replan(self, planner, action_position: int, result):
+        """
+        Called when a call to IPyHOP.replan (or a replanning session) completes.
+
+        :param planner: The instrumented IPyHOP instance.
+        :param action_position: The action_position replan was called with.
+        :param result: The result of replan.
+        """
+        self.counters['replan' if result is not False else 'replan_failed'] += 1
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def attach(self, planner):
+        """
+        Instruments planner. Any instrumentation already attached to it is detached first.
+
+        :param planner: An IPyHOP instance.
+        """
+        if planner.instrumentation is not None:
+            planner.instrumentation.detach(planner)
+        timers = self.timers
+        copy_state = planner._copy_state
+        snapshot = planner._snapshot
+        apply_action = planner._apply_action
+        next_refinement = planner._next_refinement
+        add_nodes_and_edges = planner._add_nodes_and_edges
+        reopen_last_choice = planner._reopen_last_choice
+        backtrack = planner._backtrack
+        branch_cyclic = planner.branch_cyclic
+        replan_steps = planner._replan_steps
+
+        def _copy_state(state):
+            start = perf_counter()
+            new_state = copy_state(state)
+            timers['state_copy'] += perf_counter() - start
+            return new_state
+
+        def _snapshot(state, parent_state=None):
+            start = perf_counter()
+            new_state = snapshot(state, parent_state)
+            timers['state_copy'] += perf_counter() - start
+            return new_state
+
+        def _apply_action(curr_node_id, curr_node, state):
+            start = perf_counter()
+            new_state = apply_action(curr_node_id, curr_node, state)
+            timers['action'] += perf_counter() - start
+            self.on_action(planner, curr_node_id, curr_node['info'], new_state)
+            return new_state
+
+        def _next_refinement(curr_node_id, curr_node, method_args):
+            start = perf_counter()
+            subtasks = next_refinement(curr_node_id, curr_node, method_args)
+            timers['method'] += perf_counter() - start
+            self.on_refine(planner, curr_node_id, subtasks)
+            return subtasks
+
+        def _add_nodes_and_edges(*args, **kwargs):
+            # tail splicing passes verify=False
+            start = perf_counter()
+            _id = add_nodes_and_edges(*args, **kwargs)
+            timers['networkx'] += perf_counter() - start
+            return _id
+
+        def _reopen_last_choice(p_node_id):
+            start = perf_counter()
+            reopened = reopen_last_choice(p_node_id)
+            timers['networkx'] += perf_counter() - start
+            return reopened
+
+        def _backtrack(p_node_id, c_node_id, verbose=0):
+            reopened = backtrack(p_node_id, c_node_id, verbose)
+            self.on_backtrack(planner, c_node_id, reopened[1])
+            return reopened
+
+        def _branch_cyclic(new_state, node_id):
+            if not planner.branch_cycle_check_flag:
+                return False
+            start = perf_counter()
+            cyclic = branch_cyclic(new_state, node_id)
+            timers['cycle_check'] += perf_counter() - start
+            self.on_cycle_check(planner, node_id, cyclic)
+            return cyclic
+
+        def _replan_steps(state, action_position, verbose):
+            start = perf_counter()
+            result = yield from replan_steps(state, action_position, verbose)
+            timers['replan'] += perf_counter() - start
+            self.on_replan(planner, action_position, result)
+            return result
+
+        planner.__dict__.update(_copy_state=_copy_state, _snapshot=_snapshot, _apply_action=_apply_action,
+                                _next_refinement=_next_refinement, _add_nodes_and_edges=_add_nodes_and_edges,
+                                _reopen_last_choice=_reopen_last_choice, _backtrack=_backtrack,
+                                branch_cyclic=_branch_cyclic, _replan_steps=_replan_steps)
+        planner.instrumentation = self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def detach(self, planner):
+        """
+        Removes the instrumentation from planner, which then runs its original code again.
+
+        :param planner: An IPyHOP instance this instrumentation is attached to.
+        """
+        for name in _INSTRUMENTED:
+            planner.__dict__.pop(name, None)
+        planner.instrumentation = None
+
+
+# names of the planner methods shadowed by PlannerInstrumentation.attach
+_INSTRUMENTED = ('_copy_state', '_snapshot', '_apply_action', '_next_refinement', '_add_nodes_and_edges',
+                 '_reopen_last_choice', '_backtrack', 'branch_cyclic', '_replan_steps')
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of PlannerInstrumentation class ...")
+    test_instrumentation = PlannerInstrumentation()
+    print(test_instrumentation)
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -25,7 +25,13 @@ class MonteCarloExecutor(object):
         self.actions = actions if actions is not None else self.actions
         self.exec_list = [(None, state.copy())]
         deviation_handler = self.deviation_handler
-        state_copy = state.copy()
+        # state reached by the last executed action, it is stored in exec_list and only copied when an action (or a
+        # deviation) is applied to it
+        curr_state = state.copy()
+        # handlers that keep incremental indexes over the executed actions are told where execution starts
+        if hasattr(deviation_handler, 'start_execution'):
+            deviation_handler.start_execution(curr_state, plan)
+        action_precond = self.actions.action_precond
         for i, act_inst in enumerate( plan ):
             # print(act_inst)
             act_name = act_inst[0]
@@ -35,17 +41,22 @@ class MonteCarloExecutor(object):
             result = np.random.choice(len(act_prob), 1, p=act_prob)[0]
             result_state = None
             if result == 0:
-                result_state = act_func(state_copy, *act_params)
+                precondition = action_precond.get(act_name)
+                if precondition is None or precondition(curr_state, *act_params):
+                    result_state = act_func(curr_state.copy(), *act_params)
             else:
                 if deviation_handler is not None:
-                    deviation_state = deviation_handler( i, plan, state_copy )
+                    # the handler returns curr_state itself, or a copy of it when it applies a deviation
+                    deviation_state = deviation_handler( i, plan, curr_state )
                     # print(self.exec_list)
                     self.exec_list[ -1 ] = (self.exec_list[ -1 ][ 0 ], deviation_state)
-                    result_state = act_func( deviation_state, *act_params )
+                    precondition = action_precond.get(act_name)
+                    if precondition is None or precondition(deviation_state, *act_params):
+                        result_state = act_func( deviation_state.copy(), *act_params )
             self.exec_list.append( (act_inst, result_state) )
             if result_state is None:
                 return self.exec_list
-            state_copy = result_state.copy()
+            curr_state = result_state
         return self.exec_list
 
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the solution tree memory report and the snapshot reclamation policies.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from functools import partial
+from inspect import isgenerator, getgeneratorstate, GEN_CLOSED
+from operator import length_hint
+from sys import getsizeof
+from typing import Dict
+from networkx import dfs_preorder_nodes
+from ipyhop.snapshot_store import deep_sizeof
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class SnapshotPolicy(object):
+    """
+    A snapshot policy decides which task, goal and multigoal nodes keep the state snapshot they save when they are
+    refined. The snapshot is only read again if planning backtracks into the node, and a dropped snapshot is then
+    recomputed by replaying the actions of the solution tree from the nearest earlier node that kept its snapshot.
+    Dropping snapshots trades memory for that replay time.
+
+    *   planner = IPyHOP(methods, actions, snapshot_policy=policy) tells IPyHOP to reclaim the snapshots policy does
+        not keep.
+
+    The base class keeps every snapshot, which is the default IPyHOP behaviour. The first node refined by every
+    planning (or repair) step always keeps its snapshot, as the replay starts from it. Branch cycle checking only
+    compares states with the snapshots that are kept.
+    """
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def keep(self, planner, node_id: int, node: dict) -> bool:
+        """
+        Called when a task, goal or multigoal node has been refined.
+
+        :param planner: The IPyHOP instance using this policy.
+        :param node_id: Id of the refined node.
+        :param node: Node attribute dictionary of the refined node.
+        :return: True if the node keeps its state snapshot, False if it is dropped.
+        """
+        return True
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class ChoicePointSnapshotPolicy(SnapshotPolicy):
+    """
+    Keeps the snapshots of choice points only: nodes with methods left to try after the one they were refined with,
+    or whose method instances may still yield another refinement. A suspended generator cannot tell whether it will
+    yield again, so nodes refined by generator methods are always choice points; methods returning an iterator that
+    knows how many instances it has left (over a list, for example) let the nodes refined with their last instance
+    drop their snapshots, as such nodes are usually not backtracked into.
+    """
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def keep(self, planner, node_id: int, node: dict) -> bool:
+        return len(node['available_methods']) > 1 or _may_yield(node['selected_method_instances'])
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _may_yield(method_instances) -> bool:
+    # False only if method_instances is known to be exhausted
+    if method_instances is None:
+        return False
+    if isgenerator(method_instances):
+        return getgeneratorstate(method_instances) != GEN_CLOSED
+    return length_hint(method_instances, 1) > 0
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _domain_objects(planner):
+    # functions and the arguments bound to them (rigid relations) are shared by the whole domain, not the nodes
+    methods, actions = planner.methods, planner.actions
+    functions = [*actions.action_dict.values()]
+    for method_dict in (methods.task_method_dict, methods.goal_method_dict, methods.multigoal_method_dict):
+        for method_list in method_dict.values():
+            functions.extend(method_list)
+    objects = []
+    for function in functions:
+        objects.append(function)
+        if isinstance(function, partial):
+            objects.extend((function.func, function.args, function.keywords))
+    return objects
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _generator_sizeof(method_instances, seen: set) -> int:
+    # a generator holds its frame (and the objects its local variables reference) alive, other iterators hold the
+    # sequence they iterate over
+    size = 0 if id(method_instances) in seen else getsizeof(method_instances)
+    seen.add(id(method_instances))
+    if isgenerator(method_instances):
+        if method_instances.gi_frame is not None:
+            size += deep_sizeof(method_instances.gi_frame.f_locals, seen)
+    else:
+        try:
+            size += deep_sizeof(method_instances.__reduce__()[1], seen)
+        except (TypeError, AttributeError):
+            pass
+    return size
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def memory_report(planner) -> Dict:
+    """
+    Accounts the memory held by the solution tree of planner, broken down by node type and by node depth.
+
+    Every node is charged with its state snapshot ('states'), its method instance generator ('generators') and its
+    node dictionary with the values it owns ('node_dicts'). Objects shared by several nodes are charged once, to the
+    first node in preorder. The planner's current state and the domain (methods, actions and the rigid relations
+    bound to them) are reported separately and never charged to the nodes.
+
+    :param planner: An IPyHOP instance.
+    :return: A dictionary with the bytes of the 'live_state' and the 'domain', the total 'states', 'generators' and
+        'node_dicts' bytes and their sum ('total'), the number of 'nodes', of 'snapshots' held, of 'dropped_snapshots'
+        and of live 'method_generators', and the same totals per node type ('by_type') and per depth ('by_depth').
+    """
+    seen = set()
+    live_state = 0 if planner.state is None else deep_sizeof(planner.state, seen)
+    domain = deep_sizeof(_domain_objects(planner), seen)
+    categories = ('states', 'generators', 'node_dicts')
+    report = {'live_state': live_state, 'domain': domain, 'total': 0, 'nodes': 0, 'snapshots': 0,
+              'dropped_snapshots': 0, 'method_generators': 0, 'by_type': dict(), 'by_depth': dict()}
+    report.update((category, 0) for category in categories)
+    sol_tree = planner.sol_tree
+    nodes = dfs_preorder_nodes(sol_tree, source=0) if len(sol_tree) > 0 else ()
+    for node_id in nodes:
+        node = sol_tree.nodes[node_id]
+        sizes = {category: 0 for category in categories}
+        if node.get('state') is not None:
+            sizes['states'] = deep_sizeof(node['state'], seen)
+            report['snapshots'] += 1
+        if node.get('snapshot_dropped'):
+            report['dropped_snapshots'] += 1
+        if node.get('selected_method_instances') is not None:
+            sizes['generators'] = _generator_sizeof(node['selected_method_instances'], seen)
+            report['method_generators'] += 1
+        node_dict = getsizeof(node)
+        for key, value in node.items():
+            if key in ('state', 'selected_method_instances'):
+                continue
+            if key == 'available_methods':
+                # the list is owned by the node, the methods are shared by the domain
+                node_dict += getsizeof(value)
+            else:
+                node_dict += deep_sizeof(value, seen)
+        sizes['node_dicts'] = node_dict
+        report['nodes'] += 1
+        for group, name in (('by_type', node['type']), ('by_depth', node['depth'])):
+            entry = report[group].setdefault(name, dict(nodes=0, **{category: 0 for category in categories}))
+            entry['nodes'] += 1
+            for category in categories:
+                entry[category] += sizes[category]
+        for category in categories:
+            report[category] += sizes[category]
+    report['total'] = sum(report[category] for category in categories)
+    return report
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of ChoicePointSnapshotPolicy class ...")
+    test_policy = ChoicePointSnapshotPolicy()
+    print(test_policy.keep(None, 1, {'available_methods': [], 'selected_method_instances': iter([])}))
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of method selection policies used by IPyHOP to order methods.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from typing import List, Callable, Dict, Tuple, Hashable
+from ipyhop.methods import get_method_name
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class MethodPolicy(object):
+    """
+    A method policy decides the order in which IPyHOP tries the relevant methods of a task, goal or multigoal.
+
+    *   planner = IPyHOP(methods, actions, method_policy=policy) tells IPyHOP to consult policy whenever the
+        available methods of a node are (re)initialized.
+
+    The base class keeps the declaration order and ignores all outcomes, which is the default IPyHOP behaviour.
+    Subclasses can override order, record_success and record_failure.
+    The method_key passed to every call is the task name, the goal state variable name or the multigoal tag.
+    """
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def order(self, method_key: Hashable, methods: List[Callable]) -> List[Callable]:
+        """
+        Returns the methods in the order they should be tried. The returned list is owned by the caller.
+
+        :param method_key: Task name, goal state variable name or multigoal tag of the node being refined.
+        :param methods: The relevant methods in declaration order.
+        :return: A new list containing the methods in the order they should be tried.
+        """
+        return [*methods]
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def record_success(self, method_key: Hashable, method: Callable, expansions: int):
+        """
+        Called once for every method that is part of a plan returned by IPyHOP.plan or IPyHOP.replan.
+
+        :param method_key: Task name, goal state variable name or multigoal tag of the refined node.
+        :param method: The method that refined the node.
+        :param expansions: Node expansions spent from selecting the method to completing the refined subtree.
+        """
+        pass
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def record_failure(self, method_key: Hashable, method: Callable, expansions: int):
+        """
+        Called every time all instances of a method have been exhausted without producing a plan.
+
+        :param method_key: Task name, goal state variable name or multigoal tag of the refined node.
+        :param method: The method that failed.
+        :param expansions: Node expansions spent from selecting the method to abandoning it.
+        """
+        pass
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def expansions_saved_by_order(self, method_key: Hashable, declared_methods: List[Callable],
+                                  tried_methods: List[Callable], method: Callable):
+        """
+        Called alongside record_success with the methods that were tried (and failed) before the successful one.
+        Policies that keep performance counters can use this to estimate the effect of their ordering.
+
+        :param method_key: Task name, goal state variable name or multigoal tag of the refined node.
+        :param declared_methods: The relevant methods in declaration order.
+        :param tried_methods: The methods that failed before method was selected.
+        :param method: The method that refined the node.
+        """
+        pass
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class AdaptiveMethodPolicy(MethodPolicy):
+    """
+    A method policy that learns from previous planning and replanning calls.
+
+    For every (method_key, method name) pair it tracks how often the method succeeded or failed and how many node
+    expansions it took to do so. Methods are tried in decreasing order of their (Laplace smoothed) success rate,
+    ties are broken by the mean number of expansions to success, and otherwise the declaration order is kept.
+
+    All the statistics are stored in a dictionary member variable named stats with the following structure::
+
+        {(method_key, method_name): [successes, failures, success_expansions, failure_expansions], ...}
+
+    Performance counters:
+        *   estimated_expansions_saved is a model estimate, not a measured saving: it is never compared with the
+            expansions a search with the declaration order would actually spend. For every method in a returned
+            plan, it adds the expected failure cost (see expected_failure_cost) of the methods the declaration order
+            would have tried first, minus that of the methods actually tried first, both taken from the statistics
+            learned so far. Negative values mean the model expects the ordering to have hurt. To measure the saving,
+            plan the same problem with MethodPolicy() and compare the node expansions of both planners.
+        *   reordered_nodes is the number of calls of order (one per node whose available methods are initialized)
+            whose learned order differed from the declaration order, so a task refined by many nodes is counted
+            many times. reordered_keys is the set of method keys that were reordered at least once.
+    """
+
+    def __init__(self, prior: float = 1.0):
+        """
+        AdaptiveMethodPolicy Constructor.
+
+        :param prior: Pseudo count added to both successes and failures of every method (Laplace smoothing).
+        """
+        self.prior = prior
+        self.stats = dict()
+        self.estimated_expansions_saved = 0.0
+        self.reordered_nodes = 0
+        self.reordered_keys = set()
+
+    _stats_type = Dict[Tuple[Hashable, str], List]
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __str__(self):
+        p_str = '\n\r{:<30}{:<30}{:>10}{:>10}{:>12}'.format('KEY:', 'METHOD:', 'SUCCESS:', 'FAILURE:', 'MEAN EXP:')
+        for (method_key, method_name), (successes, failures, s_exp, f_exp) in self.stats.items():
+            mean_exp = (s_exp + f_exp) / (successes + failures) if successes + failures else 0
+            p_str += '\n{:<30}{:<30}{:>10}{:>10}{:>12.2f}'.format(str(method_key), method_name, successes,
+                                                                  failures, mean_exp)
+        p_str += '\n\n\restimated (not measured) expansions saved: {:.2f}, reordered nodes: {}, reordered keys: {}'.format(
+            self.estimated_expansions_saved, self.reordered_nodes, len(self.reordered_keys))
+        return p_str
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return self.__str__()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _entry(self, method_key: Hashable, method: Callable) -> List:
+        key = (method_key, get_method_name(method))
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = [0, 0, 0, 0]
+            self.stats[key] = entry
+        return entry
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def success_rate(self, method_key: Hashable, method: Callable) -> float:
+        """
+        :return: The Laplace smoothed success rate of method for method_key.
+        """
+        successes, failures, _, _ = self.stats.get((method_key, get_method_name(method)), (0, 0, 0, 0))
+        return (successes + self.prior) / (successes + failures + 2 * self.prior)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def expected_failure_cost(self, method_key: Hashable, method: Callable) -> float:
+        """
+        :return: The expected number of node expansions wasted if method is tried and fails. A method that has
+            never failed is assumed to cost a single expansion to fail.
+        """
+        _, failures, _, f_exp = self.stats.get((method_key, get_method_name(method)), (0, 0, 0, 0))
+        mean_failure_cost = f_exp / failures if failures else 1
+        return (1 - self.success_rate(method_key, method)) * mean_failure_cost
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def order(self, method_key: Hashable, methods: List[Callable]) -> List[Callable]:
+        def sort_key(method):
+            successes, _, s_exp, _ = self.stats.get((method_key, get_method_name(method)), (0, 0, 0, 0))
+            mean_success_cost = s_exp / successes if successes else 0
+            return -self.success_rate(method_key, method), mean_success_cost
+
+        # sorted is stable, so methods without a preference keep their declaration order
+        ordered_methods = sorted(methods, key=sort_key)
+        if ordered_methods != methods:
+            self.reordered_nodes += 1
+            self.reordered_keys.add(method_key)
+        return ordered_methods
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def record_success(self, method_key: Hashable, method: Callable, expansions: int):
+        entry = self._entry(method_key, method)
+        entry[0] += 1
+        entry[2] += expansions
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def record_failure(self, method_key: Hashable, method: Callable, expansions: int):
+        entry = self._entry(method_key, method)
+        entry[1] += 1
+        entry[3] += expansions
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def expansions_saved_by_order(self, method_key: Hashable, declared_methods: List[Callable],
+                                  tried_methods: List[Callable], method: Callable):
+        declared_tried = declared_methods[:declared_methods.index(method)]
+        declared_cost = sum(self.expected_failure_cost(method_key, m) for m in declared_tried)
+        actual_cost = sum(self.expected_failure_cost(method_key, m) for m in tried_methods)
+        self.estimated_expansions_saved += declared_cost - actual_cost
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    def test_method_1(): return False
+    def test_method_2(): return False
+
+    print("Test instantiation of AdaptiveMethodPolicy class ...")
+    policy = AdaptiveMethodPolicy()
+    policy.record_failure('test_task', test_method_1, 5)
+    policy.record_success('test_task', test_method_2, 3)
+    print([m.__name__ for m in policy.order('test_task', [test_method_1, test_method_2])])
+    print(policy)
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
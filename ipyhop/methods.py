@@ -6,6 +6,7 @@ File Description: File used for definition of Methods Class.
 # ******************************************    Libraries to be imported    ****************************************** #
 from __future__ import print_function, division
 from typing import List, Callable, Union, Any
+from ipyhop.bitset import BoolMap
 
 
 # ******************************************    Class Declaration Start     ****************************************** #
@@ -104,6 +105,21 @@ class Methods(object):
 
 # ******************************************    Class Declaration End       ****************************************** #
 
+# **************************************        Function Declaration        ****************************************** #
+def get_method_name(method: Callable) -> str:
+    """
+    get_method_name returns the name of a method function. Methods partially evaluated with functools.partial
+    (e.g. to bind rigid relations) are named after the wrapped function.
+
+    :param method: A method function or a functools.partial of a method function.
+    :return: The name of the method.
+    """
+    try:
+        return method.func.__name__
+    except AttributeError:
+        return method.__name__
+
+
 # **************************************        Function Declaration        ****************************************** #
 def _goals_not_achieved(state, multigoal):
     """
@@ -124,9 +140,16 @@ def _goals_not_achieved(state, multigoal):
     for name in vars(multigoal):
         if name == '__name__' or name == 'goal_tag':
             continue
-        for arg in vars(multigoal).get(name):
-            val = vars(multigoal).get(name).get(arg)
-            if val != vars(state).get(name).get(arg):
+        goal_values = vars(multigoal).get(name)
+        if type(goal_values) is BoolMap:
+            # interned boolean goals are checked with bitwise operations
+            mismatches = goal_values.mismatches(getattr(state, name))
+            if mismatches:
+                unachieved[name] = mismatches
+            continue
+        for arg in goal_values:
+            val = goal_values.get(arg)
+            if val != getattr(state, name).get(arg):
                 # want arg_value_pairs.name[arg] = val
                 if not unachieved.get(name):
                     unachieved.update({name: {}})
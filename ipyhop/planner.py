@@ -6,17 +6,24 @@ File Description: File used for definition of IPyHOP Class.
 # ******************************************    Libraries to be imported    ****************************************** #
 from __future__ import print_function, division
 from itertools import count
-from typing import List, Tuple, Union, Optional, Dict
-
-import networkx as nx
-
-from ipyhop.methods import Methods
+from typing import List, Tuple, Union, Optional, Dict, Iterator, TextIO
+from io import StringIO
+
+from ipyhop.methods import Methods, get_method_name
+from ipyhop.method_policy import MethodPolicy
+from ipyhop.search_strategies import SearchStrategy, DepthFirstSearch
+from ipyhop.budget import PlanningBudget, BudgetExhausted
+from ipyhop.session import PlanningSession
+from ipyhop.checkpoint import save_checkpoint, load_checkpoint
+from ipyhop.snapshot_store import StateSnapshotStore
+from ipyhop.instrumentation import PlannerInstrumentation
+from ipyhop.memory import SnapshotPolicy, memory_report
 from ipyhop.actions import Actions
 from ipyhop.state import State
+from ipyhop.bitset import BoolMap
 from ipyhop.mulitgoal import MultiGoal
-from networkx import DiGraph, dfs_preorder_nodes, descendants, is_tree, ancestors, bfs_successors
+from networkx import DiGraph, dfs_preorder_nodes, descendants, is_tree, ancestors
 from copy import deepcopy
-import re
 import keyword
 
 # ******************************************    Class Declaration Start     ****************************************** #
@@ -29,12 +36,32 @@ class IPyHOP(object):
         To plan using the planner, you should use planner.plan(state, task_list).
     """
 
-    def __init__(self, methods: Methods, actions: Actions, verbose: Optional[int]=0 ):
+    def __init__(self, methods: Methods, actions: Actions, verbose: Optional[int]=0,
+                 method_policy: Optional[MethodPolicy]=None, search_strategy: Optional[SearchStrategy]=None,
+                 snapshot_store: Optional[StateSnapshotStore]=None,
+                 instrumentation: Optional[PlannerInstrumentation]=None,
+                 snapshot_policy: Optional[SnapshotPolicy]=None, tail_splicing: bool=False ):
         """
         IPyHOP Constructor.
 
         :param methods: An instance of Methods class containing the collection of methods in the planning domain.
         :param actions: An instance of Actions class containing the collection of actions in the planning domain.
+        :param verbose: [Optional] An integer specifying the default level of verbosity for IPyHOP.
+        :param method_policy: [Optional] An instance of MethodPolicy class deciding the order in which methods are
+            tried. If None, methods are tried in declaration order.
+        :param search_strategy: [Optional] An instance of SearchStrategy class deciding which method instance is
+            used next when refining a node. If None, IPyHOP uses left-to-right depth-first search.
+        :param snapshot_store: [Optional] An instance of StateSnapshotStore class deduplicating the state snapshots
+            saved in the solution tree. If None, every node saves its own copy of the state.
+        :param instrumentation: [Optional] An instance of PlannerInstrumentation class receiving planning events and
+            timing the planner's hot path. If None, the planner is not instrumented.
+        :param snapshot_policy: [Optional] An instance of SnapshotPolicy class deciding which nodes keep their state
+            snapshots. Dropped snapshots are recomputed if planning backtracks into their nodes. If None, every node
+            keeps its snapshot.
+        :param tail_splicing: [Optional] If True, a method instance ending with a recursive call (the same task, the
+            same goal or the same multigoal) has that last subtask spliced in as the next sibling of the refined node
+            instead of as its last child, so recursive decompositions do not make the solution tree deeper. Plans,
+            backtracking and repair are the same as without splicing, but max_depth no longer bounds the recursion.
         """
         self.methods = methods
         self.actions = actions
@@ -51,26 +78,37 @@ class IPyHOP(object):
         self._verbose = verbose
         # when True will perform branch cycle checking, when False will not
         self.branch_cycle_check_flag = True
+        self.method_policy = method_policy
+        self.search_strategy = search_strategy if search_strategy is not None else DepthFirstSearch()
+        # accumulated action cost of the current branch, saved and restored alongside node states
+        self._branch_cost = 0.0
+        # actions that would bring the branch cost to cost_bound or above fail (branch-and-bound)
+        self.cost_bound = None
+        # budget of the current planning step, and the planning session that has not finished yet
+        self.budget = None
+        self._session = None
+        self.snapshot_store = snapshot_store
+        # node id -> line of the last IPC plan written, for write_hddl_plan(changed_only=True)
+        self._hddl_lines = dict()
+        self.snapshot_policy = snapshot_policy
+        self.tail_splicing = tail_splicing
+        self.instrumentation = None
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     _t_type = List[Tuple[str]]
     _m_type = Optional[Methods]
     _op_type = Optional[Actions]
     _p_type = Union[List[Tuple[str]], bool]
-    # group 0: node id
-    # group 1: task/action string
-    # group 2: child node ids
-    re_shop_top_level = re.compile( r"^([0-9]+?)\s\((.+?)\)(\s->\s)?(.*?)$",
-                                    flags=re.MULTILINE | re.DOTALL )
-    # group 5
-    re_task = re.compile( r"(.+?)(?=\s|$)",
-                          flags=re.MULTILINE | re.DOTALL )
 
 
 
     # ******************************        Class Method Declaration        ****************************************** #
     def plan(self, state: State, task_list: _t_type, methods: _m_type = None, actions: _op_type = None,
              verbose: Optional[int] = None, initial_max_depth: Optional[int]=None,
-             depth_step_size: Optional[int]=None) -> Union[_p_type,bool]:
+             depth_step_size: Optional[int]=None, time_limit: Optional[float]=None,
+             cpu_time_limit: Optional[float]=None,
+             max_expansions: Optional[int]=None) -> Union[_p_type, bool, BudgetExhausted]:
         """
         IPyHOP.plan(state_1, tasks) tells IPyHOP to find a plan for accomplishing the task_list (a list of tasks)
         *tasks*, starting from an initial state *state_1*, using whatever methods and actions IPyHOP was constructed
@@ -86,6 +124,10 @@ class IPyHOP(object):
             * if verbose = 2, it also prints a message on each iteration;
             * if verbose = 3, it also prints info about what it's computing.
 
+        Planning can be limited by a wall-clock time, CPU time and/or node expansion budget. If the budget runs out,
+        a BudgetExhausted result is returned instead of the plan. The partial solution tree is kept, and planning can
+        be continued from where it stopped with IPyHOP.resume.
+
         :param state: An instance of State class containing the collection of variable bindings representing
             the current/initial state in the planning problem.
         :param task_list: A list of tasks that need to be accomplished in the planning problem.
@@ -94,17 +136,48 @@ class IPyHOP(object):
         :param actions: [Optional] An instance of Actions class containing the collection of actions in the
             planning domain.
         :param verbose: [Optional] An integer specifying the level of verbosity for IPyHOP.
-        :return:
+        :param initial_max_depth: [Optional] Maximum depth of the solution tree for the first planning attempt.
+        :param depth_step_size: [Optional] If set, the maximum depth is increased by this amount after every failed
+            planning attempt.
+        :param time_limit: [Optional] Wall-clock time budget in seconds.
+        :param cpu_time_limit: [Optional] CPU time budget in seconds.
+        :param max_expansions: [Optional] Node expansion budget.
+        :return: The plan as a list of actions, False if no plan exists, or BudgetExhausted if the budget ran out.
         """
+        session = self.plan_session(state, task_list, methods, actions, verbose, initial_max_depth, depth_step_size)
+        return self._run(session, time_limit, cpu_time_limit, max_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def plan_session(self, state: State, task_list: _t_type, methods: _m_type = None, actions: _op_type = None,
+                     verbose: Optional[int] = None, initial_max_depth: Optional[int] = None,
+                     depth_step_size: Optional[int] = None) -> PlanningSession:
+        """
+        Creates a PlanningSession for IPyHOP.plan, which can be stepped a few node expansions (or a time slice) at a
+        time with session.step(...). No planning is done until the session is stepped. The arguments are the same
+        as for IPyHOP.plan.
+
+        :return: An instance of PlanningSession class.
+        """
+        if verbose is None:
+            verbose = self._verbose
+        return self._new_session(self._plan_steps(state, task_list, methods, actions, verbose, initial_max_depth,
+                                                  depth_step_size))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _plan_steps(self, state: State, task_list: _t_type, methods: _m_type, actions: _op_type, verbose: int,
+                    initial_max_depth: Optional[int], depth_step_size: Optional[int]):
+        # body of IPyHOP.plan, suspended (yields) whenever the planning budget is exhausted
         self.state = state.copy()
         self.task_list = deepcopy(task_list)
         self.methods = self.methods if methods is None else methods
         self.actions = self.actions if actions is None else actions
-        if verbose is None:
-            verbose = self._verbose
         self.depth_step_size=depth_step_size
         self.max_depth=initial_max_depth if initial_max_depth is not None else depth_step_size
         self.iterations = 0
+        self._branch_cost = 0.0
+        self.search_strategy.reset(self)
+        if self.snapshot_store is not None:
+            self.snapshot_store.clear()
 
         if verbose > 0:
             run_info = '**IPyHOP, verbose = {verbosity}: **\n\tstate = {state}\n\ttasks/goals = {task_list}.'
@@ -121,7 +194,7 @@ class IPyHOP(object):
         original_task_list = [*self.sol_tree.successors(0)]
 
         while True:
-            _iter, _ = self._planning(parent_node_id, verbose=verbose)
+            _iter, _ = yield from self._planning(parent_node_id, verbose=verbose)
             self.iterations += _iter
             assert is_tree(self.sol_tree), "Error! Solution graph is not a tree."
 
@@ -129,41 +202,243 @@ class IPyHOP(object):
             for node_id in dfs_preorder_nodes(self.sol_tree, source=0):
                 if self.sol_tree.nodes[node_id]['type'] == 'A':
                     self.sol_plan.append( self.sol_tree.nodes[node_id]['info'] )
-            # if only root remains we need to increase max depth and try again
-            if len(self.sol_tree.nodes) > 1 or depth_step_size is None:
+            # if only root remains we need to increase max depth (or let the search strategy restart) and try again
+            if len(self.sol_tree.nodes) > 1:
+                break
+            elif depth_step_size is not None:
+                if verbose > 0:
+                    print( "No solution for max depth of " + str(self.max_depth))
+                    print( "Increasing max depth to " + str( self.max_depth + self.depth_step_size ) )
+                self.max_depth += self.depth_step_size
+            elif self.search_strategy.restart(self):
+                if verbose > 0:
+                    print( "No solution found, restarting search with " + type( self.search_strategy ).__name__ )
+            else:
                 break
-            elif verbose>0:
-                print( "No solution for max depth of " + str(self.max_depth))
-                print( "Increasing max depth to " + str( self.max_depth + self.depth_step_size ) )
             _id = self._add_nodes_and_edges( 0, self.task_list )
-
-
-            self.max_depth += self.depth_step_size
+            original_task_list = [*self.sol_tree.successors(0)]
 
         # print(self.sol_tree.nodes[0])
         # check for plan failure
         new_task_list = [*self.sol_tree.successors(0)]
-        print(self.sol_plan)
         if new_task_list != original_task_list:
             if verbose > 0:
                 print("No Plan Possible")
             return False
         else:
+            if self.method_policy is not None:
+                self._record_method_successes()
             return self.sol_plan
 
     # ******************************        Class Method Declaration        ****************************************** #
-    def _planning(self, sub_graph_root_node_id: int, verbose: Optional[int]=None):
+    def resume(self, time_limit: Optional[float] = None, cpu_time_limit: Optional[float] = None,
+               max_expansions: Optional[int] = None):
+        """
+        Continues the last IPyHOP.plan or IPyHOP.replan call that returned a BudgetExhausted result, from exactly
+        where it stopped. Starting a new plan or replan call discards the interrupted one.
+
+        :param time_limit: [Optional] Wall-clock time budget in seconds for this call.
+        :param cpu_time_limit: [Optional] CPU time budget in seconds for this call.
+        :param max_expansions: [Optional] Node expansion budget for this call.
+        :return: What the interrupted call would have returned, or BudgetExhausted if the new budget ran out too.
+        """
+        if self._session is None:
+            raise ValueError("There is no interrupted planning call to resume.")
+        return self._run(self._session, time_limit, cpu_time_limit, max_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def memory_report(self) -> Dict:
+        """
+        Accounts the memory held by the solution tree (state snapshots, method instance generators and node
+        dictionaries), broken down by node type and by depth. See ipyhop.memory.memory_report.
+
+        :return: The memory report as a dictionary.
+        """
+        return memory_report(self)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def checkpoint(self) -> bytes:
+        """
+        Saves the solution tree and the planning progress (including the position of every method instance
+        generator) in a compact, picklable binary checkpoint. A checkpoint can be taken at any time, e.g. while a
+        planning session is suspended, or before a risky plan repair.
+
+        :return: The checkpoint as bytes.
+        """
+        return save_checkpoint(self)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def restore_checkpoint(self, data: bytes, verbose: Optional[int] = None) -> PlanningSession:
+        """
+        Restores the solution tree and the planning progress saved by IPyHOP.checkpoint. The planner must use the
+        same methods and actions as the planner the checkpoint was taken from. Any unfinished planning session of
+        this planner is discarded.
+
+        The restored solution tree can be used with IPyHOP.replan right away. If it still has open nodes, e.g. because
+        the checkpoint was taken while planning was suspended, session.run() (or session.step(...)) of the returned
+        session finishes planning them exactly like the interrupted IPyHOP.plan call would have.
+
+        :param data: The checkpoint as bytes.
+        :param verbose: [Optional] An integer specifying the level of verbosity for IPyHOP.
+        :return: An instance of PlanningSession class that finishes planning the restored solution tree.
+        """
+        if verbose is None:
+            verbose = self._verbose
+        self._discard_session()
+        load_checkpoint(self, data)
+        return self._new_session(self._restored_plan_steps(verbose))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _restored_plan_steps(self, verbose: int):
+        # continue refinement below the parent of the first open node (in preorder) of a restored solution tree
+        original_task_list = [*self.sol_tree.successors(0)]
+        for node_id in dfs_preorder_nodes(self.sol_tree, source=0):
+            if node_id != 0 and self.sol_tree.nodes[node_id]['status'] == 'O':
+                parent_node_id = next(self.sol_tree.predecessors(node_id))
+                _iter, _ = yield from self._planning(0, verbose=verbose, start_node_id=parent_node_id)
+                self.iterations += _iter
+                break
+
+        self.sol_plan = [self.sol_tree.nodes[node_id]['info'] for node_id in dfs_preorder_nodes(self.sol_tree, source=0)
+                         if self.sol_tree.nodes[node_id]['type'] == 'A']
+        if len(self.sol_tree.nodes) == 1 or [*self.sol_tree.successors(0)] != original_task_list:
+            if verbose > 0:
+                print("No Plan Possible")
+            return False
+        if self.method_policy is not None:
+            self._record_method_successes()
+        return self.sol_plan
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _make_budget(self, time_limit: Optional[float], cpu_time_limit: Optional[float],
+                     max_expansions: Optional[int]) -> Optional[PlanningBudget]:
+        if time_limit is None and cpu_time_limit is None and max_expansions is None:
+            return None
+        return PlanningBudget(time_limit, cpu_time_limit, max_expansions, self.node_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @staticmethod
+    def _drive(steps):
+        # run planning steps until they finish (True, return value) or the budget is exhausted (False, reason)
+        try:
+            return False, next(steps)
+        except StopIteration as stop:
+            return True, stop.value
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _run(self, session: PlanningSession, time_limit: Optional[float], cpu_time_limit: Optional[float],
+             max_expansions: Optional[int]):
+        if session.step(max_expansions, time_limit, cpu_time_limit):
+            return session.result
+        return BudgetExhausted(session.reason, self)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _new_session(self, steps) -> PlanningSession:
+        self._discard_session()
+        self._session = PlanningSession(self, steps)
+        return self._session
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _discard_session(self):
+        if self._session is not None:
+            self._session.close()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def plan_anytime(self, state: State, task_list: _t_type, methods: _m_type = None, actions: _op_type = None,
+                     verbose: Optional[int] = None, time_limit: Optional[float] = None,
+                     cpu_time_limit: Optional[float] = None,
+                     max_expansions: Optional[int] = None) -> Iterator[Tuple[List[Tuple[str]], float]]:
+        """
+        IPyHOP.plan_anytime(state_1, tasks) is the anytime, cost-optimizing version of IPyHOP.plan. It is a generator
+        that yields (plan, cost) tuples, where cost is the sum of Actions.action_cost over the actions of the plan.
+
+        The first plan is the one IPyHOP.plan would return. After each plan, the search resumes from the last choice
+        point with branch-and-bound pruning: an action fails if it would make the accumulated cost of the branch
+        reach the cost of the best plan found so far. Every yielded plan is therefore strictly cheaper than the
+        previous one. The generator stops when the search space is exhausted (the last plan is optimal with respect
+        to the methods) or when the budget runs out.
+
+        When the generator stops, planner.sol_plan and planner.sol_tree hold the best plan found, so the solution
+        tree can be used with IPyHOP.replan and IPyHOP.hddl_plan_str.
+
+        :param state: An instance of State class containing the collection of variable bindings representing
+            the current/initial state in the planning problem.
+        :param task_list: A list of tasks that need to be accomplished in the planning problem.
+        :param methods: [Optional] An instance of Methods class containing the collection of methods in the
+            planning domain.
+        :param actions: [Optional] An instance of Actions class containing the collection of actions in the
+            planning domain.
+        :param verbose: [Optional] An integer specifying the level of verbosity for IPyHOP.
+        :param time_limit: [Optional] Wall-clock time budget in seconds, including the search for the first plan.
+        :param cpu_time_limit: [Optional] CPU time budget in seconds, including the search for the first plan.
+        :param max_expansions: [Optional] Node expansion budget, including the search for the first plan.
+        :return: A generator of (plan, cost) tuples with strictly decreasing costs.
+        """
+        if verbose is None:
+            verbose = self._verbose
+        self._discard_session()
+        self.budget = self._make_budget(time_limit, cpu_time_limit, max_expansions)
+        best_plan, best_tree = None, None
+        try:
+            finished, plan = self._drive(self._plan_steps(state, task_list, methods, actions, verbose, None, None))
+            while finished and plan is not False:
+                best_plan, best_cost = plan, self._branch_cost
+                best_tree = self._copy_sol_tree()
+                if verbose > 0:
+                    print("Found plan with cost {}".format(best_cost))
+                yield best_plan, best_cost
+                # resume the search from the last choice point, pruning branches at least as costly as the best plan
+                self.cost_bound = best_cost
+                parent_node_id, _ = self._reopen_last_choice(0)
+                if len(self.sol_tree.nodes) == 1:
+                    break
+                finished, result = self._drive(self._planning(0, verbose=verbose, start_node_id=parent_node_id))
+                if not finished or len(self.sol_tree.nodes) == 1:
+                    break
+                self.iterations += result[0]
+                plan = [self.sol_tree.nodes[node_id]['info'] for node_id in dfs_preorder_nodes(self.sol_tree, source=0)
+                        if self.sol_tree.nodes[node_id]['type'] == 'A']
+        finally:
+            self.cost_bound = None
+            self.budget = None
+            if best_tree is not None:
+                self.sol_plan = best_plan
+                self.sol_tree = best_tree
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _copy_sol_tree(self) -> DiGraph:
+        # copy of the solution tree that is not modified when the search continues on self.sol_tree
+        # (method instance generators are shared, so alternatives already consumed by the search are skipped)
+        sol_tree = self.sol_tree.copy()
+        for node_id, node in sol_tree.nodes(data=True):
+            if 'available_methods' in node:
+                node['available_methods'] = [*node['available_methods']]
+        return sol_tree
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _planning(self, sub_graph_root_node_id: int, verbose: Optional[int]=None,
+                  start_node_id: Optional[int]=None, stop_node_id: Optional[int]=None):
 
         if verbose is None:
             verbose = self._verbose
 
         _iter = 0
-        parent_node_id = sub_graph_root_node_id
+        # refinement starts below start_node_id (defaults to the sub graph root), and stops if backtracking reopens
+        # stop_node_id (the node a spliced tail was spliced from, when repairing the tail)
+        parent_node_id = sub_graph_root_node_id if start_node_id is None else start_node_id
         marked_node_id = None
         for _iter in count(0):
             # root of subtree has been reached, stop
             if parent_node_id in ancestors( self.sol_tree, sub_graph_root_node_id ):
                 break
+            # suspend if the planning budget is exhausted, the caller may resume with a new budget
+            if self.budget is not None:
+                reason = self.budget.exhausted(self.node_expansions)
+                while reason is not None:
+                    if verbose > 0:
+                        print('Iteration {}, Planning budget exhausted ({}).'.format(_iter, reason))
+                    yield reason
+                    reason = None if self.budget is None else self.budget.exhausted(self.node_expansions)
             curr_node_id = None
             # Get the first Open node from the immediate successors of parent node. (using BFS)
             for node_id in self.sol_tree.successors( parent_node_id ):
@@ -171,6 +446,9 @@ class IPyHOP(object):
                     curr_node_id = node_id
                     if marked_node_id is None:
                         marked_node_id = curr_node_id
+                        # the state replayed to recompute dropped snapshots starts from this node
+                        if self.snapshot_policy is not None:
+                            self.sol_tree.nodes[curr_node_id]['snapshot_pinned'] = True
                     if verbose > 1:
                         print('Iteration {}, Refining node {}.'.format(
                             _iter, repr(self.sol_tree.nodes[node_id]['info'])))
@@ -182,6 +460,9 @@ class IPyHOP(object):
                 # print(parent_node_id ==sub_graph_root_node_id)
                 if parent_node_id == sub_graph_root_node_id:
                     break
+                # the subtree of parent_node_id is complete, used to measure expansions to success of its method
+                if self.method_policy is not None:
+                    self.sol_tree.nodes[parent_node_id]['method_end'] = self.node_expansions
                 # Set the parent_node_id as predecessor of parent_node_id if available.
                 try:
                     parent_node_id = next( self.sol_tree.predecessors( parent_node_id ) )
@@ -196,27 +477,37 @@ class IPyHOP(object):
                         _iter, repr([self.sol_tree.nodes[x]['info'] for x in self.sol_tree.successors(parent_node_id)])))
             # Else, it means that an Open node was found in the subgraph. Refine the node.
             else:
-                curr_node_id, parent_node_id = self._node_refine( curr_node_id, parent_node_id, _iter, verbose )
+                if verbose > 2:
+                    curr_node_id, parent_node_id = self._traced_node_refine(curr_node_id, parent_node_id, _iter)
+                else:
+                    curr_node_id, parent_node_id = self._node_refine(curr_node_id, parent_node_id)
+                if curr_node_id == stop_node_id and self.sol_tree.nodes[curr_node_id]['status'] == 'O':
+                    break
             # if parent_node_id in ancestors( self.sol_tree, sub_graph_root_node_id ):
             #     break
         # return iteration count and reachable most bottom-left node in subtree
         return _iter, next( dfs_preorder_nodes( self.sol_tree, marked_node_id ) )
 
     # ******************************        Class Method Declaration        ****************************************** #
-    def _node_refine(self, curr_node_id: int, parent_node_id: int, _iter: int, verbose: Optional[int]=None ):
-        if verbose is None:
-            verbose = self._verbose
+    def _node_refine(self, curr_node_id: int, parent_node_id: int):
+        # untraced refinement, see _traced_node_refine for the verbose > 2 diagnostics
         self.node_expansions += 1
         curr_node = self.sol_tree.nodes[curr_node_id]
         if 'state' in curr_node:
+            # The snapshot of curr_node was dropped by the snapshot policy, recompute it.
+            if curr_node['state'] is None and 'snapshot_dropped' in curr_node:
+                curr_node['state'] = self._recompute_snapshot(curr_node_id)
+                del curr_node['snapshot_dropped']
             # If curr_node already has a value for state, it means that the algorithm backtracked to this node.
             if curr_node['state']:
-                # Modify the current state as the saved state at that node.
-                self.state.update(curr_node['state'].copy())
+                # Modify the current state (and branch cost) as the saved state at that node.
+                self.state.update(self._copy_state(curr_node['state']))
+                self._branch_cost = curr_node['branch_cost']
             # If curr_node doesn't have value for state, it means that the node is visited for the first time.
             else:
-                # Save the current state in the node.
-                curr_node['state'] = self.state.copy()
+                # Save the current state (and branch cost) in the node.
+                curr_node['state'] = self._snapshot(self.state, self.sol_tree.nodes[parent_node_id].get('state'))
+                curr_node['branch_cost'] = self._branch_cost
         curr_node_info = curr_node['info']
 
         # If current node is a Task
@@ -224,115 +515,56 @@ class IPyHOP(object):
 
             subtasks = None
             # consider failure if next decomposition would exceed max depth
-            # print(curr_node["depth"], self.max_depth)
             if self.max_depth is None or curr_node["depth"] < self.max_depth:
                 # If methods are available for refining the task, use them.
-                while curr_node[ 'available_methods' ] != [ ]:
-                    # get method instance
-                    if curr_node[ 'selected_method_instances' ] is None:
-                        method = curr_node[ 'available_methods' ][ 0 ]
-                        curr_node[ 'selected_method' ] = method
-                        # create method instance generator
-                        curr_node[ 'selected_method_instances' ] = method( self.state, *curr_node_info[ 1: ] )
-                    try:
-                        subtasks = next( curr_node[ 'selected_method_instances' ] )
-                    # exhausted all instances of selected method select new method
-                    except StopIteration:
-                        # get next method
-                        curr_node[ 'available_methods' ].pop( 0 )
-                        if len( curr_node[ 'available_methods' ] ) > 0:
-                            method = curr_node[ 'available_methods' ][ 0 ]
-                            curr_node[ 'selected_method' ] = method
-                            # create method instance generator
-                            curr_node[ 'selected_method_instances' ] = method( self.state, *curr_node_info[ 1: ] )
-                    if subtasks is not None:
-                        curr_node[ 'status' ] = 'C'
-                        _id = self._add_nodes_and_edges( curr_node_id, subtasks )
-                        parent_node_id = curr_node_id
-                        if verbose > 2:
-                            print( 'Iteration {}, Task {} successfully refined'.format( _iter,
-                                                                                        repr( curr_node_info ) ) )
-                            print( 'Iteration {}, Parent node modified to {}.'.format(
-                                _iter, repr( self.sol_tree.nodes[ parent_node_id ][ 'info' ] ) ) )
-                        break
+                subtasks = self._next_refinement(curr_node_id, curr_node, curr_node_info[1:])
+                if subtasks is not None:
+                    curr_node['status'] = 'C'
+                    self._add_refinement(curr_node_id, parent_node_id, subtasks)
+                    parent_node_id = curr_node_id
             if subtasks is None:
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    print('Iteration {}, Task {} refinement failed'.format(_iter, repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(
-                        _iter, repr(self.sol_tree.nodes[curr_node_id]['info'])))
 
         # If current node is an Action
         elif curr_node['type'] == 'A':
             new_state = None
-            # If the Action is not blacklisted
-            if curr_node_info not in self.blacklist:
-                new_state = curr_node['action'](self.state.copy(), *curr_node_info[1:])
-                if new_state is None or self.branch_cyclic( new_state, curr_node_id ):
-                    new_state = None
+            branch_cost = self._branch_cost + self.actions.action_cost[curr_node_info[0]]
+            # If the Action is not blacklisted and does not exceed the cost bound
+            if curr_node_info not in self.blacklist and (self.cost_bound is None or branch_cost < self.cost_bound):
+                # the state is only copied for actions whose precondition (if declared) holds in the current state
+                precondition = self.actions.action_precond.get(curr_node_info[0])
+                if precondition is None or precondition(self.state, *curr_node_info[1:]):
+                    new_state = self._apply_action(curr_node_id, curr_node, self._copy_state(self.state))
+                    if new_state is None or self.branch_cyclic( new_state, curr_node_id ):
+                        new_state = None
                 # If Action was successful, update the state.
                 if new_state is not None:
                     curr_node['status'] = 'C'
                     self.state.update(new_state)
-                    if verbose > 2:
-                        print('Iteration {}, Action {} successful.'.format(_iter, repr(curr_node_info)))
+                    self._branch_cost = branch_cost
             if new_state is None:
 
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    print('Iteration {}, Action {} failed.'.format(_iter, repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(
-                        _iter, repr(self.sol_tree.nodes[curr_node_id]['info'])))
 
         # If current node is a Goal
         elif curr_node['type'] == 'G':
             subgoals = None
             state_var, arg, desired_val = curr_node_info
             # Skip goal refinement if already achieved
-            if self.state.__dict__[state_var][arg] == desired_val:
+            if getattr(self.state, state_var)[arg] == desired_val:
                 curr_node['status'] = 'C'
                 subgoals = []
-                if verbose > 2:
-                    print('Iteration {}, Goal {} already achieved'.format(_iter, repr(curr_node_info)))
             else:
                 # consider failure if next decomposition would exceed max depth
-                if self.max_depth is None or curr_node[ "depth" ] < self.max_depth:
+                if self.max_depth is None or curr_node["depth"] < self.max_depth:
                     # If methods are available for refining the goal, use them.
-                    while curr_node[ 'available_methods' ] != [ ]:
-                        # get method instance
-                        if curr_node[ 'selected_method_instances' ] is None:
-                            method = curr_node[ 'available_methods' ][ 0 ]
-                            curr_node[ 'selected_method' ] = method
-                            # create method instance generator
-                            curr_node[ 'selected_method_instances' ] = method( self.state, *curr_node_info[ 1: ] )
-                        try:
-                            subgoals = next( curr_node[ 'selected_method_instances' ] )
-                        # exhausted all instances of selected method select new method
-                        except StopIteration:
-                            # get next method
-                            curr_node[ 'available_methods' ].pop( 0 )
-                            if len( curr_node[ 'available_methods' ] ) > 0:
-
-                                method = curr_node[ 'available_methods' ][ 0 ]
-                                curr_node[ 'selected_method' ] = method
-                                # create method instance generator
-                                curr_node[ 'selected_method_instances' ] = method( self.state, *curr_node_info[ 1: ] )
-                        if subgoals is not None:
-                            curr_node[ 'status' ] = 'C'
-                            _id = self._add_nodes_and_edges( curr_node_id, subgoals )
-                            parent_node_id = curr_node_id
-                            if verbose > 2:
-                                print( 'Iteration {}, Goal {} successfully refined'.format( _iter,
-                                                                                                 repr( curr_node_info ) ) )
-                                print( 'Iteration {}, Parent node modified to {}.'.format(
-                                    _iter, repr( self.sol_tree.nodes[ parent_node_id ][ 'info' ] ) ) )
-                            break
+                    subgoals = self._next_refinement(curr_node_id, curr_node, curr_node_info[1:])
+                    if subgoals is not None:
+                        curr_node['status'] = 'C'
+                        self._add_refinement(curr_node_id, parent_node_id, subgoals)
+                        parent_node_id = curr_node_id
             if subgoals is None:
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    print('Iteration {}, Goal {} refinement failed'.format(_iter, repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(
-                        _iter, repr(self.sol_tree.nodes[curr_node_id]['info'])))
 
         # If current node is a MultiGoal
         elif curr_node['type'] == 'M':
@@ -341,66 +573,24 @@ class IPyHOP(object):
             if not unachieved_goals:
                 curr_node['status'] = "C"
                 subgoals = []
-                if verbose > 2:
-                    print('Iteration {}, MultiGoal {} already achieved'.format(_iter, repr(curr_node_info)))
             else:
                 # consider failure if next decomposition would exceed max depth
-                if self.max_depth is None or curr_node[ "depth" ] < self.max_depth:
+                if self.max_depth is None or curr_node["depth"] < self.max_depth:
                     # If methods are available for refining the multigoal, use them.
-                    while curr_node[ 'available_methods' ] != [ ]:
-                        # get method instance
-                        if curr_node[ 'selected_method_instances' ] is None:
-                            # get next method
-                            method = curr_node[ 'available_methods' ][ 0 ]
-                            # print( method )
-                            curr_node[ 'selected_method' ] = method
-                            # create method instance generator
-                            curr_node[ 'selected_method_instances' ] = method( self.state, curr_node_info )
-                        try:
-                            # print( curr_node[ 'selected_method_instances' ] )
-                            subgoals = next( curr_node[ 'selected_method_instances' ] )
-                            # print( subgoals )
-                        # exhausted all instances of selected method select new method
-                        except StopIteration:
-                            # get next method
-                            curr_node[ 'available_methods' ].pop( 0 )
-                            if len( curr_node[ 'available_methods' ] ) > 0:
-
-                                method = curr_node[ 'available_methods' ][ 0 ]
-                                # print(method)
-                                curr_node[ 'selected_method' ] = method
-                                # create method instance generator
-                                curr_node[ 'selected_method_instances' ] = method( self.state, curr_node_info )
-                                # print( method( self.state, curr_node_info ) )
-                                # print( [  *curr_node[ 'selected_method_instances' ] ] )
-                        if subgoals is not None:
-                            curr_node[ 'status' ] = 'C'
-                            _id = self._add_nodes_and_edges( curr_node_id, subgoals )
-                            parent_node_id = curr_node_id
-                            if verbose > 2:
-                                print( 'Iteration {}, MultiGoal {} successfully refined'.format( _iter,
-                                                                                            repr( curr_node_info ) ) )
-                                print( 'Iteration {}, Parent node modified to {}.'.format(
-                                    _iter, repr( self.sol_tree.nodes[ parent_node_id ][ 'info' ] ) ) )
-                            break
+                    subgoals = self._next_refinement(curr_node_id, curr_node, (curr_node_info,))
+                    if subgoals is not None:
+                        curr_node['status'] = 'C'
+                        self._add_refinement(curr_node_id, parent_node_id, subgoals)
+                        parent_node_id = curr_node_id
             if subgoals is None:
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    print(
-                        'Iteration {}, MultiGoal {} refinement failed'.format(_iter, repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(
-                        _iter, repr(self.sol_tree.nodes[curr_node_id]['info'])))
 
         elif curr_node['type'] == 'VG':
             state_var, arg, desired_val = self.sol_tree.nodes[parent_node_id]['info']
-            if self.state.__dict__[state_var][arg] == desired_val:
+            if getattr(self.state, state_var)[arg] == desired_val:
                 curr_node['status'] = "C"
             else:
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    curr_node_info = self.sol_tree.nodes[curr_node_id]['info']
-                    print('Iteration {}, Goal {} Verification failed.'.format(_iter, repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(_iter, repr(curr_node_info)))
 
         elif curr_node['type'] == 'VM':
             unachieved_goals = self._goals_not_achieved(parent_node_id)
@@ -408,16 +598,170 @@ class IPyHOP(object):
                 curr_node['status'] = "C"
             else:
                 parent_node_id, curr_node_id = self._backtrack(parent_node_id, curr_node_id)
-                if verbose > 2:
-                    curr_node_info = self.sol_tree.nodes[curr_node_id]['info']
-                    print('Iteration {}, MultiGoal {} Verification failed.'.format(_iter,
-                                                                                   repr(curr_node_info)))
-                    print('Iteration {}, Backtracking to {}.'.format(_iter, repr(curr_node_info)))
+        if self.snapshot_policy is not None and curr_node['status'] == 'C' and curr_node.get('state') is not None:
+            self._reclaim_snapshot(curr_node_id, curr_node)
         return curr_node_id, parent_node_id
 
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _traced_node_refine(self, curr_node_id: int, parent_node_id: int, _iter: int):
+        # _node_refine with the verbose > 2 diagnostics, which are derived from the refined tree
+        curr_node = self.sol_tree.nodes[curr_node_id]
+        node_type, curr_node_info = curr_node['type'], curr_node['info']
+        new_curr_node_id, new_parent_node_id = self._node_refine(curr_node_id, parent_node_id)
+        sol_tree_nodes = self.sol_tree.nodes
+        refined = curr_node_id in sol_tree_nodes and curr_node['status'] == 'C'
+        kind = {'T': 'Task', 'A': 'Action', 'G': 'Goal', 'M': 'MultiGoal', 'VG': 'Goal', 'VM': 'MultiGoal'}[node_type]
+        if node_type in ('VG', 'VM'):
+            if not refined:
+                new_curr_node_info = sol_tree_nodes[new_curr_node_id]['info']
+                print('Iteration {}, {} {} Verification failed.'.format(_iter, kind, repr(new_curr_node_info)))
+                print('Iteration {}, Backtracking to {}.'.format(_iter, repr(new_curr_node_info)))
+        elif refined and node_type == 'A':
+            print('Iteration {}, Action {} successful.'.format(_iter, repr(curr_node_info)))
+        elif refined and node_type in ('G', 'M') and not any(True for _ in self.sol_tree.successors(curr_node_id)):
+            print('Iteration {}, {} {} already achieved'.format(_iter, kind, repr(curr_node_info)))
+        elif refined:
+            print('Iteration {}, {} {} successfully refined'.format(_iter, kind, repr(curr_node_info)))
+            print('Iteration {}, Parent node modified to {}.'.format(
+                _iter, repr(sol_tree_nodes[new_parent_node_id]['info'])))
+        else:
+            if node_type == 'A':
+                print('Iteration {}, Action {} failed.'.format(_iter, repr(curr_node_info)))
+            else:
+                print('Iteration {}, {} {} refinement failed'.format(_iter, kind, repr(curr_node_info)))
+            print('Iteration {}, Backtracking to {}.'.format(
+                _iter, repr(sol_tree_nodes[new_curr_node_id]['info'])))
+        return new_curr_node_id, new_parent_node_id
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    # the helpers below are the hot path of _node_refine, PlannerInstrumentation shadows them to time and count them
+    def _copy_state(self, state: State) -> State:
+        return state.copy()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _apply_action(self, curr_node_id: int, curr_node: dict, state: State) -> Optional[State]:
+        return curr_node['action'](state, *curr_node['info'][1:])
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _next_refinement(self, curr_node_id: int, curr_node: dict, method_args: tuple) -> Optional[List]:
+        return self.search_strategy.next_method_instance(self, curr_node_id, curr_node, method_args)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _snapshot(self, state: State, parent_state: Optional[State] = None) -> State:
+        # state snapshot saved in a node, shared through the snapshot store if there is one
+        if self.snapshot_store is None:
+            return state.copy()
+        return self.snapshot_store.snapshot(state, parent_state)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _reclaim_snapshot(self, curr_node_id: int, curr_node: dict):
+        # drop the snapshot of a refined node unless the snapshot policy keeps it
+        if curr_node.get('snapshot_pinned') or self.snapshot_policy.keep(self, curr_node_id, curr_node):
+            return
+        curr_node['state'] = None
+        curr_node['snapshot_dropped'] = True
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _recompute_snapshot(self, node_id: int) -> State:
+        # state of a node whose snapshot was dropped: the nearest earlier node (in preorder) that kept its snapshot,
+        # with the actions between them applied
+        preorder_nodes = []
+        for preorder_node_id in dfs_preorder_nodes(self.sol_tree, source=0):
+            if preorder_node_id == node_id:
+                break
+            preorder_nodes.append(preorder_node_id)
+        sol_tree_nodes = self.sol_tree.nodes
+        actions = []
+        for preorder_node_id in reversed(preorder_nodes):
+            node = sol_tree_nodes[preorder_node_id]
+            if node.get('state') is not None:
+                state = node['state'].copy()
+                break
+            if node['type'] == 'A':
+                actions.append(node)
+        else:
+            raise ValueError("No snapshot to recompute the snapshot of node {} from.".format(node_id))
+        for node in reversed(actions):
+            state = node['action'](state, *node['info'][1:])
+        parent_node_id = next(self.sol_tree.predecessors(node_id))
+        return self._snapshot(state, sol_tree_nodes[parent_node_id].get('state'))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _next_method_instance(self, curr_node: dict, method_args: tuple) -> Optional[List]:
+        """
+        Gets the next method instance (list of subtasks/subgoals) for a task, goal or multigoal node. The methods in
+        curr_node['available_methods'] are tried in order, and a method is dropped once all its instances are
+        exhausted. Instances that are None are skipped.
+
+        :param curr_node: Node attribute dictionary of a task, goal or multigoal node in the solution tree.
+        :param method_args: Arguments passed to the methods after the current state.
+        :return: The next method instance, or None if all the available methods are exhausted.
+        """
+        available_methods = curr_node['available_methods']
+        while available_methods:
+            # get method instance
+            if curr_node['selected_method_instances'] is None:
+                method = available_methods[0]
+                curr_node['selected_method'] = method
+                # create method instance generator
+                curr_node['selected_method_instances'] = method(self.state, *method_args)
+                # generator replay position, used by checkpoints
+                curr_node['instances_consumed'] = 0
+                if self.method_policy is not None:
+                    curr_node['method_start'] = self.node_expansions
+            try:
+                method_instance = next(curr_node['selected_method_instances'])
+                curr_node['instances_consumed'] += 1
+                # a None instance is not a refinement, try the next one
+                if method_instance is None:
+                    continue
+                return method_instance
+            # exhausted all instances of selected method select new method
+            except StopIteration:
+                method = available_methods.pop(0)
+                curr_node['selected_method_instances'] = None
+                if self.method_policy is not None:
+                    self.method_policy.record_failure(self._method_key(curr_node['info']), method,
+                                                      self.node_expansions - curr_node['method_start'])
+        return None
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _ordered_methods(self, node_info: Union[Tuple, MultiGoal], methods: List) -> List:
+        # initial value of available_methods for a node, ordered by the method policy if there is one
+        if self.method_policy is None:
+            return [*methods]
+        return self.method_policy.order(self._method_key(node_info), methods)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @staticmethod
+    def _method_key(node_info: Union[Tuple, MultiGoal]):
+        # task name, goal state variable name or multigoal tag
+        if isinstance(node_info, MultiGoal):
+            return node_info.goal_tag
+        return node_info[0]
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _record_method_successes(self):
+        # report every method in the solution tree that was not already reported by a previous plan or replan call
+        method_policy = self.method_policy
+        for node_id, node in self.sol_tree.nodes(data=True):
+            method_start = node.pop('method_start', None)
+            if method_start is None or node['status'] != 'C' or node['selected_method'] is None:
+                continue
+            method = node['selected_method']
+            method_key = self._method_key(node['info'])
+            tried_methods = [*node['methods']]
+            for untried_method in node['available_methods']:
+                tried_methods.remove(untried_method)
+            method_policy.expansions_saved_by_order(method_key, node['methods'], tried_methods, method)
+            method_end = node.get('method_end', self.node_expansions)
+            method_policy.record_success(method_key, method, max(method_end - method_start, 1))
+
     # ******************************        Class Method Declaration        ****************************************** #
     def replan(self, state: State, action_position: int, verbose: Optional[int] = 0,
-               depth_step_size: Optional[int]=None) -> Union[Tuple[_p_type,int],bool]:
+               depth_step_size: Optional[int]=None, time_limit: Optional[float]=None,
+               cpu_time_limit: Optional[float]=None,
+               max_expansions: Optional[int]=None) -> Union[Tuple[_p_type,int],bool,BudgetExhausted]:
         """
         repairs stored solution tree for a failure occuring at action_position given
         the state of the world
@@ -431,14 +775,38 @@ class IPyHOP(object):
                         higher verbosity increases detail of output in stdout valid for {0,1,2,3}
         depth_step_size :   Optional[int]
                         if set will limit how deep the solution tree may expand, otherwise unlimited
+        time_limit      :   Optional[float]
+                        wall-clock time budget in seconds
+        cpu_time_limit  :   Optional[float]
+                        CPU time budget in seconds
+        max_expansions  :   Optional[int]
+                        node expansion budget
 
         Returns
         -------
-        Union[_p_type,bool]
+        Union[_p_type,bool,BudgetExhausted]
                         if planning succeeds return a tuple with the plan at index 0 and the index where
-                        execution should resume at index 1, if planning fails returns False
+                        execution should resume at index 1, if planning fails returns False, if the budget
+                        is exhausted returns BudgetExhausted (repair can be continued with IPyHOP.resume)
 
         """
+        return self._run(self.replan_session(state, action_position, verbose), time_limit, cpu_time_limit,
+                         max_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def replan_session(self, state: State, action_position: int, verbose: Optional[int] = 0) -> PlanningSession:
+        """
+        Creates a PlanningSession for IPyHOP.replan, which can be stepped a few node expansions (or a time slice) at
+        a time with session.step(...). No repair is done until the session is stepped. The arguments are the same
+        as for IPyHOP.replan.
+
+        :return: An instance of PlanningSession class.
+        """
+        return self._new_session(self._replan_steps(state, action_position, verbose))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _replan_steps(self, state: State, action_position: int, verbose: Optional[int]):
+        # body of IPyHOP.replan, suspended (yields) whenever the planning budget is exhausted
         sol_tree = self.sol_tree
         # get root children for plan success validation
         original_task_list = [*sol_tree.successors(0)]
@@ -473,19 +841,20 @@ class IPyHOP(object):
             if node_id == 0:
                 break
             true_state = state_stack[ 0 ]
-            # get parent id
-            parent_id = next( sol_tree.predecessors( node_id ) )
+            # get parent id (a spliced tail is repaired before the node it was spliced from)
+            parent_id = self._branch_parent( node_id )
             parent_node = sol_tree.nodes[ parent_id ]
 
             # print( parent_id )
             # unexpand node
-            sol_tree.remove_nodes_from( descendants( sol_tree, node_id ) )
+            self._unexpand( node_id )
             node = sol_tree.nodes[ node_id ]
             # print(node["info"])
             node[ "status" ] = "O"
-            node[ 'available_methods' ] = [ *node[ 'methods' ] ] # CHANGE
+            node[ 'available_methods' ] = self._ordered_methods( node[ 'info' ], node[ 'methods' ] ) # CHANGE
             node[ "selected_method" ] = None
             node[ "state" ] = None
+            node.pop( "snapshot_dropped", None )
             # node[ "state" ] = true_state
             node[ "selected_method_instances" ] = None # CHANGE
 
@@ -497,7 +866,11 @@ class IPyHOP(object):
             # propagate expansion downward, backtracking if needed but never higher than current node
             if node[ "available_methods" ] != []:
                 self.state = true_state.copy()
-                _iter, exec_id = self._planning(parent_id ,verbose=verbose)
+                tree_parent_id = next( sol_tree.predecessors( node_id ) )
+                if tree_parent_id == parent_id:
+                    _iter, exec_id = yield from self._planning(parent_id ,verbose=verbose)
+                else:
+                    _iter, exec_id = yield from self._planning(tree_parent_id, verbose=verbose, stop_node_id=parent_id)
                 self.iterations += _iter
                 if node[ "status" ] == "O":
                     continue
@@ -508,10 +881,10 @@ class IPyHOP(object):
                 #     break
                 # if so return to previous node on stack else continue traversing up
                 prev_node = node_id_stack[ 1 ] if len( node_id_stack ) > 1 else None
-                grandparent_id = next( sol_tree.predecessors( parent_id ) )
+                grandparent_id = self._branch_parent( parent_id )
                 # do this to prevent altering precondition guarantees
                 # that is we have gone far enough up the tree that the previous node will be orphaned by repair
-                if prev_node in descendants( sol_tree, grandparent_id ):
+                if self._in_branch( grandparent_id, prev_node ):
                     node_id_stack.pop(0)
                     state_stack.pop(0)
                 continue
@@ -556,11 +929,15 @@ class IPyHOP(object):
         # plan repair success
         else:
             self.sol_plan = act_plan
+            if self.method_policy is not None:
+                self._record_method_successes()
             return act_plan, exec_plan_index
         # return self.sol_plan
 
     # ******************************        Class Method Declaration        ****************************************** #
-    def _add_nodes_and_edges(self, parent_node_id: int, children_node_info_list: List[Tuple[str]]):
+    def _add_nodes_and_edges(self, parent_node_id: int, children_node_info_list: List[Tuple[str]],
+                             verify: bool = True):
+        # verify is False when a spliced tail is added, its goal is verified by the tail itself
         _id = None
         parent_depth=self.sol_tree.nodes[parent_node_id]["depth"]
         for child_node_info in children_node_info_list:
@@ -568,13 +945,15 @@ class IPyHOP(object):
             if isinstance(child_node_info, MultiGoal):  # equivalent to type(child_node_info) == MultiGoal
                 relevant_methods = self.methods.multigoal_method_dict[child_node_info.goal_tag]
                 self.sol_tree.add_node(_id, info=child_node_info, type='M', status='O', state=None,
-                                       selected_method=None, available_methods=[*relevant_methods],
+                                       selected_method=None,
+                                       available_methods=self._ordered_methods(child_node_info, relevant_methods),
                                        methods=relevant_methods, selected_method_instances=None, depth=parent_depth+1 )
                 self.sol_tree.add_edge(parent_node_id, _id)
             elif child_node_info[0] in self.methods.task_method_dict:
                 relevant_methods = self.methods.task_method_dict[child_node_info[0]]
                 self.sol_tree.add_node(_id, info=child_node_info, type='T', status='O', state=None,
-                                       selected_method=None, available_methods=[*relevant_methods],
+                                       selected_method=None,
+                                       available_methods=self._ordered_methods(child_node_info, relevant_methods),
                                        methods=relevant_methods, selected_method_instances=None, depth=parent_depth+1)
                 self.sol_tree.add_edge(parent_node_id, _id)
             elif child_node_info[0] in self.actions.action_dict:
@@ -584,21 +963,100 @@ class IPyHOP(object):
             elif child_node_info[0] in self.methods.goal_method_dict:
                 relevant_methods = self.methods.goal_method_dict[child_node_info[0]]
                 self.sol_tree.add_node(_id, info=child_node_info, type='G', status='O', state=None,
-                                       selected_method=None, available_methods=[*relevant_methods],
+                                       selected_method=None,
+                                       available_methods=self._ordered_methods(child_node_info, relevant_methods),
                                        methods=relevant_methods, selected_method_instances=None, depth=parent_depth+1)
                 self.sol_tree.add_edge(parent_node_id, _id)
 
-        if self.sol_tree.nodes[parent_node_id]['type'] == 'G':
+        if verify and self.sol_tree.nodes[parent_node_id]['type'] == 'G':
             _id = self.get_next_id()
             self.sol_tree.add_node(_id, info='VerifyGoal', type='VG', status='O', depth=parent_depth+1)
             self.sol_tree.add_edge(parent_node_id, _id)
-        elif self.sol_tree.nodes[parent_node_id]['type'] == 'M':
+        elif verify and self.sol_tree.nodes[parent_node_id]['type'] == 'M':
             _id = self.get_next_id()
             self.sol_tree.add_node(_id, info='VerifyMultiGoal', type='VM', status='O', depth=parent_depth+1)
             self.sol_tree.add_edge(parent_node_id, _id)
 
         return _id
 
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _add_refinement(self, curr_node_id: int, parent_node_id: int, subtasks: List):
+        # adds the method instance of curr_node_id as its children, or with tail splicing its last subtask (if it is a
+        # recursive call) as the next sibling of curr_node_id
+        if self.tail_splicing and subtasks and parent_node_id != 0 and self._is_tail_call(curr_node_id, subtasks[-1]):
+            self._add_nodes_and_edges(curr_node_id, subtasks[:-1], verify=False)
+            self._splice_tail(curr_node_id, parent_node_id, subtasks[-1])
+        else:
+            self._add_nodes_and_edges(curr_node_id, subtasks)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _is_tail_call(self, node_id: int, subtask: Union[Tuple, MultiGoal]) -> bool:
+        # a recursive call is the same task (with any arguments), the same goal or the same multigoal
+        node = self.sol_tree.nodes[node_id]
+        node_info = node['info']
+        if node['type'] == 'M':
+            return subtask is node_info
+        if isinstance(subtask, MultiGoal):
+            return False
+        if node['type'] == 'T':
+            return subtask[0] == node_info[0]
+        return tuple(subtask) == node_info
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _splice_tail(self, node_id: int, parent_node_id: int, tail_info: Union[Tuple, MultiGoal]):
+        # adds tail_info as the sibling right after node_id, the later siblings are re-added after it to keep the
+        # successor (preorder) order
+        sol_tree = self.sol_tree
+        sibling_ids = [*sol_tree.successors(parent_node_id)]
+        later_edges = [(parent_node_id, sibling_id) for sibling_id in sibling_ids[sibling_ids.index(node_id) + 1:]]
+        sol_tree.remove_edges_from(later_edges)
+        tail_id = self._add_nodes_and_edges(parent_node_id, [tail_info], verify=False)
+        sol_tree.add_edges_from(later_edges)
+        sol_tree.nodes[node_id]['tail'] = tail_id
+        sol_tree.nodes[tail_id]['tail_of'] = node_id
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _branch_parent(self, node_id: int) -> int:
+        # parent of node_id in the decomposition, which is the node a spliced tail was spliced from
+        tail_of = self.sol_tree.nodes[node_id].get('tail_of')
+        if tail_of is not None:
+            return tail_of
+        return next(self.sol_tree.predecessors(node_id))
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _in_branch(self, ancestor_id: int, node_id: Optional[int]) -> bool:
+        # True if node_id is a (decomposition) descendant of ancestor_id
+        if node_id not in self.sol_tree:
+            return False
+        while node_id != 0:
+            node_id = self._branch_parent(node_id)
+            if node_id == ancestor_id:
+                return True
+        return False
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _tail_chain(self, node_id: int) -> List[int]:
+        # the tails spliced from node_id, from the tails spliced from its tail, and so on
+        sol_tree_nodes = self.sol_tree.nodes
+        tail_ids = []
+        tail_id = sol_tree_nodes[node_id].get('tail')
+        while tail_id is not None:
+            tail_ids.append(tail_id)
+            tail_id = sol_tree_nodes[tail_id].get('tail')
+        return tail_ids
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _unexpand(self, node_id: int) -> List[int]:
+        # removes the descendants of node_id and its tail chain (with their descendants), returns the removed nodes
+        sol_tree = self.sol_tree
+        removed = list(descendants(sol_tree, node_id))
+        for tail_id in self._tail_chain(node_id):
+            removed.append(tail_id)
+            removed.extend(descendants(sol_tree, tail_id))
+        sol_tree.nodes[node_id].pop('tail', None)
+        sol_tree.remove_nodes_from(removed)
+        return removed
+
     # ******************************        Class Method Declaration        ****************************************** #
     # NO LONGER NEEDED
     # def _post_failure_modify(self, fail_node_id):
@@ -642,23 +1100,32 @@ class IPyHOP(object):
         # reset c_node
         if c_type == 'T' or c_type == 'G' or c_type == 'M':
             c_node['state'] = None
+            c_node.pop('snapshot_dropped', None)
             c_node['selected_method'] = None
-            c_node['available_methods'] = [*c_node['methods']]
+            c_node['available_methods'] = self._ordered_methods(c_node['info'], c_node['methods'])
             c_node[ "selected_method_instances" ] = None
+            # a spliced tail backtracks into the node it was spliced from
+            p_node_id = c_node.get('tail_of', p_node_id)
+        return self._reopen_last_choice(p_node_id)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _reopen_last_choice(self, p_node_id: int):
         # mark succesive preorder nodes as open
         dfs_list = list(dfs_preorder_nodes(self.sol_tree, source=p_node_id))
+        # the tails spliced from p_node_id follow its subtree in preorder
+        for tail_id in self._tail_chain(p_node_id):
+            dfs_list.extend(dfs_preorder_nodes(self.sol_tree, source=tail_id))
         for node_id in reversed(dfs_list):
             node = self.sol_tree.nodes[node_id]
             if node['status'] == 'C':
                 node['status'] = 'O'
                 # unexpand subtree rooted at c_node
-                descendant_list = list(descendants(self.sol_tree, node_id))
-                if descendant_list:
-                    self.sol_tree.remove_nodes_from(descendant_list)
+                if self._unexpand(node_id):
                     p_node_id = next(self.sol_tree.predecessors(node_id))
                     return p_node_id, node_id
                 if 'state' in node:
                     node['state'] = None
+                    node.pop('snapshot_dropped', None)
         # we have backtracked to root node
         self.sol_tree.remove_nodes_from(list(descendants(self.sol_tree, 0)))
         return 0, 0
@@ -673,9 +1140,16 @@ class IPyHOP(object):
         for name in vars(multigoal):
             if name == '__name__' or name == 'goal_tag':
                 continue
-            for arg in vars(multigoal).get(name):
-                val = vars(multigoal).get(name).get(arg)
-                if val != vars(self.state).get(name).get(arg):
+            goal_values = vars(multigoal).get(name)
+            if type(goal_values) is BoolMap:
+                # interned boolean goals are checked with bitwise operations
+                mismatches = goal_values.mismatches(getattr(self.state, name))
+                if mismatches:
+                    unachieved[name] = mismatches
+                continue
+            for arg in goal_values:
+                val = goal_values.get(arg)
+                if val != getattr(self.state, name).get(arg):
                     # want arg_value_pairs.name[arg] = val
                     if not unachieved.get(name):
                         unachieved.update({name: {}})
@@ -740,15 +1214,25 @@ class IPyHOP(object):
     # returns true if the new state for the node at node_id is equal to any state on the path from that node
     # to the root, else returns false
     def branch_cyclic( self, new_state: State, node_id: int ) -> bool:
-        if self.branch_cycle_check_flag:
+        if self.branch_cycle_check_flag and self.tail_splicing:
+            # the ancestors in the decomposition include the nodes the spliced tails on the branch were spliced from
+            sol_tree_nodes = self.sol_tree.nodes
+            ancestor_id = self._branch_parent( node_id )
+            while ancestor_id != 0:
+                a_node_state = sol_tree_nodes[ ancestor_id ][ "state" ]
+                if a_node_state is not None and new_state == a_node_state:
+                    return True
+                ancestor_id = self._branch_parent( ancestor_id )
+            return False
+        elif self.branch_cycle_check_flag:
             sol_tree = self.sol_tree
             sol_tree_nodes = sol_tree.nodes
             node_ancestors = ancestors( sol_tree, node_id )
             # do want to look at root which is stateless
             node_ancestors.remove(0)
             ancestor_states = map( lambda x: sol_tree_nodes[x]["state"], node_ancestors )
-
-            return any( new_state == a_node_state for a_node_state in ancestor_states )
+            # snapshots dropped by the snapshot policy are not compared
+            return any( a_node_state is not None and new_state == a_node_state for a_node_state in ancestor_states )
         else:
             return False
 
@@ -779,70 +1263,101 @@ class IPyHOP(object):
         str
                         IPyHOPPER plan in IPC format using str
         """
-        sol_tree = self.sol_tree
+        output = StringIO()
+        self.write_hddl_plan( output, name_mapping )
+        return output.getvalue()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def write_hddl_plan( self, stream: TextIO, name_mapping: Optional[Dict[str,str]]=None,
+                         changed_only: bool=False, buffer_lines: int=1024 ) -> int:
+        """
+        Write IPC plan solution tree representation of IPyHOPPER solution tree to a file-like object, in a single
+        preorder pass with buffered writes
+
+        Parameters
+        ----------
+        stream          :   TextIO
+                        file-like object the plan is written to
+        name_mapping    :   Optional[Dict[str,str]]
+                        dictionary mapping every IPyHOPPER term to desired string representation
+        changed_only    :   bool
+                        if True, only write the lines of nodes that are new or changed since the last call (e.g.
+                        the subtrees created by a plan repair and the ancestors whose children changed), each line
+                        replaces the previously written line of the same node id
+        buffer_lines    :   int
+                        number of lines buffered before each write to stream
+
+        Returns
+        -------
+        int
+                        number of node lines written
+        """
+        sol_tree_nodes = self.sol_tree.nodes
+        sol_tree_succ = self.sol_tree.succ
+        if name_mapping is None:
+            term_str = str
+        else:
+            term_str = lambda term: name_mapping[ str( term ) ]
+        last_lines = self._hddl_lines
+        lines = dict()
+        action_lines = [ ]
+        method_lines = [ ]
+        action_count = 0
         # output header
-        output_str = "==>\n"
-        # plan
-        preorder_node_ids = [ *dfs_preorder_nodes( sol_tree ) ]
-        dfs_action_node_ids = [ *filter( lambda x: sol_tree.nodes[ x ][ "type" ] == "A", preorder_node_ids ) ]
-        dfs_action_nodes = [*map( lambda x: (x, sol_tree.nodes[ x ]), dfs_action_node_ids )]
-        # unpack each action into string
-        for node_id, node in dfs_action_nodes:
-            # id
-            output_str += str(node_id) + " "
-            # action name and arguements
-            for arg in node[ "info" ]:
-                arg_str = str( arg )
-                if name_mapping is not None:
-                    arg_str = name_mapping[ arg_str ]
-                output_str += arg_str + " "
-            output_str += "\n"
-        # decomposition
-        output_str += "\n"
-        dfs_nonaction_node_ids = [ *filter( lambda x: sol_tree.nodes[ x ][ "type" ] != "A", preorder_node_ids ) ]
-        dfs_nonaction_nodes = [ *map( lambda x: (x, sol_tree.nodes[ x ]), dfs_nonaction_node_ids ) ]
-        # unpack each method into string
-        for node_id, node in dfs_nonaction_nodes:
-            node_info = node[ "info" ]
-            # root node
+        stream.write( "==>\n" )
+        stack = [ 0 ]
+        while stack:
+            node_id = stack.pop()
+            node = sol_tree_nodes[ node_id ]
+            child_ids = [ *sol_tree_succ[ node_id ] ]
+            if self.tail_splicing:
+                # spliced tails are written as the last child of the node they were spliced from
+                child_ids = [ child_id for child_id in child_ids if "tail_of" not in sol_tree_nodes[ child_id ] ]
+                if "tail" in node:
+                    child_ids.append( node[ "tail" ] )
+            # id, name and arguments
             if node_id == 0:
-                output_str += node_info[ 0 ] + " "
-                # top level children
-                for child_id in nx.neighbors(sol_tree,node_id):
-                    output_str += str(child_id) + " "
-
+                line = [ node[ "info" ][ 0 ] ]
             else:
-                # all other nonprimitive nodes
-                # id
-                output_str += str( node_id ) + " "
-                # method name and arguments
-                for arg in node[ "info" ]:
-                    arg_str = str( arg )
-                    if name_mapping is not None:
-                        arg_str = name_mapping[ arg_str ]
-                    output_str += arg_str + " "
-                # subtasks
-                output_str += "-> "
-                # method of decomposition
-                try:
-                    decomp_str = node["selected_method"].func.__name__
-                except AttributeError:
-                    decomp_str = node[ "selected_method" ].__name__
-                if name_mapping is not None:
-                    decomp_str = name_mapping[ decomp_str ]
-                output_str += decomp_str + " "
-                # child node ids
-                for child_id in nx.neighbors(sol_tree,node_id):
-                    output_str += str(child_id) + " "
-            output_str += "\n"
-        output_str += "<==\n"
-        return output_str
-
+                line = [ str( node_id ) ]
+                line.extend( map( term_str, node[ "info" ] ) )
+            if node[ "type" ] != "A":
+                # method of decomposition and child node ids
+                if node_id != 0:
+                    line.append( "->" )
+                    line.append( term_str( get_method_name( node[ "selected_method" ] ) ) )
+                line.extend( map( str, child_ids ) )
+            line.append( "\n" )
+            line = " ".join( line )
+            lines[ node_id ] = line
+            if not changed_only or last_lines.get( node_id ) != line:
+                if node[ "type" ] == "A":
+                    action_count += 1
+                    action_lines.append( line )
+                    if len( action_lines ) >= buffer_lines:
+                        stream.write( "".join( action_lines ) )
+                        action_lines.clear()
+                else:
+                    method_lines.append( line )
+            stack.extend( reversed( child_ids ) )
+        # plan
+        stream.write( "".join( action_lines ) )
+        # decomposition
+        stream.write( "\n" )
+        for i in range( 0, len( method_lines ), buffer_lines ):
+            stream.write( "".join( method_lines[ i:i + buffer_lines ] ) )
+        stream.write( "<==\n" )
+        self._hddl_lines = lines
+        return action_count + len( method_lines )
 
     def read_SHOP( self, SHOP_sol_tree_path: str, initial_state: State ):
         """
         Replicate SHOP solution tree in IPyHOPPER
 
+        The file is streamed and parsed line by line, the tree is built in bulk, and node states are assigned in a
+        single reverse preorder pass: every node holds the state before the next action at or after it in preorder
+        (the final state if there is none). Nodes share these snapshots, they are never modified in place.
+
         Parameters
         ----------
         SHOP_sol_tree_path      :   str
@@ -854,126 +1369,100 @@ class IPyHOP(object):
         -------
 
         """
-        re_shop_top_level = self.re_shop_top_level
-        re_task= self.re_task
-        # make empty solution tree
-        self.plan( { }, [ ] )
-        # read in SHOP tree
-        with open( SHOP_sol_tree_path, "r" ) as f:
-            shop_str = f.read()
-        # list of match tuples
-        top_level = re_shop_top_level.findall( shop_str )
-        # add nodes first
-        sol_tree = self.sol_tree
+        methods = self.methods
+        action_dict = self.actions.action_dict
+        # method name -> method, indexed once per task name
+        method_index = dict()
+        # node id -> node attribute dict, and task node id -> child node ids
         info_dict = dict()
-        info_dict[ 0 ] = { "info": ("root",), "type": "D", "status": 'NA', "depth": 0 }
-        # get child node ids
+        children_dict = dict()
         child_id_set = set()
-        # for each tuple add node and edges
-        for str_tuple in top_level:
-            # id as int
-            task_id = int( str_tuple[ 0 ] )
-            # find name (grab first match for name) and clean
-            parameter_list = [ ]
-            for i, parameter in enumerate( re_task.findall( str_tuple[ 1 ] ) ):
-                parameter_list.append( clean_string( parameter ) )
-            task_name = parameter_list[ 0 ]
-            # build node dict
-            case = "A" if str_tuple[ 2 ] == "" else "T"
-            info_dict[ task_id ] = {
-                "info": tuple( parameter_list ),
-                "type": case,
-                "status": 'C',
-                "state": None,
-                "depth": None
-            }
-            methods = self.methods
-            actions = self.actions
-            # make tree skeleton
-            if case == "T":
-                # attach correct methods
-                child_ids = str_tuple[ 3 ].split()
+        # read in SHOP tree, one node per line: <id> (<name> <args>...) [-> <method> <child ids>...]
+        with open( SHOP_sol_tree_path, "r" ) as f:
+            for line in f:
+                line = line.strip()
+                if not line[:1].isdigit():
+                    continue
+                task_id, _, line = line.partition( " " )
+                task_id = int( task_id )
+                if task_id == 0:
+                    raise ValueError( "Input tree contains node id 0, which is reserved for the root" )
+                task_str, _, children_str = line[ 1: ].partition( ")" )
+                parameter_list = tuple( map( clean_string, task_str.split() ) )
+                task_name = parameter_list[ 0 ]
+                children_str = children_str.strip()
+                # action
+                if not children_str.startswith( "->" ):
+                    info_dict[ task_id ] = { "info": parameter_list, "type": "A", "status": 'C', "state": None,
+                                             "depth": None, "action": action_dict[ task_name ] }
+                    continue
+                # task, attach correct methods
+                child_ids = children_str[ 2: ].split()
                 method_name = clean_string( child_ids.pop( 0 ) )
-                # allows for partial function currying
-                try:
-                    # partial case
-                    selected_method_name = [ *filter( lambda x: x.func.__name__ == method_name, methods.task_method_dict[ task_name ] ) ][0]
-                except AttributeError:
-                    # normal case
-                    selected_method_name = [ *filter( lambda x: x.__name__ == method_name, methods.task_method_dict[ task_name ] ) ][0]
-                except KeyError:
-                    # method not found
-                    raise KeyError("Input tree contains method, " + method_name +
-                                   ", but no method of this name was found in the domain definition")
-                except IndexError:
+                task_methods = methods.task_method_dict.get( task_name, [ ] )
+                if task_name not in method_index:
+                    method_index[ task_name ] = { get_method_name( method ): method for method in task_methods }
+                selected_method = method_index[ task_name ].get( method_name )
+                if selected_method is None:
                     # method not found
                     raise KeyError("Input tree contains method, " + method_name +
                                    ", but no method of this name was found in the domain definition")
-
-                info_dict[ task_id ].update(
-                    {
-                        "selected_method": selected_method_name,
-                        "available_methods": [ *methods.task_method_dict[ task_name ] ],
-                        "methods": [ *methods.task_method_dict[ task_name ] ],
-                        "selected_method_instances": None,
-                    }
-                )
-                # add children
+                info_dict[ task_id ] = { "info": parameter_list, "type": "T", "status": 'C', "state": None,
+                                         "depth": None, "selected_method": selected_method,
+                                         "available_methods": [ *task_methods ], "methods": [ *task_methods ],
+                                         "selected_method_instances": None }
                 child_id_list = [ *map( int, child_ids ) ]
-                task_from_edge_list = [ *map( lambda x: (task_id, x), child_id_list ) ]
-                sol_tree.add_edges_from( task_from_edge_list )
-                # any task that is a child may never be an
-                child_id_set |= { *child_id_list }
-            # name action
-            else:
-                action_func = actions.action_dict[ task_name ]
-                info_dict[ task_id ].update(
-                    {
-                        "action": action_func,
-                    }
-                )
-        # get all top level tasks and add as root children
-        top_level_task_id_list = [ *sorted( { *sol_tree.nodes } - child_id_set - { 0 } ) ]
-        root_child_edges = map( lambda x: (0, x), top_level_task_id_list )
-        sol_tree.add_edges_from( root_child_edges )
-        # fill in node info for all nodes
-        for node_id in sol_tree.nodes:
-            node = sol_tree.nodes[ node_id ]
-            for k, v in info_dict[ node_id ].items():
-                node[ k ] = v
-        # get plan node ids
-        sol_tree_nodes = sol_tree.nodes
-        plan_node_ids = [*filter( lambda x: sol_tree_nodes[x]["type"] == "A", dfs_preorder_nodes(sol_tree) )]
-        sol_plan = [*map( lambda x: sol_tree_nodes[x]["info"], plan_node_ids )]
+                children_dict[ task_id ] = child_id_list
+                child_id_set.update( child_id_list )
+
+        # any task that is never a child is a top level task
+        children_dict[ 0 ] = sorted( info_dict.keys() - child_id_set )
+        info_dict[ 0 ] = { "info": ("root",), "type": "D", "status": 'NA', "depth": 0 }
+        # preorder node ids, with depths
+        preorder_node_ids = [ ]
+        stack = [ 0 ]
+        while stack:
+            node_id = stack.pop()
+            preorder_node_ids.append( node_id )
+            child_id_list = children_dict.get( node_id )
+            if child_id_list:
+                child_depth = info_dict[ node_id ][ "depth" ] + 1
+                for child_id in child_id_list:
+                    info_dict[ child_id ][ "depth" ] = child_depth
+                stack.extend( reversed( child_id_list ) )
+        sol_plan = [ info_dict[ node_id ][ "info" ] for node_id in preorder_node_ids
+                     if info_dict[ node_id ][ "type" ] == "A" ]
+
+        # simulate state progression, keeping one snapshot per action
+        state = initial_state.copy()
+        snapshot = None
+        snapshot_list = [ ]
+        for action in sol_plan:
+            snapshot = self._snapshot( state, snapshot )
+            snapshot_list.append( snapshot )
+            action_dict[ action[ 0 ] ]( state, *action[ 1: ] )
+        # in reverse preorder every node gets the snapshot before the next action at or after it
+        snapshot = self._snapshot( state, snapshot )
+        action_index = len( snapshot_list )
+        for node_id in reversed( preorder_node_ids[ 1: ] ):
+            node = info_dict[ node_id ]
+            if node[ "type" ] == "A":
+                action_index -= 1
+                snapshot = snapshot_list[ action_index ]
+            node[ "state" ] = snapshot
+        # build the tree in bulk
+        sol_tree = DiGraph()
+        sol_tree.add_nodes_from( ( node_id, info_dict[ node_id ] ) for node_id in preorder_node_ids )
+        sol_tree.add_edges_from( ( node_id, child_id ) for node_id in preorder_node_ids
+                                 for child_id in children_dict.get( node_id, ( ) ) )
+
+        self._discard_session()
+        self.state = initial_state.copy()
+        self.task_list = [ ]
+        self.iterations = 0
+        self.sol_tree = sol_tree
         self.sol_plan = sol_plan
-        # simulate state progression
-        state_list = self.simulate( initial_state, start_ind=0 )
-        # in reverse order assign states to ancestors
-        for act_id, act_state in zip(reversed(plan_node_ids), reversed(state_list[:-1])):
-            ancestor_id_set = ({*ancestors(sol_tree,act_id)} - {0}) | {act_id}
-            for ancestor_id in ancestor_id_set:
-                sol_tree_nodes[ancestor_id]["state"] = act_state.copy()
-        # for methods without action descendants copy from left
-        preorder_node_ids = [*dfs_preorder_nodes(sol_tree)]
-        rev_preorder_node_ids = [*reversed(preorder_node_ids)]
-        for i in range(len(preorder_node_ids)):
-            node_id = rev_preorder_node_ids[i]
-            # method without action descendant
-            if node_id != 0 and ( "state" not in sol_tree_nodes[ node_id ].keys() or sol_tree_nodes[ node_id ][ "state" ] is None ):
-                # tail end
-                if node_id == rev_preorder_node_ids[0]:
-                    sol_tree_nodes[ node_id ][ "state" ] = state_list[-1].copy()
-                # base case
-                else:
-                    next_node_id = rev_preorder_node_ids[i-1]
-                    sol_tree_nodes[ node_id ][ "state" ] = sol_tree_nodes[ next_node_id ][ "state" ].copy()
-        # set depth
-        node_depth = 0
-        for parent_id, child_id_list in bfs_successors(sol_tree,0):
-            node_depth = sol_tree_nodes[parent_id]["depth"] + 1
-            for node_id in child_id_list:
-                sol_tree_nodes[ node_id ][ "depth" ] = node_depth
-        self.id_counter = max( sol_tree.nodes )
+        self.id_counter = max( preorder_node_ids )
         return
 
 
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the rigid state variable inference.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from copy import copy, deepcopy
+from typing import List, Tuple, Set, FrozenSet, Iterable
+from ipyhop.state import State
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _written_vars(before: dict, after: dict) -> Set[str]:
+    # names of the variables added, removed or changed between two variable dictionaries
+    written = set(before.keys() ^ after.keys())
+    for name, value in after.items():
+        if name in before and before[name] != value:
+            written.add(name)
+    return written
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def infer_rigid(planner, state: State, task_list: List[Tuple[str]], fluent: Iterable[str] = ()) -> FrozenSet[str]:
+    """
+    Infers the rigid variables of state with a dry run: a planner like planner (same class, methods, actions and
+    branch cycle checking) plans task_list from state while the actions it applies are watched. The variables that
+    no applied action ever wrote are rigid. planner itself is not modified.
+
+    The dry run only sees the actions applied while planning this problem. Variables written by anything else
+    (e.g. deviation handlers, or actions only used when replanning) must be passed in fluent.
+
+    *   state.declare_rigid(infer_rigid(planner, state, task_list)) declares the inferred rigid variables.
+
+    :param planner: An IPyHOP instance.
+    :param state: The initial state. It is not modified.
+    :param task_list: The task list of the dry run.
+    :param fluent: [Optional] Names of variables that are known to change.
+    :return: The names of the rigid variables.
+    """
+    written = set(fluent)
+
+    def watched(action):
+        def watched_action(act_state, *args):
+            before = deepcopy(vars(act_state))
+            result = action(act_state, *args)
+            written.update(_written_vars(before, vars(act_state)))
+            if result is not None and result is not False and result is not act_state:
+                written.update(_written_vars(before, vars(result)))
+            return result
+        return watched_action
+
+    actions = copy(planner.actions)
+    actions.action_dict = {name: watched(action) for name, action in planner.actions.action_dict.items()}
+    dry_planner = type(planner)(planner.methods, actions)
+    dry_planner.branch_cycle_check_flag = planner.branch_cycle_check_flag
+    dry_state = deepcopy(state)
+    if dry_state.rigid_names():
+        dry_state.__rigid__ = frozenset()
+    dry_planner.plan(dry_state, task_list)
+    return frozenset(name for name in vars(state) if name not in ('__name__', '__rigid__') and name not in written)
+
+
+# ******************************************    Function Declaration End    ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    raise NotImplementedError("Test run / Demo routine for infer_rigid isn't implemented.")
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
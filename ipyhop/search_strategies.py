@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the search strategies IPyHOP can use to choose method instances.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from heapq import heappush, heappop
+from itertools import count, islice
+from typing import List, Optional, Callable, Iterator, Tuple
+from ipyhop.mulitgoal import MultiGoal
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class SearchStrategy(object):
+    """
+    A search strategy decides which method instance IPyHOP uses next when it refines a task, goal or multigoal node.
+    All strategies refine the solution tree in place, so the sol_tree they produce has the same format regardless
+    of the strategy and can be used with IPyHOP.replan and IPyHOP.hddl_plan_str.
+
+    *   planner = IPyHOP(methods, actions, search_strategy=strategy) tells IPyHOP to use strategy.
+
+    The base class is the default IPyHOP behaviour: left-to-right depth-first refinement with chronological
+    backtracking, trying the instances of each available method in order.
+    """
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def reset(self, planner):
+        """
+        Called by IPyHOP.plan before planning starts.
+
+        :param planner: The IPyHOP instance using this strategy.
+        """
+        pass
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def next_method_instance(self, planner, node_id: int, node: dict, method_args: tuple) -> Optional[List]:
+        """
+        Gets the next method instance (list of subtasks/subgoals) for a task, goal or multigoal node.
+
+        :param planner: The IPyHOP instance using this strategy.
+        :param node_id: Id of the node being refined.
+        :param node: Node attribute dictionary of the node being refined.
+        :param method_args: Arguments passed to the methods after the current state.
+        :return: The next method instance, or None if the node cannot be refined any further.
+        """
+        return planner._next_method_instance(node, method_args)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def restart(self, planner) -> bool:
+        """
+        Called by IPyHOP.plan when planning failed.
+
+        :param planner: The IPyHOP instance using this strategy.
+        :return: True if planning should be restarted from scratch, False if the failure is final.
+        """
+        return False
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def replay_method_instances(self, planner, node: dict, method_args: tuple, instances_consumed: int):
+        """
+        Rebuilds node['selected_method_instances'] when a solution tree is restored from a checkpoint, so that its
+        next instance is the one after the instances_consumed instances already used.
+
+        :param planner: The IPyHOP instance using this strategy. planner.state is the state of the node.
+        :param node: Node attribute dictionary of the restored node.
+        :param method_args: Arguments passed to the methods after the current state.
+        :param instances_consumed: Number of instances used before the checkpoint was taken.
+        """
+        method_instances = node['selected_method'](planner.state, *method_args)
+        for _ in range(instances_consumed):
+            next(method_instances)
+        node['selected_method_instances'] = method_instances
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @staticmethod
+    def _is_fresh(node: dict) -> bool:
+        # True if no method instance has been requested since the node was created or reset
+        return node['selected_method_instances'] is None and len(node['available_methods']) == len(node['methods'])
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class DepthFirstSearch(SearchStrategy):
+    """
+    Left-to-right depth-first refinement with chronological backtracking. This is the default IPyHOP strategy.
+    """
+    pass
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class LimitedDiscrepancySearch(SearchStrategy):
+    """
+    Limited discrepancy search over the method instances of each node.
+
+    Using the first method instance of a node is free, and using the k-th one costs k discrepancies. A node may only
+    be refined while the discrepancies along its branch of the solution tree (the node and its ancestors) do not
+    exceed the current limit. Planning starts with a limit of 0, and every time it fails because some refinement
+    was pruned by the limit, IPyHOP.plan restarts with the limit increased by one. The limit reached by plan is kept
+    by IPyHOP.replan.
+    """
+
+    def __init__(self, max_discrepancies: Optional[int] = None):
+        """
+        LimitedDiscrepancySearch Constructor.
+
+        :param max_discrepancies: [Optional] Largest discrepancy limit to try. If None, the limit is increased
+            until the search is no longer pruned (at which point it is a complete depth-first search).
+        """
+        self.max_discrepancies = max_discrepancies
+        self.discrepancy_limit = 0
+        self.pruned = False
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def reset(self, planner):
+        self.discrepancy_limit = 0
+        self.pruned = False
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def next_method_instance(self, planner, node_id: int, node: dict, method_args: tuple) -> Optional[List]:
+        discrepancies = -1 if self._is_fresh(node) else node['discrepancies']
+        # discrepancies already used by the ancestors of the node
+        sol_tree = planner.sol_tree
+        branch_discrepancies = discrepancies + 1
+        ancestor_id = node_id
+        while ancestor_id != 0:
+            ancestor_id = planner._branch_parent(ancestor_id)
+            branch_discrepancies += sol_tree.nodes[ancestor_id].get('discrepancies', 0)
+        if branch_discrepancies > self.discrepancy_limit:
+            self.pruned = True
+            return None
+        subtasks = planner._next_method_instance(node, method_args)
+        node['discrepancies'] = discrepancies + 1
+        return subtasks
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def restart(self, planner) -> bool:
+        if not self.pruned:
+            return False
+        if self.max_discrepancies is not None and self.discrepancy_limit >= self.max_discrepancies:
+            return False
+        self.discrepancy_limit += 1
+        self.pruned = False
+        return True
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _ranked_instances(method_instances: List[Tuple[Callable, Iterator]], cost: Callable[[List], float],
+                      lookahead: int) -> Iterator[Tuple[Callable, List]]:
+    # merges the (method, method instance iterator) pairs lazily: at most lookahead instances of every method are
+    # generated ahead, the cheapest of them is returned next and its method generates the next one (None instances
+    # are not refinements and are skipped)
+    heap = []
+    order = count()
+
+    def generate(method, instances):
+        for method_instance in instances:
+            if method_instance is not None:
+                heappush(heap, (cost(method_instance), next(order), method, method_instance, instances))
+                return
+
+    for method, instances in method_instances:
+        for _ in range(lookahead):
+            generate(method, instances)
+    while heap:
+        _, _, method, method_instance, instances = heappop(heap)
+        generate(method, instances)
+        yield method, method_instance
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class BestFirstSearch(SearchStrategy):
+    """
+    Best-first ordering of the method choices of each node.
+
+    Instances are ranked by their estimated cost: the sum of Actions.action_cost over the actions in the instance,
+    plus nonprimitive_cost for every task, goal or multigoal in it. Method instances are generated lazily: up to
+    lookahead instances of every available method are generated ahead, and the cheapest of them is tried next (ties
+    keep the method order), after which its method generates one more. Methods with at most lookahead instances are
+    thus tried exactly cheapest first, and methods with many (or unboundedly many) instances are never exhausted
+    up front. Backtracking is chronological.
+    """
+
+    def __init__(self, nonprimitive_cost: float = 0.0, lookahead: int = 64):
+        """
+        BestFirstSearch Constructor.
+
+        :param nonprimitive_cost: Estimated cost of every task, goal or multigoal in a method instance.
+        :param lookahead: Number of instances of every method generated ahead of their use and ranked.
+        """
+        assert lookahead > 0, "lookahead must be positive."
+        self.nonprimitive_cost = nonprimitive_cost
+        self.lookahead = lookahead
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def instance_cost(self, planner, method_instance: List) -> float:
+        """
+        :return: Estimated cost of a method instance.
+        """
+        action_cost = planner.actions.action_cost
+        cost = 0.0
+        for item in method_instance:
+            if isinstance(item, MultiGoal) or item[0] not in action_cost:
+                cost += self.nonprimitive_cost
+            else:
+                cost += action_cost[item[0]]
+        return cost
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _ranked(self, planner, node: dict, method_args: tuple) -> Iterator[Tuple[Callable, List]]:
+        # (method, method instance) pairs of the available methods, in the order they are tried
+        method_instances = [(method, iter(method(planner.state, *method_args))) for method in node['available_methods']]
+        return _ranked_instances(method_instances, lambda method_instance: self.instance_cost(planner, method_instance),
+                                 self.lookahead)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def next_method_instance(self, planner, node_id: int, node: dict, method_args: tuple) -> Optional[List]:
+        if node['selected_method_instances'] is None:
+            node['selected_method_instances'] = self._ranked(planner, node, method_args)
+            node['instances_consumed'] = 0
+        try:
+            method, method_instance = next(node['selected_method_instances'])
+        except StopIteration:
+            node['available_methods'].clear()
+            return None
+        node['selected_method'] = method
+        node['instances_consumed'] += 1
+        return method_instance
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def replay_method_instances(self, planner, node: dict, method_args: tuple, instances_consumed: int):
+        # the instances are ranked from all the available methods, which are only changed once exhausted
+        method_instances = self._ranked(planner, node, method_args)
+        for _ in range(instances_consumed):
+            next(method_instances)
+        node['selected_method_instances'] = method_instances
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class BeamSearch(BestFirstSearch):
+    """
+    Beam search over the method choices of each node. Like BestFirstSearch, but only the first beam_width method
+    instances it ranks for a node are ever tried. This bounds the branching factor and makes the search incomplete.
+    """
+
+    def __init__(self, beam_width: int, nonprimitive_cost: float = 0.0, lookahead: int = 64):
+        """
+        BeamSearch Constructor.
+
+        :param beam_width: Number of method instances kept for every node.
+        :param nonprimitive_cost: Estimated cost of every task, goal or multigoal in a method instance.
+        :param lookahead: Number of instances of every method generated ahead of their use and ranked.
+        """
+        super().__init__(nonprimitive_cost, lookahead)
+        assert beam_width > 0, "beam_width must be positive."
+        self.beam_width = beam_width
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _ranked(self, planner, node: dict, method_args: tuple) -> Iterator[Tuple[Callable, List]]:
+        return islice(super()._ranked(planner, node, method_args), self.beam_width)
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    raise NotImplementedError("Test run / Demo routine for SearchStrategy isn't implemented.")
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
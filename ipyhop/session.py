@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of resumable planning sessions.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from typing import Optional
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class PlanningSession(object):
+    """
+    A planning session is a plan or replan call of an IPyHOP planner that can be run a few node expansions (or a
+    time slice) at a time. The planning loop is suspended between steps, together with the method generators stored
+    in the solution tree, so stepping a session produces exactly the same result as a blocking IPyHOP.plan call.
+
+    *   session = planner.plan_session(state, task_list) creates a session without doing any planning.
+    *   session.step(max_expansions=100) plans for at most 100 node expansions and returns session.done.
+    *   session.result is what IPyHOP.plan (or IPyHOP.replan) would have returned, once session.done is True.
+
+    A planner runs one session at a time: starting a new plan, replan or session discards the previous one. Use one
+    planner per problem to interleave many planning problems (e.g. on an event loop).
+    """
+
+    def __init__(self, planner, steps):
+        """
+        PlanningSession Constructor. Sessions are created by IPyHOP.plan_session and IPyHOP.replan_session.
+
+        :param planner: The IPyHOP instance running the session.
+        :param steps: The suspended planning loop, a generator that yields the reason whenever its budget is
+            exhausted and returns the planning result.
+        """
+        self.planner = planner
+        self._steps = steps
+        self.done = False
+        self.result = None
+        # limit that stopped the last step: 'expansions', 'time', 'cpu_time' or None
+        self.reason = None
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __repr__(self):
+        return "PlanningSession(done={}, reason={}, node_expansions={})".format(
+            self.done, repr(self.reason), self.planner.node_expansions)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def step(self, max_expansions: Optional[int] = None, time_limit: Optional[float] = None,
+             cpu_time_limit: Optional[float] = None) -> bool:
+        """
+        Continues planning until it is finished or the budget of this step is exhausted. Without any limit, planning
+        runs to completion.
+
+        :param max_expansions: [Optional] Node expansion budget for this step.
+        :param time_limit: [Optional] Wall-clock time budget in seconds for this step.
+        :param cpu_time_limit: [Optional] CPU time budget in seconds for this step.
+        :return: True if planning is finished (see PlanningSession.result), else False.
+        """
+        if self.done:
+            return True
+        planner = self.planner
+        if planner._session is not self:
+            raise ValueError("This planning session was discarded by a later planning call of its planner.")
+        planner.budget = planner._make_budget(time_limit, cpu_time_limit, max_expansions)
+        try:
+            self.reason = next(self._steps)
+        except StopIteration as stop:
+            self.done = True
+            self.result = stop.value
+            self.reason = None
+            planner.budget = None
+            planner._session = None
+        return self.done
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def run(self):
+        """
+        Runs planning to completion.
+
+        :return: What IPyHOP.plan (or IPyHOP.replan) would have returned.
+        """
+        self.step()
+        return self.result
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def close(self):
+        """
+        Abandons the session. The planner keeps the partial solution tree.
+        """
+        self._steps.close()
+        if self.planner._session is self:
+            self.planner._session = None
+            self.planner.budget = None
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    raise NotImplementedError("Test run / Demo routine for PlanningSession isn't implemented.")
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+File Description: File used for definition of the deduplicated state snapshot store.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from __future__ import print_function, division
+from copy import deepcopy
+from pickle import dumps, HIGHEST_PROTOCOL, PicklingError
+from sys import getsizeof
+from typing import Optional, Dict
+from weakref import ref
+from ipyhop.state import State
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximate number of bytes held by obj and everything it references (containers and object attributes).
+    Objects in seen are not counted again, so a shared object is only counted once.
+
+    :param obj: Any object.
+    :param seen: [Optional] Set of ids of the objects already counted. It is updated in place.
+    :return: The approximate size of obj in bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+            stack.append(obj.__dict__)
+    return size
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _same(value_1, value_2) -> bool:
+    # equality that also requires the same types and iteration orders, so sharing a value never changes the order
+    # in which methods iterate over it
+    if value_1 is value_2:
+        return True
+    if type(value_1) is not type(value_2):
+        return False
+    if isinstance(value_1, dict):
+        return len(value_1) == len(value_2) and all(
+            key_1 == key_2 and _same(val_1, val_2)
+            for (key_1, val_1), (key_2, val_2) in zip(value_1.items(), value_2.items()))
+    if isinstance(value_1, (list, tuple)):
+        return len(value_1) == len(value_2) and all(_same(val_1, val_2) for val_1, val_2 in zip(value_1, value_2))
+    if isinstance(value_1, (set, frozenset)):
+        return value_1 == value_2 and all(val_1 == val_2 for val_1, val_2 in zip(value_1, value_2))
+    try:
+        return bool(value_1 == value_2)
+    except (ValueError, TypeError):
+        return False
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class StateSnapshotStore(object):
+    """
+    A state snapshot store hash-conses the state snapshots saved in the solution tree: equal snapshots share one
+    object. Snapshots are also delta encoded against the snapshot of the parent node, every state variable that is
+    unchanged shares the parent's value, and the values of changed variables are interned, so equal values are
+    stored once.
+
+    Snapshots returned by the store are shared and must never be modified in place, IPyHOP only ever copies them.
+    The store only holds its snapshots weakly: a snapshot (and the values interned for it) is forgotten as soon as no
+    node of the solution tree (or anything else) refers to it anymore, so the store only grows with the snapshots in
+    use, not with all the snapshots requested while backtracking. IPyHOP.plan clears the store of the planner before
+    planning.
+
+    *   planner = IPyHOP(methods, actions, snapshot_store=StateSnapshotStore()) tells IPyHOP to store its state
+        snapshots in the store.
+    *   planner.snapshot_store.memory_report() quantifies the memory saved.
+    """
+
+    def __init__(self, delta: bool = True):
+        """
+        StateSnapshotStore Constructor.
+
+        :param delta: [Optional] If True, snapshots are delta encoded against the snapshot of the parent node.
+        """
+        self.delta = delta
+        # snapshot key (tuple of variable names and interned value ids) -> weak reference to the snapshot
+        self._snapshots = dict()
+        # snapshot key -> number of times the snapshot was requested
+        self._requests = dict()
+        # id of a snapshot -> snapshot key, to recognize snapshots owned by the store
+        self._keys = dict()
+        # pickled value -> interned value
+        self._values = dict()
+        # id of an interned value -> [pickled value, number of snapshots holding it]
+        self._value_refs = dict()
+        # incremented by clear, so snapshots of a previous generation are not forgotten twice
+        self._generation = 0
+        self.snapshots_requested = 0
+        self.snapshot_hits = 0
+        self.value_hits = 0
+        self.delta_hits = 0
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __len__(self):
+        return len(self._snapshots)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def clear(self):
+        """
+        Forgets all the snapshots and values of the store. Snapshots already returned remain valid.
+        """
+        self._snapshots.clear()
+        self._requests.clear()
+        self._keys.clear()
+        self._values.clear()
+        self._value_refs.clear()
+        self._generation += 1
+        self.snapshots_requested = 0
+        self.snapshot_hits = 0
+        self.value_hits = 0
+        self.delta_hits = 0
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def snapshot(self, state: State, parent: Optional[State] = None) -> State:
+        """
+        Gets a (shared, read only) snapshot of state.
+
+        :param state: The state to snapshot. It is not modified and does not share anything with the snapshot.
+        :param parent: [Optional] The snapshot of the parent node, used for delta encoding.
+        :return: A snapshot equal to state.
+        """
+        parent_vars = vars(parent) if self.delta and parent is not None and id(parent) in self._keys else {}
+        snapshot_vars = dict()
+        # rigid variables are shared by reference, like in copies of the state
+        rigid = state.rigid_names()
+        for name, value in vars(state).items():
+            if name in rigid or name == '__rigid__':
+                snapshot_vars[name] = value
+                continue
+            parent_value = parent_vars.get(name, parent_vars)
+            if parent_value is not parent_vars and _same(parent_value, value):
+                self.delta_hits += 1
+                snapshot_vars[name] = parent_value
+            else:
+                snapshot_vars[name] = self._intern_value(value)
+        key = tuple((name, id(value)) for name, value in snapshot_vars.items())
+        self.snapshots_requested += 1
+        snapshot_ref = self._snapshots.get(key)
+        snapshot = None if snapshot_ref is None else snapshot_ref()
+        if snapshot is None:
+            snapshot = type(state).from_vars(snapshot_vars)
+            # the interned values are held for as long as a snapshot holds them
+            value_ids = [id(value) for value in snapshot_vars.values() if id(value) in self._value_refs]
+            for value_id in value_ids:
+                self._value_refs[value_id][1] += 1
+            generation, snapshot_id = self._generation, id(snapshot)
+            self._snapshots[key] = ref(snapshot, lambda _: self._forget(generation, key, snapshot_id, value_ids))
+            self._requests[key] = 1
+            self._keys[snapshot_id] = key
+        else:
+            self.snapshot_hits += 1
+            self._requests[key] += 1
+        return snapshot
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _forget(self, generation: int, key: tuple, snapshot_id: int, value_ids: list):
+        # called when a snapshot is garbage collected, forgets it and the values no other snapshot holds
+        if generation != self._generation:
+            return
+        snapshot_ref = self._snapshots.get(key)
+        if snapshot_ref is None or snapshot_ref() is not None:
+            return
+        del self._snapshots[key]
+        del self._requests[key]
+        del self._keys[snapshot_id]
+        for value_id in value_ids:
+            value_ref = self._value_refs[value_id]
+            value_ref[1] -= 1
+            if value_ref[1] == 0:
+                del self._value_refs[value_id]
+                del self._values[value_ref[0]]
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _intern_value(self, value):
+        try:
+            blob = (type(value), dumps(value, HIGHEST_PROTOCOL))
+        except (PicklingError, TypeError, AttributeError):
+            # unpicklable values are copied but not shared
+            return deepcopy(value)
+        interned = self._values.get(blob)
+        if interned is None:
+            interned = self._values[blob] = deepcopy(value)
+            self._value_refs[id(interned)] = [blob, 0]
+        else:
+            self.value_hits += 1
+        return interned
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def memory_report(self) -> Dict[str, float]:
+        """
+        :return: A dictionary with the number of snapshots requested (since the store was last cleared) and stored
+            (still in use), the number of interned values, the approximate bytes the stored snapshots would use as
+            independent copies, one per request ('copy_bytes') and the approximate bytes used by the store
+            ('store_bytes'), and their ratio ('reduction').
+        """
+        copy_bytes = 0
+        seen = set()
+        store_bytes = 0
+        for key, snapshot_ref in [*self._snapshots.items()]:
+            snapshot = snapshot_ref()
+            if snapshot is None:
+                continue
+            copy_bytes += self._requests[key] * deep_sizeof(snapshot)
+            store_bytes += deep_sizeof(snapshot, seen)
+        return {'snapshots_requested': self.snapshots_requested, 'snapshots_stored': len(self._snapshots),
+                'values_stored': len(self._values), 'snapshot_hits': self.snapshot_hits,
+                'value_hits': self.value_hits, 'delta_hits': self.delta_hits, 'copy_bytes': copy_bytes,
+                'store_bytes': store_bytes, 'reduction': copy_bytes / store_bytes if store_bytes else 1.0}
+
+
+# ******************************************    Class Declaration End       ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    print("Test instantiation of StateSnapshotStore class ...")
+    test_store = StateSnapshotStore()
+    test_state = State('test_state')
+    test_state.test_var_1 = {'key1': 'val1'}
+    test_snapshot = test_store.snapshot(test_state)
+    print(test_snapshot is test_store.snapshot(test_state), test_store.memory_report())
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -5,6 +5,7 @@ File Description: File used for definition of State Class.
 
 # ******************************************    Libraries to be imported    ****************************************** #
 from copy import deepcopy, copy
+from typing import Iterable, FrozenSet, Dict, Type
 
 
 # ******************************************    Class Declaration Start     ****************************************** #
@@ -14,6 +15,9 @@ class State(object):
 
     *   state = State('foo') tells IPyHOP to create an empty state object named 'foo'.
         To put variables and values into it, you should do assignments such as foo.var1 = val1
+    *   state.declare_rigid(['var2']) declares that var2 never changes. Rigid variables are shared by reference by
+        all the copies of the state (and by the snapshots of a StateSnapshotStore) instead of being copied, so they
+        must never be modified, neither by actions nor by deviations. See ipyhop.rigid.infer_rigid to find them.
     """
 
     def __init__(self, name: str):
@@ -25,7 +29,7 @@ class State(object):
             var_str = "\r{state_name}.{var_name} = {var_value}\n"
             state_str = ""
             for name, val in self.__dict__.items():
-                if name != "__name__":
+                if name != "__name__" and name != "__rigid__":
                     _str = var_str.format(state_name=self.__name__, var_name=name, var_value=val)
                     _str = '\n\t\t'.join(_str[i:i+120] for i in range(0, len(_str), 120))
                     state_str += _str
@@ -44,12 +48,48 @@ class State(object):
 
     # ******************************        Class Method Declaration        ****************************************** #
     def copy(self):
-        return deepcopy(self)
+        rigid = self.__dict__.get('__rigid__')
+        if rigid is None:
+            return deepcopy(self)
+        # rigid values are "already copied", so the copy shares them
+        memo = {id(value): value for name, value in self.__dict__.items() if name in rigid}
+        memo[id(rigid)] = rigid
+        return deepcopy(self, memo)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def declare_rigid(self, names: Iterable[str]):
+        """
+        Declares state variables as rigid (in addition to the ones already declared).
+
+        :param names: Names of the state variables that never change.
+        """
+        self.__rigid__ = self.rigid_names() | frozenset(names)
+        return self
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def rigid_names(self) -> FrozenSet[str]:
+        """
+        :return: Names of the state variables declared as rigid.
+        """
+        return self.__dict__.get('__rigid__', frozenset())
 
     # ******************************        Class Method Declaration        ****************************************** #
     def shallow_copy( self ):
         return copy( self )
 
+    # ******************************        Class Method Declaration        ****************************************** #
+    @classmethod
+    def from_vars(cls, variables: Dict):
+        """
+        Creates a state from a dictionary of variables (including its '__name__'). The values are not copied.
+
+        :param variables: Dictionary with variable names as keys and their values as values.
+        :return: The new state.
+        """
+        state = cls.__new__(cls)
+        state.__dict__.update(variables)
+        return state
+
     # ******************************        Class Method Declaration        ****************************************** #
     def __eq__( self, other ):
         # states are equal if all subparts are equal
@@ -58,6 +98,142 @@ class State(object):
         return vars_self == vars_other
 
 
+# ******************************************    Class Declaration End       ****************************************** #
+# kinds of state schema variables and how their values are copied
+SCALAR = 'scalar'                   # immutable value, shared by copies
+SET = 'set'                         # set of immutables, copied with set.copy
+DICT = 'dict'                       # dict of immutables, copied with dict.copy
+DICT_OF_SETS = 'dict_of_sets'       # dict of sets of immutables, copied one level deeper
+_COPY_EXPR = {SCALAR: '{}', SET: '{}.copy()', DICT: '{}.copy()', DICT_OF_SETS: '{{k: v.copy() for k, v in {}.items()}}'}
+_HASH_EXPR = {SCALAR: '{}', SET: 'frozenset({})', DICT: 'frozenset({}.items())',
+              DICT_OF_SETS: 'frozenset((k, frozenset(v)) for k, v in {}.items())'}
+# schema (class name, variables) -> generated State subclass
+_schema_classes = dict()
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def state_schema(class_name: str, variables: Dict[str, str]) -> Type[State]:
+    """
+    Generates a State subclass with a fixed set of variables, stored in __slots__, and a copy, __eq__ and __hash__
+    specialized for the kinds of the variables: SCALAR (an immutable value), SET (a set of immutables), DICT (a dict
+    with immutable values) or DICT_OF_SETS (a dict with sets of immutables as values). Copies only copy the
+    containers, so the values must be immutable (the kinds are not checked).
+
+    *   RoversState = state_schema('RoversState', {'at': DICT, 'empty': SET, 'have_image': DICT_OF_SETS})
+        creates the class, and RoversState.from_vars(vars(state)) converts a State with the same variables.
+
+    Schema states behave like States (they have the same methods, but are not instances of State): vars(state)
+    returns a dictionary of their variables (built when it is called, so it cannot be used to modify them), and the
+    same schema always generates the same class, so schema states can be pickled. They have no instance __dict__, so
+    setting a variable that is not in the schema raises an AttributeError.
+
+    :param class_name: Name of the generated class.
+    :param variables: Dictionary with variable names as keys and their kinds as values.
+    :return: The generated class.
+    """
+    key = (class_name, tuple(variables.items()))
+    cls = _schema_classes.get(key)
+    if cls is not None:
+        return cls
+    for name, kind in variables.items():
+        assert name.isidentifier() and not name.startswith('__'), "Invalid state variable name: " + repr(name)
+        assert kind in _COPY_EXPR, "Unknown state variable kind: " + repr(kind)
+    names = tuple(variables)
+    lines = ['def copy(self):',
+             '    if self.__rigid__:',
+             '        return self._rigid_copy()',
+             '    new = _new(cls)',
+             '    new.__name__ = self.__name__',
+             '    new.__rigid__ = self.__rigid__']
+    lines += ['    new.{} = {}'.format(name, _COPY_EXPR[kind].format('self.' + name)) for name, kind in variables.items()]
+    lines += ['    return new',
+              'def update(self, state):',
+              '    self.__name__ = state.__name__',
+              '    self.__rigid__ = state.rigid_names()']
+    lines += ['    self.{0} = state.{0}'.format(name) for name in names]
+    lines += ['    return self',
+              'def __eq__(self, other):',
+              '    if type(other) is not cls:',
+              '        return vars(self) == vars(other)',
+              '    return ' + ' and '.join('self.{0} == other.{0}'.format(name) for name in ('__name__',) + names),
+              'def __hash__(self):',
+              '    return hash((self.__name__, {}))'.format(
+                  ', '.join(_HASH_EXPR[kind].format('self.' + name) for name, kind in variables.items()))]
+    namespace = {'_new': object.__new__}
+    exec('\n'.join(lines), namespace)
+    body = {name: namespace[name] for name in ('copy', 'update', '__eq__', '__hash__')}
+    body.update(__slots__=names, _schema=dict(variables), __module__=__name__)
+    cls = namespace['cls'] = type(class_name, (_SchemaState,), body)
+    _schema_classes[key] = cls
+    return cls
+
+
+# ******************************************    Class Declaration Start     ****************************************** #
+class _SchemaState(object):
+    # base class of the classes generated by state_schema, with the methods of State but without an instance __dict__
+    __slots__ = ('__name__', '__rigid__', '__weakref__')
+    _schema = dict()
+    __str__ = State.__str__
+    __repr__ = State.__repr__
+    declare_rigid = State.declare_rigid
+    shallow_copy = State.shallow_copy
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self.__rigid__ = frozenset()
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @property
+    def __dict__(self):
+        variables = {'__name__': self.__name__}
+        if self.__rigid__:
+            variables['__rigid__'] = self.__rigid__
+        for name in self._schema:
+            try:
+                variables[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return variables
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def __reduce__(self):
+        variables = vars(self)
+        return _schema_state, (type(self).__name__, tuple(self._schema.items()), variables)
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    @classmethod
+    def from_vars(cls, variables: Dict):
+        state = cls(variables['__name__'])
+        for name, value in variables.items():
+            setattr(state, name, value)
+        return state
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def rigid_names(self) -> FrozenSet[str]:
+        return self.__rigid__
+
+    # ******************************        Class Method Declaration        ****************************************** #
+    def _rigid_copy(self):
+        rigid = self.__rigid__
+        new = type(self)(self.__name__)
+        new.__rigid__ = rigid
+        for name, kind in self._schema.items():
+            value = getattr(self, name)
+            if name in rigid or kind == SCALAR:
+                setattr(new, name, value)
+            elif kind == DICT_OF_SETS:
+                setattr(new, name, {k: v.copy() for k, v in value.items()})
+            else:
+                setattr(new, name, value.copy())
+        return new
+
+
+# ******************************************    Function Declaration Start  ****************************************** #
+def _schema_state(class_name: str, schema: tuple, variables: Dict) -> State:
+    # unpickles a schema state, generating its class if needed
+    return state_schema(class_name, dict(schema)).from_vars(variables)
+
+
 # ******************************************    Class Declaration End       ****************************************** #
 # ******************************************    Demo / Test Routine         ****************************************** #
 if __name__ == '__main__':
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+File Description: Actor Test File. Checks that the Actor repairs a plan that fails during execution, with IPyHOP and
+with IPyHOP_Old.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, MonteCarloExecutor
+from ipyhop.planner_old import IPyHOP_Old
+from ipyhop.actor import Actor
+
+
+def a_move(state, a, b):
+    if state.loc == a and b in state.roads[a] and (a, b) not in state.blocked:
+        state.loc = b
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_move])
+# every move goes through the deviation handler
+actions.declare_action_models({'a_move': [0, 1]}, {'a_move': 1})
+
+
+def tm_travel(state, goal):
+    if state.loc == goal:
+        yield []
+    for b in sorted(state.roads[state.loc]):
+        yield [('a_move', state.loc, b), ('travel', goal)]
+
+
+methods = Methods()
+methods.declare_task_methods('travel', [tm_travel])
+
+
+def block_road(i, plan, state):
+    # the road b - d is closed while the first move is executed
+    if not state.blocked:
+        state = state.copy()
+        state.blocked = {('b', 'd')}
+    return state
+
+
+init_state = State('init_state')
+init_state.loc = 'a'
+init_state.roads = {'a': ['b', 'c'], 'b': ['d', 'e'], 'c': ['d'], 'd': [], 'e': ['d']}
+init_state.blocked = set()
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('travel', 'd')]
+    exp_0 = [('a_move', 'a', 'b'), ('a_move', 'b', 'd'), ('a_move', 'b', 'e'), ('a_move', 'e', 'd')]
+    for planner_class in (IPyHOP, IPyHOP_Old):
+        planner = planner_class(methods, actions)
+        assert planner.plan(init_state, task_list) == [('a_move', 'a', 'b'), ('a_move', 'b', 'd')], "Unexpected plan"
+        actor = Actor(planner, MonteCarloExecutor(actions, block_road, seed=0))
+        # the failed move is part of the history, followed by the repaired plan
+        history = actor.complete_to_do(init_state, task_list)
+        if planner_class is IPyHOP:
+            assert history == exp_0, "Result history and expected history are not same"
+        else:
+            # IPyHOP_Old re-refines from its own post-failure state, only the executed prefix is fixed
+            assert history[:2] == exp_0[:2], "Result history does not start with the executed actions"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
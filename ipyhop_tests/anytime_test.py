@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+File Description: Anytime Planning Test File. Checks that plan_anytime yields plans with strictly decreasing costs
+and respects its budget.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP
+
+
+def a_taxi(state, x):
+    state.loc = x
+    return state
+
+
+def a_walk(state, x):
+    state.loc = x
+    return state
+
+
+actions = Actions()
+actions.declare_actions([a_taxi, a_walk])
+actions.declare_action_models({'a_taxi': [1, 0], 'a_walk': [1, 0]}, {'a_taxi': 10.0, 'a_walk': 1.0})
+
+
+def tm_go_taxi(state, x):
+    yield [('a_taxi', x)]
+
+
+def tm_go_walk(state, x):
+    yield [('a_walk', x)]
+
+
+methods = Methods()
+methods.declare_task_methods('go', [tm_go_taxi, tm_go_walk])
+
+
+init_state = State("init_state")
+init_state.loc = 'home'
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('go', 'zoo'), ('go', 'park')]
+    planner = IPyHOP(methods, actions)
+    results = [*planner.plan_anytime(init_state, task_list)]
+    costs = [cost for _, cost in results]
+    assert costs == [20.0, 11.0, 2.0], "Expected plan costs 20, 11 and 2"
+    exp_0 = [('a_walk', 'zoo'), ('a_walk', 'park')]
+    assert results[-1][0] == exp_0, "Result plan and expected plan are not same"
+    # the planner keeps the best solution tree
+    assert planner.sol_plan == exp_0, "sol_plan should be the best plan"
+    assert [planner.sol_tree.nodes[x]['info'] for x in planner.sol_tree.nodes
+            if planner.sol_tree.nodes[x]['type'] == 'A'] == exp_0, "sol_tree should be the best solution tree"
+    assert planner.cost_bound is None, "Cost bound should be cleared"
+
+    # a small expansion budget only allows the first plan
+    results = [*planner.plan_anytime(init_state, task_list, max_expansions=5)]
+    assert [cost for _, cost in results] == [20.0], "Expected only the first plan"
+
+    # consumers can stop early
+    first_plan, first_cost = next(planner.plan_anytime(init_state, task_list))
+    assert first_cost == 20.0, "Expected the first plan to cost 20"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+File Description: Array State Test File. Checks that the states generated by array_state keep their numeric variables
+in one state array, copy, compare and pickle like States, and that IPyHOP finds the same plans with them.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from copy import deepcopy
+import pickle
+import numpy as np
+from ipyhop import Methods, Actions, State, IPyHOP, StateSnapshotStore, array_state
+
+OFFSETS = np.asarray([(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1)])
+
+
+def a_accelerate(state, dv_x, dv_y):
+    # the velocity changes by dv, then the car moves by the velocity
+    v = (state.v[0] + dv_x, state.v[1] + dv_y)
+    state.v = v
+    state.loc = (state.loc[0] + v[0], state.loc[1] + v[1])
+    return state
+
+
+actions = Actions()
+actions.declare_actions([a_accelerate])
+
+
+def tm_reach(state, x):
+    # candidate successors are evaluated in one vectorized step on the state array (and from tuples otherwise)
+    if state.loc[0] == x and state.v[0] == 0:
+        yield []
+    if hasattr(state, 'array'):
+        v = state.v + OFFSETS
+        loc = state.loc + v
+    else:
+        v = np.asarray(state.v) + OFFSETS
+        loc = np.asarray(state.loc) + v
+    # stay on y = 0, keep moving forward until x and brake in time to stop at x
+    valid = (loc[:, 1] == 0) & (v[:, 1] == 0) & ((v[:, 0] > 0) | (loc[:, 0] == x)) & (v[:, 0] >= 0) & \
+        (loc[:, 0] + v[:, 0] * (v[:, 0] - 1) // 2 <= x)
+    for i in np.flatnonzero(valid)[np.argsort(-v[valid, 0], kind='stable')]:
+        yield [('a_accelerate', int(OFFSETS[i, 0]), int(OFFSETS[i, 1])), ('reach', x)]
+
+
+methods = Methods()
+methods.declare_task_methods('reach', [tm_reach])
+
+RaceState = array_state('RaceState', {'loc': 2, 'v': 2}, dtype=int)
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    state = RaceState('init_state', loc=(0, 0))
+    state.track = {'length': 10}
+    state.declare_rigid(['track'])
+    assert state.loc.tolist() == [0, 0] and state.v.tolist() == [0, 0] and state.array.tolist() == [0, 0, 0, 0]
+    assert state_copy_is_independent(state), "Copies should be independent"
+    assert array_state('RaceState', {'loc': (2,), 'v': (2,)}, dtype=int) is RaceState, "Classes should be reused"
+    for state_clone in (deepcopy(state), pickle.loads(pickle.dumps(state)), RaceState.from_vars(vars(state))):
+        assert type(state_clone) is RaceState and state_clone == state, "Deep copy, pickle or from_vars failed"
+        assert np.shares_memory(state_clone.loc, state_clone.array), "Numeric variables should view the state array"
+
+    # the state array is not a variable, the other variables are deep-copied
+    state.laps = [[0]]
+    state_copy = state.copy()
+    assert '_array' not in vars(state) and vars(state_copy).keys() == vars(state).keys()
+    assert state_copy.laps == state.laps and state_copy.laps[0] is not state.laps[0], "Variables should be deep-copied"
+    del state.laps
+
+    # candidates are state arrays, a row becomes a state with with_array
+    candidates = state.array + np.hstack([OFFSETS, OFFSETS])
+    assert candidates[:, state.fields['v'][0]].shape == (9, 2)
+    successor = state.with_array(candidates[-1])
+    assert successor.loc.tolist() == [1, 1] and successor.track is state.track and state.loc.tolist() == [0, 0]
+
+    # IPyHOP finds the same plans with array states
+    plain_state = State('init_state')
+    plain_state.loc, plain_state.v = (0, 0), (0, 0)
+    task_list = [('reach', 6)]
+    exp_0 = IPyHOP(methods, actions).plan(plain_state, task_list)
+    assert exp_0 == [('a_accelerate', 1, 0), ('a_accelerate', 1, 0), ('a_accelerate', 0, 0), ('a_accelerate', -1, 0),
+                     ('a_accelerate', -1, 0)], "Unexpected plan"
+    for snapshot_store in (None, StateSnapshotStore()):
+        planner = IPyHOP(methods, actions, snapshot_store=snapshot_store)
+        assert planner.plan(state, task_list) == exp_0, "Result plan and expected plan are not same"
+        assert planner.state.loc.tolist() == [6, 0] and planner.state.track is state.track
+    assert state.loc.tolist() == [0, 0], "Planning should not modify the initial state"
+
+
+def state_copy_is_independent(state) -> bool:
+    state_copy = state.copy()
+    state_copy.loc = (5, 5)
+    state_copy.v[0] = 1
+    return state_copy.array.tolist() == [5, 5, 1, 0] and state.array.tolist() == [0, 0, 0, 0] and \
+        state_copy != state and state_copy.track is state.track
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
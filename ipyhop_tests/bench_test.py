@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+File Description: Benchmark Test File. Runs the blocks world problems of the benchmark suite with both planners and
+checks the results and the regression report. Checks that both planners solve every problem of the quick suite.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+import json
+from copy import deepcopy
+from ipyhop import State
+from ipyhop.bench import suite, run_suite, compare, count_state_copies
+from ipyhop.bench.problems import blocks_world
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    assert len(suite('full')) == 3 + 30 + 20 + 20 + 10 + 10, "Unexpected size of the full suite"
+
+    results = run_suite(blocks_world(), seeds=(0, 1))
+    # results are machine readable
+    results = json.loads(json.dumps(results))
+    assert len(results['records']) == 3 * 2 * 2, "Expected a record per problem, planner and seed"
+    for record in results['records']:
+        assert record['status'] == 'ok', "Benchmark run failed: " + str(record)
+        assert record['plan_latency'] > 0 and record['node_expansions'] >= 0, "Invalid record"
+        assert record['state_copies'] > 0 and record['peak_memory'] > 0, "Diagnostics missing"
+    summary = results['summary']
+    assert set(summary) == {'blocks_world/IPyHOP', 'blocks_world/IPyHOP_Old'}, "Unexpected summary groups"
+    entry = summary['blocks_world/IPyHOP']
+    assert entry['runs'] == 6 and entry['errors'] == 0, "Unexpected run count"
+    assert entry['plan_latency_p50'] <= entry['plan_latency_p90'] <= entry['plan_latency_p99'], "Bad percentiles"
+
+    # a result has no regressions against itself, a slower one does
+    assert compare(results, results) == [], "No regressions expected"
+    slower = deepcopy(results)
+    slower['summary']['blocks_world/IPyHOP']['plan_latency_p50'] *= 2
+    slower['summary']['blocks_world/IPyHOP']['expansions_per_second'] /= 2
+    regressions = compare(results, slower)
+    assert {regression['metric'] for regression in regressions} == {'plan_latency_p50', 'expansions_per_second'}, \
+        "Expected two regressions"
+
+    # both planners solve every problem of the quick suite (replanning may make their histories differ)
+    quick = run_suite(suite('quick'), diagnostics=False)
+    statuses = dict()
+    for record in quick['records']:
+        statuses.setdefault((record['domain'], record['problem']), dict())[record['planner']] = record['status']
+    for problem, planner_statuses in statuses.items():
+        assert planner_statuses == {'IPyHOP': 'ok', 'IPyHOP_Old': 'ok'}, \
+            "Planners disagree on " + '/'.join(problem) + ": " + str(planner_statuses)
+
+    # the copy counter is removed again
+    state_copy = State.copy
+    with count_state_copies() as copies:
+        State('s').copy()
+    assert copies[0] == 1 and State.copy is state_copy, "State.copy should be restored"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+File Description: Bitset Test File. Checks that BoolMaps behave like boolean dicts, and that IPyHOP finds the same
+plans when the boolean state variables and multigoal variables are interned as bitsets.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from copy import deepcopy
+import pickle
+from ipyhop import Methods, Actions, State, MultiGoal, IPyHOP, Symbols, BoolMap, intern_bool_vars, \
+    mgm_split_multigoal
+
+
+def a_ship(state, o):
+    if state.ready[o] and not state.shipped[o]:
+        state.shipped[o] = True
+        state.count += 1
+        return state
+
+
+def a_prepare(state, o):
+    if not state.ready[o]:
+        state.ready[o] = True
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_ship, a_prepare])
+
+
+def gm_ship(state, o, val):
+    if val and not state.ready[o]:
+        yield [('a_prepare', o), ('a_ship', o)]
+    elif val:
+        yield [('a_ship', o)]
+
+
+def mgm_split(state, multigoal):
+    yield mgm_split_multigoal(state, multigoal)
+
+
+methods = Methods()
+methods.declare_goal_methods('shipped', [gm_ship])
+methods.declare_multigoal_methods(None, [mgm_split])
+
+
+def new_problem():
+    state = State('init_state')
+    state.ready = {'o1': False, 'o2': True, 'o3': False}
+    state.shipped = {'o1': False, 'o2': False, 'o3': False}
+    state.count = 0
+    goal = MultiGoal('goal')
+    goal.shipped = {'o1': True, 'o3': True}
+    return state, goal
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    # BoolMaps behave like boolean dicts
+    symbols = Symbols(['o2'])
+    bool_map = BoolMap(symbols, {'o1': True, 'o2': False})
+    assert symbols.index == {'o2': 0, 'o1': 1} and list(bool_map) == ['o2', 'o1'], "Keys should be interned in order"
+    assert bool_map == {'o1': True, 'o2': False} and bool_map['o1'] is True and bool_map.get('o3') is None
+    assert 'o3' not in bool_map and len(bool_map) == 2 and set(bool_map.items()) == {('o1', True), ('o2', False)}
+    bool_map_copy = bool_map.copy()
+    bool_map_copy['o2'] = True
+    bool_map_copy['o3'] = False
+    assert bool_map['o2'] is False and 'o3' not in bool_map and bool_map_copy != bool_map, "Copies are not independent"
+    del bool_map_copy['o3']
+    assert bool_map_copy == {'o1': True, 'o2': True} and bool_map_copy.symbols is symbols
+    for clone in (deepcopy(bool_map), pickle.loads(pickle.dumps(bool_map))):
+        assert clone == bool_map, "Deep copy or pickle failed"
+    assert deepcopy(bool_map).symbols is symbols, "Deep copies should share the symbol table"
+
+    # BoolMaps are hashed by their bitsets, consistently with equality
+    assert hash(bool_map.copy()) == hash(bool_map) and len({bool_map, bool_map.copy(), bool_map_copy}) == 2
+    other_map = BoolMap(Symbols(), {'o1': True, 'o2': False})
+    assert other_map != bool_map and other_map == dict(bool_map), "Only BoolMaps over the same table are equal"
+
+    # unpickled BoolMaps share the symbol table with the same id, which interns the symbols it is missing
+    pickled = pickle.dumps(BoolMap(symbols, {'o5': True}))
+    assert pickle.loads(pickled).symbols is symbols and pickle.loads(pickled).mismatches(bool_map) == {'o5': True}
+    # (checkpoints of a table restored in another process, where the table is gone)
+    lost_symbols = Symbols(['a'])
+    old_pickled = pickle.dumps(BoolMap(lost_symbols, {'a': True}))
+    lost_symbols.intern('b')
+    new_pickled = pickle.dumps(BoolMap(lost_symbols, {'b': True}))
+    del lost_symbols
+    old_map, new_map = pickle.loads(old_pickled), pickle.loads(new_pickled)
+    assert old_map.symbols is new_map.symbols and new_map.symbols.names == ['a', 'b'] and new_map == {'b': True}
+    try:
+        bool_map['o1'] = 1
+        raise AssertionError("Non boolean values should be rejected")
+    except TypeError:
+        pass
+    goal_map = BoolMap(symbols, {'o1': True, 'o2': True, 'o4': False})
+    assert goal_map.mismatches(bool_map) == {'o2': True, 'o4': False}, "Unexpected mismatches"
+    assert goal_map.mismatches({'o1': True, 'o2': False}) == {'o2': True, 'o4': False}, "Unexpected dict mismatches"
+
+    # IPyHOP finds the same plans with interned boolean variables
+    state, goal = new_problem()
+    exp_0 = IPyHOP(methods, actions).plan(state, [goal])
+    assert exp_0 == [('a_prepare', 'o1'), ('a_ship', 'o1'), ('a_prepare', 'o3'), ('a_ship', 'o3')], "Unexpected plan"
+    symbols = Symbols()
+    assert intern_bool_vars(state, symbols) == ['ready', 'shipped'] and intern_bool_vars(goal, symbols) == ['shipped']
+    assert type(state.shipped) is BoolMap and type(goal.shipped) is BoolMap and state.count == 0
+    planner = IPyHOP(methods, actions)
+    assert planner.plan(state, [goal]) == exp_0, "Result plan and expected plan are not same"
+    assert planner.state.shipped == {'o1': True, 'o2': False, 'o3': True} and planner.state.count == 2
+    assert state.shipped == {'o1': False, 'o2': False, 'o3': False}, "Planning should not modify the initial state"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+File Description: Planning Budget Test File. Checks that plan and replan stop when their budget is exhausted and that
+the interrupted planning call can be resumed to the same result as an uninterrupted one.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, BudgetExhausted
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_step])
+
+
+def tm_detour(state, n):
+    yield [('a_step', 1), ('a_step', 3)]
+
+
+def tm_count(state, n):
+    if state.count < n:
+        yield [('a_step', state.count + 1), ('count', n)]
+    else:
+        yield []
+
+
+methods = Methods()
+methods.declare_task_methods('count', [tm_detour, tm_count])
+
+
+init_state = State("init_state")
+init_state.count = 0
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('count', 6)]
+    exp_0 = [('a_step', n) for n in range(1, 7)]
+    planner = IPyHOP(methods, actions)
+    assert planner.plan(init_state, task_list) == exp_0, "Result plan and expected plan are not same"
+    total_expansions = planner.node_expansions
+
+    # an expansion budget interrupts planning, the partial solution tree is kept
+    planner = IPyHOP(methods, actions)
+    result = planner.plan(init_state, task_list, max_expansions=4)
+    assert isinstance(result, BudgetExhausted) and not result, "Planning should stop when the budget is exhausted"
+    assert result.reason == 'expansions', "Expected the expansion budget to be exhausted"
+    assert planner.node_expansions == 4, "Expected exactly 4 node expansions"
+    assert len(result.sol_tree.nodes) > 1, "The partial solution tree should be kept"
+
+    # resuming in small steps gives the same plan as an uninterrupted run
+    while isinstance(result, BudgetExhausted):
+        result = result.resume(max_expansions=3)
+    assert result == exp_0, "Resumed plan and expected plan are not same"
+    assert planner.node_expansions == total_expansions, "Resuming should not repeat any node expansion"
+    try:
+        planner.resume()
+        assert False, "Nothing should be left to resume"
+    except ValueError:
+        pass
+
+    # a wall-clock budget of zero stops planning before the first expansion
+    result = planner.plan(init_state, task_list, time_limit=0.0)
+    assert not result and result.reason == 'time', "Expected the time budget to be exhausted"
+    assert planner.resume() == exp_0, "Resumed plan and expected plan are not same"
+
+    # replan with a budget, the state was changed behind the planner's back after the second action
+    planner.plan(init_state, task_list)
+    fail_state = planner.simulate(init_state)[2]
+    fail_state.count = 1
+    exp_1 = planner.replan(fail_state.copy(), 2)
+    planner.plan(init_state, task_list)
+    result = planner.replan(fail_state.copy(), 2, max_expansions=1)
+    assert isinstance(result, BudgetExhausted), "Replanning should stop when the budget is exhausted"
+    while isinstance(result, BudgetExhausted):
+        result = result.resume(max_expansions=1)
+    assert result == exp_1, "Resumed repair and expected repair are not same"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
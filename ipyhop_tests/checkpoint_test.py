@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+File Description: Checkpoint Test File. Checks that a planner restored from a checkpoint finishes planning and
+replanning exactly like the planner the checkpoint was taken from.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from pickle import loads
+from zlib import decompress
+from ipyhop import Methods, Actions, State, IPyHOP, BestFirstSearch
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+def a_tick(state):
+    state.ticks += 1
+    return state
+
+
+actions = Actions()
+actions.declare_actions([a_step, a_tick])
+
+
+def tm_run(state, n):
+    yield [('count', n)]
+
+
+def tm_detour(state, n):
+    yield [('a_step', 1), ('a_step', 3)]
+
+
+def tm_count(state, n):
+    if state.count < n:
+        for _ in range(2):
+            yield [('a_tick',), ('a_step', state.count + 2)]
+        yield [('a_tick',), ('a_step', state.count + 1), ('count', n)]
+    else:
+        yield []
+
+
+methods = Methods()
+methods.declare_task_methods('run', [tm_run])
+methods.declare_task_methods('count', [tm_detour, tm_count])
+
+
+init_state = State("init_state")
+init_state.count = 0
+init_state.ticks = 0
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('run', 5)]
+    for strategy in [None, BestFirstSearch]:
+        planner = IPyHOP(methods, actions, search_strategy=strategy and strategy())
+        exp_0 = planner.plan(init_state, task_list)
+        assert exp_0 and len(exp_0) == 10, "Expected a plan of 10 actions"
+        total_expansions = planner.node_expansions
+
+        for max_expansions in range(1, total_expansions):
+            # interrupt planning, checkpoint, and finish planning in a new planner
+            planner = IPyHOP(methods, actions, search_strategy=strategy and strategy())
+            assert not planner.plan(init_state, task_list, max_expansions=max_expansions), "Expected interruption"
+            data = planner.checkpoint()
+            assert isinstance(data, bytes), "Checkpoints should be bytes"
+            restored = IPyHOP(methods, actions, search_strategy=strategy and strategy())
+            assert restored.restore_checkpoint(data).run() == exp_0, "Restored plan and expected plan are not same"
+            assert restored.node_expansions == total_expansions, "Restoring should not repeat any node expansion"
+
+    # snapshot before a risky repair, then restore and repair again
+    planner = IPyHOP(methods, actions)
+    planner.plan(init_state, task_list)
+    data = planner.checkpoint()
+    # states are stored once per distinct value
+    checkpoint = loads(decompress(data))
+    state_nodes = [record for _, _, record in checkpoint['nodes'] if record.get('state') is not None]
+    assert len(checkpoint['states']) < len(state_nodes), "States should be deduplicated"
+    fail_state = planner.simulate(init_state)[4]
+    fail_state.count = 1
+    exp_1 = planner.replan(fail_state.copy(), 4)
+    assert exp_1, "Replanning failed"
+    planner.blacklist_command(('a_tick',))
+    assert planner.replan(fail_state.copy(), 4) is False, "Replanning should fail without a_tick"
+    planner.blacklist = set()
+    assert planner.restore_checkpoint(data).run() == exp_0, "Restored plan and expected plan are not same"
+    assert planner.replan(fail_state.copy(), 4) == exp_1, "Restored repair and expected repair are not same"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
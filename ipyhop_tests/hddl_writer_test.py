@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+File Description: HDDL Plan Writer Test File. Checks the IPC plan written by write_hddl_plan and hddl_plan_str, and
+the incremental mode used to log plan repairs.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from io import StringIO
+from ipyhop import Methods, Actions, State, IPyHOP
+
+
+def a_taxi(state, x):
+    state.loc = x
+    return state
+
+
+def a_walk(state, x):
+    state.loc = x
+    return state
+
+
+def a_visit(state, x):
+    if state.loc == x:
+        state.visited = state.visited | {x}
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_taxi, a_walk, a_visit])
+
+
+def tm_go_taxi(state, x):
+    yield [('a_taxi', x)]
+
+
+def tm_go_walk(state, x):
+    yield [('a_walk', x)]
+
+
+def tm_visit(state, x):
+    yield [('go', x), ('a_visit', x)]
+
+
+methods = Methods()
+methods.declare_task_methods('go', [tm_go_taxi, tm_go_walk])
+methods.declare_task_methods('visit', [tm_visit])
+
+
+init_state = State("init_state")
+init_state.loc = 'home'
+init_state.visited = frozenset()
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    planner = IPyHOP(methods, actions)
+    planner.plan(init_state, [('visit', 'zoo'), ('visit', 'park')])
+    hddl_str = planner.hddl_plan_str()
+    lines = hddl_str.splitlines()
+    assert lines[0] == "==>" and lines[-1] == "<==", "Invalid hddl plan string"
+    assert [line.split()[1:] for line in lines[1:5]] == [['a_taxi', 'zoo'], ['a_visit', 'zoo'], ['a_taxi', 'park'],
+                                                         ['a_visit', 'park']], "Unexpected plan section"
+    assert lines[6] == "root 1 2 ", "Unexpected root line"
+    assert lines[7].startswith("1 visit zoo -> tm_visit "), "Unexpected decomposition line"
+
+    # streaming to a file-like object with a small buffer gives the same string
+    output = StringIO()
+    assert planner.write_hddl_plan(output, buffer_lines=1) == 9, "Expected 9 node lines"
+    assert output.getvalue() == hddl_str, "Written plan and plan string are not same"
+    # nothing changed since the last dump
+    output = StringIO()
+    assert planner.write_hddl_plan(output, changed_only=True) == 0, "Expected no changed node lines"
+    assert output.getvalue() == "==>\n\n<==\n", "Expected an empty dump"
+
+    # after a repair only the repaired subtree and the ancestors whose children changed are written
+    fail_state = planner.simulate(init_state)[2]
+    fail_state.loc = 'home'
+    planner.blacklist_command(('a_taxi', 'park'))
+    assert planner.replan(fail_state, 2), "Replanning failed"
+    output = StringIO()
+    assert planner.write_hddl_plan(output, changed_only=True) > 0, "Expected changed node lines"
+    changed_lines = output.getvalue().splitlines()
+    full_lines = planner.hddl_plan_str().splitlines()
+    assert set(changed_lines) < set(full_lines), "Changed lines should be lines of the full plan"
+    assert any(' a_walk park' in line for line in changed_lines), "Expected the repaired action"
+    assert not any(' a_visit zoo' in line for line in changed_lines), "Unchanged actions should not be written"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+File Description: Instrumentation Test File. Checks that the planner instrumentation counts and times planning events
+without changing the plans, and that detaching it restores the original planner.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, PlannerInstrumentation
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+def a_finish(state):
+    if state.count >= 3:
+        state.done = True
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_step, a_finish])
+
+
+def tm_detour(state):
+    yield [('a_step', 1), ('a_step', 2), ('a_step', 5)]
+
+
+def tm_direct(state):
+    yield [('a_step', 1), ('a_step', 2), ('a_step', 3)]
+
+
+def tm_finish(state):
+    yield [('a_finish',)]
+
+
+methods = Methods()
+methods.declare_task_methods('count_up', [tm_detour, tm_direct])
+methods.declare_task_methods('finish', [tm_finish])
+
+
+init_state = State("init_state")
+init_state.count = 0
+init_state.done = False
+
+
+class EventLog(PlannerInstrumentation):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def on_backtrack(self, planner, node_id, reopened_node_id):
+        super().on_backtrack(planner, node_id, reopened_node_id)
+        self.events.append(('backtrack', node_id))
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('count_up',), ('finish',)]
+    exp_plan = [('a_step', 1), ('a_step', 2), ('a_step', 3), ('a_finish',)]
+
+    instrumentation = EventLog()
+    planner = IPyHOP(methods, actions, instrumentation=instrumentation)
+    plan = planner.plan(init_state, task_list)
+    assert plan == exp_plan, "Result plan and expected plan are not same"
+
+    counters = instrumentation.report()['counters']
+    # count_up is refined twice (detour then direct), finish once
+    assert counters['refine'] == 3, "Expected 3 refinements"
+    # a_step 5 fails after the detour
+    assert counters['action_failed'] == 1, "Expected 1 failed action"
+    assert counters['action'] == 6, "Expected 6 successful actions"
+    assert counters['backtrack'] == len(instrumentation.events) > 0, "Expected backtracking events"
+    assert counters['cycle_check'] == 6, "Expected a cycle check per successful action"
+    timers = instrumentation.report()['timers']
+    for category in ('state_copy', 'method', 'action', 'cycle_check', 'networkx'):
+        assert timers[category] > 0, "Expected time in " + category
+
+    # the count is reset before the third step, replanning repeats count_up
+    fail_state = planner.simulate(init_state)[2]
+    fail_state.count = 0
+    result = planner.replan(fail_state, 2)
+    assert result is not False, "Replanning failed"
+    assert instrumentation.counters['replan'] == 1, "Expected a replan event"
+    assert instrumentation.timers['replan'] > 0, "Expected time in replan"
+
+    # detaching restores the original planner, which finds the same plan
+    instrumentation.detach(planner)
+    assert planner.instrumentation is None, "Instrumentation should be detached"
+    assert '_apply_action' not in vars(planner), "Instrumented helpers should be removed"
+    instrumentation.reset()
+    assert planner.plan(init_state, task_list) == exp_plan, "Result plan and expected plan are not same"
+    assert not instrumentation.counters, "Detached instrumentation should not receive events"
+    print(planner.instrumentation, instrumentation)
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+File Description: Memory Report Test File. Checks the solution tree memory report and that snapshots dropped by a
+snapshot policy are recomputed correctly when IPyHOP backtracks into their nodes.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, SnapshotPolicy, ChoicePointSnapshotPolicy
+
+
+def a_add(state, k):
+    state.total += k
+    state.log = state.log + [k]
+    return state
+
+
+def a_check(state, total):
+    if state.total == total:
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_add, a_check])
+
+
+def tm_run(state, n):
+    yield [('a_add', 10), ('pick_one', n), ('pick', n), ('a_check', 10 + 2 * (n - 1))]
+
+
+def tm_pick_one(state, n):
+    # an iterator over a list of method instances knows when it is exhausted, a generator does not
+    return iter([[('a_add', n - 1)]])
+
+
+def tm_pick(state, n):
+    for k in range(n):
+        yield [('a_add', k)]
+
+
+def tm_pick_last(state, n):
+    yield [('a_add', n - 1)]
+
+
+methods = Methods()
+methods.declare_task_methods('run', [tm_run])
+methods.declare_task_methods('pick', [tm_pick])
+methods.declare_task_methods('pick_one', [tm_pick_one])
+methods.declare_task_methods('pick_twice', [tm_pick, tm_pick_last])
+
+
+init_state = State("init_state")
+init_state.total = 0
+init_state.log = []
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('run', 5)]
+    planner = IPyHOP(methods, actions)
+    exp_0 = planner.plan(init_state, task_list)
+    assert exp_0 == [('a_add', 10), ('a_add', 4), ('a_add', 4), ('a_check', 18)], "Unexpected plan"
+    report_0 = planner.memory_report()
+    assert report_0['snapshots'] == 3 and report_0['dropped_snapshots'] == 0, "Every snapshot should be kept"
+    for group in ('by_type', 'by_depth'):
+        for category in ('nodes', 'states', 'generators', 'node_dicts'):
+            assert sum(entry[category] for entry in report_0[group].values()) == report_0[category], \
+                "Breakdown should add up to the totals"
+    assert report_0['by_type']['T']['generators'] > 0 and report_0['method_generators'] == 3, \
+        "Live method instance generators should be accounted"
+
+    # the pick_one node was refined with its last instance, its snapshot is dropped and recomputed if needed; the
+    # pick node has a single method whose generator may still yield, so it is a choice point and keeps its snapshot
+    planner = IPyHOP(methods, actions, snapshot_policy=ChoicePointSnapshotPolicy())
+    assert planner.plan(init_state, task_list) == exp_0, "Result plan and expected plan are not same"
+    report_1 = planner.memory_report()
+    assert report_1['snapshots'] == 2 and report_1['dropped_snapshots'] == 1, "Pick one snapshot should be dropped"
+    assert report_1['states'] < report_0['states'], "Dropping snapshots should use less memory"
+    pick_id = [x for x in planner.sol_tree.nodes if planner.sol_tree.nodes[x]['info'] == ('pick', 5)][0]
+    assert planner.sol_tree.nodes[pick_id]['state'].log == [10, 4], "Pick snapshot should be kept"
+    pick_id = [x for x in planner.sol_tree.nodes if planner.sol_tree.nodes[x]['info'] == ('pick_one', 5)][0]
+    assert planner._recompute_snapshot(pick_id).log == [10], "Recomputed snapshot is wrong"
+
+    # checkpoints recompute the snapshots their method instance generators are replayed from
+    restored = IPyHOP(methods, actions, snapshot_policy=ChoicePointSnapshotPolicy())
+    restored.restore_checkpoint(planner.checkpoint())
+    assert restored.sol_tree.nodes[pick_id]['state'].total == 10, "Checkpoint should recompute dropped snapshots"
+
+    # choice points keep their snapshots, a policy keeping everything is the default behaviour
+    planner = IPyHOP(methods, actions, snapshot_policy=ChoicePointSnapshotPolicy())
+    planner.plan(init_state, [('pick_twice', 3), ('a_check', 2)])
+    assert planner.memory_report()['dropped_snapshots'] == 0, "Choice point snapshot should be kept"
+    planner = IPyHOP(methods, actions, snapshot_policy=SnapshotPolicy())
+    assert planner.plan(init_state, task_list) == exp_0, "Result plan and expected plan are not same"
+    assert planner.memory_report()['snapshots'] == 3, "Every snapshot should be kept"
+
+    # replanning from the true state of the world
+    planner = IPyHOP(methods, actions, snapshot_policy=ChoicePointSnapshotPolicy())
+    planner.plan(init_state, task_list)
+    fail_state = planner.simulate(init_state)[2]
+    fail_state.total = 1
+    exp_1 = IPyHOP(methods, actions)
+    exp_1.plan(init_state, task_list)
+    exp_1 = exp_1.replan(fail_state.copy(), 2)
+    assert exp_1 is not False and planner.replan(fail_state.copy(), 2) == exp_1, "Repairs are not same"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
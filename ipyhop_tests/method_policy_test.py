@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+File Description: Method Policy Test File. Checks that the adaptive method policy learns to try the successful method
+first across planning calls, and that method instances that are None are skipped like before.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, AdaptiveMethodPolicy, LimitedDiscrepancySearch, \
+    BestFirstSearch
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+def a_finish(state):
+    if state.count >= 3:
+        state.done = True
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_step, a_finish])
+
+
+def tm_detour(state):
+    yield [('a_step', 1), ('a_step', 2), ('a_step', 5)]
+
+
+def tm_direct(state):
+    yield [('a_step', 1), ('a_step', 2), ('a_step', 3)]
+
+
+def tm_finish(state):
+    yield [('a_finish',)]
+
+
+def tm_not_applicable(state):
+    # like the rescue methods, a method that does not apply yields None
+    yield None
+
+
+def tm_none_then_direct(state):
+    yield None
+    yield [('a_step', 1), ('a_step', 2), ('a_step', 3)]
+
+
+methods = Methods()
+methods.declare_task_methods('count_up', [tm_detour, tm_direct])
+methods.declare_task_methods('finish', [tm_finish])
+
+none_methods = Methods()
+none_methods.declare_task_methods('count_up', [tm_not_applicable, tm_none_then_direct])
+none_methods.declare_task_methods('finish', [tm_not_applicable, tm_finish])
+
+
+init_state = State("init_state")
+init_state.count = 0
+init_state.done = False
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    exp_0 = [('a_step', 1), ('a_step', 2), ('a_step', 3), ('a_finish',)]
+    policy = AdaptiveMethodPolicy()
+    planner = IPyHOP(methods, actions, method_policy=policy)
+
+    planner.node_expansions = 0
+    plan = planner.plan(init_state, [('count_up',), ('finish',)])
+    assert plan == exp_0, "Result plan and expected plan are not same"
+    first_expansions = planner.node_expansions
+    assert policy.estimated_expansions_saved == 0, "Declaration order was used, nothing should have been saved"
+    assert policy.reordered_nodes == 0 and policy.reordered_keys == set(), "Declaration order was used"
+
+    planner.node_expansions = 0
+    plan = planner.plan(init_state, [('count_up',), ('finish',)])
+    assert plan == exp_0, "Result plan and expected plan are not same"
+    assert planner.node_expansions < first_expansions, "Learned order should need fewer expansions"
+    assert policy.estimated_expansions_saved > 0, "Learned order should report saved expansions"
+    assert policy.reordered_nodes == 1 and policy.reordered_keys == {'count_up'}, \
+        "Learned order should differ from declaration order"
+
+    # the declared order is still used by a planner without a policy
+    plan = IPyHOP(methods, actions).plan(init_state, [('count_up',), ('finish',)])
+    assert plan == exp_0, "Result plan and expected plan are not same"
+    print(policy)
+
+    # None instances are skipped, the later instances and methods of the same node are still tried
+    for search_strategy in (None, LimitedDiscrepancySearch(), BestFirstSearch()):
+        for method_policy in (None, AdaptiveMethodPolicy()):
+            planner = IPyHOP(none_methods, actions, search_strategy=search_strategy, method_policy=method_policy)
+            plan = planner.plan(init_state, [('count_up',), ('finish',)])
+            assert plan == exp_0, "None instances should be skipped"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+File Description: Action Precondition Test File. Checks that declared action preconditions keep the plans and
+executions unchanged while inapplicable actions no longer copy the state, also when the executor goes through a
+deviation handler.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, MonteCarloExecutor, precondition
+
+
+@precondition(lambda state, n: state.count == n - 1)
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+def a_jump(state, n):
+    if state.count == 0:
+        state.count = n
+        return state
+
+
+def a_jump_precondition(state, n):
+    return state.count == 0
+
+
+def tm_run(state, n):
+    yield [('a_jump', 5), ('a_step', n)]
+    yield [('a_step', 1), ('a_step', 2), ('a_step', n)]
+
+
+methods = Methods()
+methods.declare_task_methods('run', [tm_run])
+
+
+def deviate_second_step(i, plan, state):
+    # the second action is executed from a deviated state, the other ones from the state they are given
+    if i == 1:
+        state = state.copy()
+        state.count = 5
+    return state
+
+
+init_state = State("init_state")
+init_state.count = 0
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    # preconditions from the decorator and from declare_actions
+    actions = Actions()
+    actions.declare_actions([a_step, a_jump], preconditions={'a_jump': a_jump_precondition})
+    assert set(actions.action_precond) == {'a_step', 'a_jump'}, "Preconditions should be declared"
+    plain_actions = Actions()
+    plain_actions.declare_actions([a_step, a_jump])
+    plain_actions.action_precond.clear()
+
+    copies = [0]
+    state_copy = State.copy
+
+    def counted_copy(self):
+        copies[0] += 1
+        return state_copy(self)
+
+    task_list = [('run', 3)]
+    State.copy = counted_copy
+    try:
+        exp_0 = IPyHOP(methods, plain_actions).plan(init_state, task_list)
+        plain_copies, copies[0] = copies[0], 0
+        planner = IPyHOP(methods, actions)
+        assert planner.plan(init_state, task_list) == exp_0, "Result plan and expected plan are not same"
+    finally:
+        State.copy = state_copy
+    assert exp_0 == [('a_step', 1), ('a_step', 2), ('a_step', 3)], "Unexpected plan"
+    # the failing a_step of the first method instance is not applied to a copy of the state
+    assert copies[0] == plain_copies - 1, "Inapplicable actions should not copy the state"
+
+    # the executor stops at the first inapplicable action
+    executor = MonteCarloExecutor(actions)
+    exec_list = executor.execute(init_state, [('a_step', 1), ('a_step', 3)])
+    plain_exec_list = MonteCarloExecutor(plain_actions).execute(init_state, [('a_step', 1), ('a_step', 3)])
+    assert [(act, None if state is None else state.count) for act, state in exec_list] == \
+        [(act, None if state is None else state.count) for act, state in plain_exec_list] == \
+        [(None, 0), (('a_step', 1), 1), (('a_step', 3), None)], "Executions are not same"
+    # executed states are not modified by the following actions
+    exec_list = executor.execute(init_state, exp_0)
+    assert [state.count for _, state in exec_list] == [0, 1, 2, 3], "Executed states should be kept"
+
+    # every action goes through the deviation handler
+    deviation_actions = Actions()
+    deviation_actions.declare_actions([a_step])
+    deviation_actions.declare_action_models({'a_step': [0, 1]}, {'a_step': 1})
+    executor = MonteCarloExecutor(deviation_actions, lambda i, plan, state: state)
+    State.copy = counted_copy
+    copies[0] = 0
+    try:
+        exec_list = executor.execute(init_state, exp_0)
+    finally:
+        State.copy = state_copy
+    # the recorded states are not modified by the actions and only the actions copy the state
+    assert [state.count for _, state in exec_list] == [0, 1, 2, 3], "Executed states should be kept"
+    assert copies[0] == 2 + len(exp_0), "Unexpected number of state copies"
+    # an action that is inapplicable in the deviated state is not applied
+    exec_list = MonteCarloExecutor(deviation_actions, deviate_second_step).execute(init_state, exp_0)
+    assert [(act, None if state is None else state.count) for act, state in exec_list] == \
+        [(None, 0), (('a_step', 1), 5), (('a_step', 2), None)], "Deviated execution is not as expected"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
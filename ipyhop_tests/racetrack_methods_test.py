@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+File Description: Racetrack Methods Test File. Checks the distances to the finish line computed by shortest_dists
+against the multi-source Dijkstra of networkx, and that the visibility graph cache is kept per problem.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from math import isclose, dist
+import networkx as nx
+from examples.racetrack.racetrack_example import prob_to_state_and_task
+from examples.racetrack.search.sample_probs import rect20, wall8a
+from examples.racetrack.task_based.methods import shortest_dists, tm_generate_visibility_graph
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    # unreachable points have no distance, sources are at distance 0
+    edges = {'a': [('b', 1.0), ('c', 4.0)], 'b': [('a', 1.0), ('c', 2.0)], 'c': [('a', 4.0), ('b', 2.0)], 'd': []}
+    assert shortest_dists(edges, ['a']) == {'a': 0.0, 'b': 1.0, 'c': 3.0}, "Unexpected distances"
+    assert shortest_dists(edges, ['c', 'd']) == {'a': 3.0, 'b': 2.0, 'c': 0.0, 'd': 0.0}, "Unexpected distances"
+
+    for prob in (wall8a, rect20):
+        state, [(_, f_line)] = prob_to_state_and_task(prob)
+        assert tm_generate_visibility_graph(state, f_line) == [('hill_climb',)], "Visibility graph not generated"
+        vis_graph, dist_dict = state.rigid['vis_graph'], state.rigid['dist_dict']
+        # goal points on walls are not in the visibility graph, but are sources too
+        graph = nx.Graph()
+        graph.add_nodes_from(state.rigid['goal_pts'])
+        graph.add_weighted_edges_from((pt, other_pt, dist(pt, other_pt))
+                                      for pt, visible in vis_graph.items() for other_pt in visible)
+        exp_0 = nx.multi_source_dijkstra_path_length(graph, state.rigid['goal_pts'])
+        assert dist_dict.keys() == exp_0.keys(), "Result points and expected points are not same"
+        assert all(isclose(dist_dict[pt], exp_0[pt], abs_tol=1e-9) for pt in exp_0), "Distances are not same"
+
+        # replanning from a point of the visibility graph reuses it, the states of other problems do not
+        replan_state = state.copy()
+        replan_state.loc = max(dist_dict, key=dist_dict.get)
+        tm_generate_visibility_graph(replan_state, f_line)
+        assert replan_state.rigid['dist_dict'] == dist_dict, "Cached distances should be reused"
+        assert list(replan_state.rigid['vis_cache']) == [f_line], "Unexpected visibility graph cache"
+        assert 'vis_cache' not in prob_to_state_and_task(prob)[0].rigid, "New problems should not share the cache"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+Organization: University of Maryland at College Park
+"""
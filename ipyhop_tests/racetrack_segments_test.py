@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+File Description: Racetrack Segments Test File. Checks the vectorized crash tests of the Racetrack domain (against all
+the walls and with a WallGrid) against racetrack.intersect, on random, degenerate and collinear segments, and that the
+WallGrid gives the same results as the test against all the walls.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+import random
+import numpy as np
+from examples.racetrack.search.racetrack import intersect
+from examples.racetrack.search.segments import crash, crashes, intersect_matrix, WallGrid, GRID_MIN_PAIRS
+
+
+def random_segment(size: int):
+    # a random segment, a point (degenerate segment) or an axis parallel segment, with end points in [0, size]
+    kind = random.randrange(4)
+    xa, ya = random.randint(0, size), random.randint(0, size)
+    if kind == 0:
+        return (xa, ya), (xa, ya)
+    if kind == 1:
+        return (xa, ya), (xa, random.randint(0, size))
+    if kind == 2:
+        return (xa, ya), (random.randint(0, size), ya)
+    return (xa, ya), (random.randint(0, size), random.randint(0, size))
+
+
+def collinear_segments(size: int):
+    # segments on the same line (overlapping, touching or disjoint), some of them degenerate
+    (xa, ya), (dx, dy) = (random.randint(0, size), random.randint(0, size)), random.choice([(1, 0), (0, 1), (1, 1),
+                                                                                           (2, -1), (-1, 3)])
+    line = [(xa + k * dx, ya + k * dy) for k in range(-4, 5)]
+    return [(random.choice(line), random.choice(line)) for _ in range(8)]
+
+
+def expected_crashes(moves, walls):
+    return [any(intersect(move, wall) for wall in walls) for move in moves]
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    random.seed(0)
+    # small coordinate ranges make touching, overlapping and collinear segments frequent
+    for size in (3, 6, 40):
+        for _ in range(20):
+            moves = [random_segment(size) for _ in range(30)]
+            walls = tuple(random_segment(size) for _ in range(random.randint(1, 30)))
+            exp_0 = [[intersect(move, wall) for wall in walls] for move in moves]
+            assert intersect_matrix(moves, walls).tolist() == exp_0, "Result matrix and expected matrix are not same"
+            exp_1 = expected_crashes(moves, walls)
+            assert crashes(moves, walls).tolist() == exp_1, "Result crashes and expected crashes are not same"
+            assert [crash(move, walls) for move in moves] == exp_1, "Result crash and expected crash are not same"
+            for cell_size in (None, 1, 5):
+                grid = WallGrid(walls, cell_size=cell_size)
+                assert crashes(moves, grid).tolist() == exp_1, "WallGrid crashes and expected crashes are not same"
+                assert [crash(move, grid) for move in moves] == exp_1, "WallGrid crash and expected crash not same"
+    for _ in range(50):
+        moves, walls = collinear_segments(10), collinear_segments(10)
+        exp_2 = expected_crashes(moves, walls)
+        assert crashes(moves, walls).tolist() == exp_2, "Collinear crashes and expected crashes are not same"
+        assert crashes(moves, WallGrid(walls, cell_size=2)).tolist() == exp_2, "Collinear WallGrid crashes not same"
+
+    # the grid gives the same results as the test against all the walls: moves spanning many cells, moves (partly)
+    # outside the grid, and batches small enough for the grid to test them against all the walls
+    rng = np.random.RandomState(0)
+    walls = tuple(random_segment(60) for _ in range(200))
+    for cell_size in (None, 1, 3, 17, 100):
+        grid = WallGrid(walls, cell_size=cell_size)
+        for n_moves in (1, 5, 2 * GRID_MIN_PAIRS // len(walls), 2000):
+            starts = rng.randint(-10, 71, size=(n_moves, 2))
+            moves = np.hstack([starts, starts + rng.randint(-60, 61, size=(n_moves, 2))])
+            # a few short moves, which only overlap one cell
+            moves[::3, 2:] = moves[::3, :2] + rng.randint(-1, 2, size=moves[::3, :2].shape)
+            assert crashes(moves, grid).tolist() == crashes(moves, walls).tolist(), "WallGrid and walls differ"
+        assert grid.crashes(np.zeros((0, 4), dtype=np.int64)).shape == (0,), "Expected no result"
+    moves = [random_segment(60) for _ in range(50)]
+    assert crashes(moves, walls).tolist() == expected_crashes(moves, walls), "Crashes and expected crashes differ"
+    assert not WallGrid(()).crashes(moves).any() and not crashes(moves, ()).any(), "No walls, no crashes"
+
+    # walls given as a list are converted on every call, so modifying them in place is seen by the next call
+    walls = [((0, 0), (10, 0))]
+    assert crash(((5, -5), (5, 5)), walls)
+    walls[0] = ((0, 10), (10, 10))
+    assert not crash(((5, -5), (5, 5)), walls), "Modified walls should be tested"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+Organization: University of Maryland at College Park
+"""
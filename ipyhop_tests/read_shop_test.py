@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+File Description: SHOP Solution Tree Reader Test File. Checks that read_SHOP rebuilds the solution tree, plan and node
+states of a SHOP solution tree in IPC format.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from functools import partial
+from os import remove
+from tempfile import NamedTemporaryFile
+from ipyhop import Methods, Actions, State, IPyHOP
+
+
+def a_load(state, pkg):
+    if state.loc[pkg] == state.loc['truck']:
+        state.loc[pkg] = 'truck'
+        return state
+
+
+def a_unload(state, pkg):
+    if state.loc[pkg] == 'truck':
+        state.loc[pkg] = state.loc['truck']
+        return state
+
+
+def a_drive(state, truck, x, y):
+    if state.loc[truck] == x:
+        state.loc[truck] = y
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_load, a_unload, a_drive])
+
+
+def tm_deliver(state, pkg, dest, rigid):
+    yield [('a_load', pkg), ('go', 'truck', dest), ('a_unload', pkg)]
+
+
+def tm_deliver_loaded(state, pkg, dest):
+    if state.loc[pkg] == 'truck':
+        yield [('go', 'truck', dest), ('a_unload', pkg)]
+
+
+def tm_go(state, truck, dest):
+    yield [('a_drive', truck, state.loc[truck], dest)]
+
+
+def tm_stay(state, truck, dest):
+    if state.loc[truck] == dest:
+        yield []
+
+
+methods = Methods()
+methods.declare_task_methods('deliver', [partial(tm_deliver, rigid={}), tm_deliver_loaded])
+methods.declare_task_methods('go', [tm_go, tm_stay])
+
+
+init_state = State("init_state")
+init_state.loc = {'truck': 'home', 'pkg1': 'home'}
+
+shop_tree = """==>
+1 (a_load PKG1)
+2 (a_drive truck home depot)
+3 (a_unload pkg1)
+4 (deliver pkg1 depot) -> tm_deliver 1 5 3
+5 (go truck depot) -> tm_go 2
+6 (go truck depot) -> tm_stay
+root 4 6
+<==
+"""
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    with NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(shop_tree)
+    try:
+        planner = IPyHOP(methods, actions)
+        planner.read_SHOP(f.name, init_state)
+    finally:
+        remove(f.name)
+
+    exp_0 = [('a_load', 'pkg1'), ('a_drive', 'truck', 'home', 'depot'), ('a_unload', 'pkg1')]
+    assert planner.sol_plan == exp_0, "Result plan and expected plan are not same"
+    sol_tree = planner.sol_tree
+    nodes = sol_tree.nodes
+    assert [*sol_tree.successors(0)] == [4, 6], "Expected top level tasks 4 and 6"
+    assert [*sol_tree.successors(4)] == [1, 5, 3], "Expected subtasks 1, 5 and 3"
+    assert [nodes[x]['depth'] for x in [0, 4, 1, 5, 2, 3, 6]] == [0, 1, 2, 2, 3, 2, 1], "Unexpected node depths"
+    assert nodes[4]['selected_method'].func is tm_deliver, "Expected partial method tm_deliver"
+    assert nodes[6]['selected_method'] is tm_stay, "Expected method tm_stay"
+    assert nodes[2]['action'] is actions.action_dict['a_drive'], "Expected action a_drive"
+    assert planner.id_counter == 6, "Expected id counter to be the largest node id"
+
+    # nodes hold the state before the next action at or after them in preorder
+    home, truck, depot = {'truck': 'home', 'pkg1': 'home'}, {'truck': 'home', 'pkg1': 'truck'}, \
+        {'truck': 'depot', 'pkg1': 'truck'}
+    exp_states = {4: home, 1: home, 5: truck, 2: truck, 3: depot, 6: {'truck': 'depot', 'pkg1': 'depot'}}
+    for node_id, loc in exp_states.items():
+        assert nodes[node_id]['state'].loc == loc, "Unexpected state of node " + str(node_id)
+
+    # the tree can be repaired, the truck is sent back home with the package
+    fail_state = planner.simulate(init_state)[2]
+    fail_state.loc['truck'] = 'home'
+    result = planner.replan(fail_state, 2)
+    exp_1 = [('a_drive', 'truck', 'home', 'depot'), ('a_unload', 'pkg1')]
+    assert result == (exp_1, 0), "Result repair and expected repair are not same"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
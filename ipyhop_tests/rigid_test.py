@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+File Description: Rigid State Variable Test File. Checks the inference of rigid state variables and that rigid
+variables are shared by the copies and snapshots of a state without changing the plans found by IPyHOP.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, StateSnapshotStore, infer_rigid
+
+
+def a_move(state, a, b):
+    if state.loc == a and b in state.roads[a]:
+        state.loc = b
+        state.visited[b] = True
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_move])
+
+
+def tm_travel(state, goal):
+    if state.loc == goal:
+        yield []
+    for b in sorted(state.roads[state.loc]):
+        if not state.visited[b]:
+            yield [('a_move', state.loc, b), ('travel', goal)]
+
+
+methods = Methods()
+methods.declare_task_methods('travel', [tm_travel])
+
+
+init_state = State("init_state")
+init_state.loc = 'a'
+init_state.visited = {'a': True, 'b': False, 'c': False, 'd': False}
+init_state.roads = {'a': {'b', 'c'}, 'b': {'a'}, 'c': {'a', 'd'}, 'd': {'c'}}
+init_state.names = {'a': 'home', 'd': 'work'}
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('travel', 'd')]
+    planner = IPyHOP(methods, actions)
+    exp_0 = planner.plan(init_state, task_list)
+    assert exp_0 == [('a_move', 'a', 'c'), ('a_move', 'c', 'd')], "Unexpected plan"
+
+    # roads and names are never written by the actions
+    rigid = infer_rigid(planner, init_state, task_list)
+    assert rigid == {'roads', 'names'}, "Rigid variables are not inferred correctly"
+    assert infer_rigid(planner, init_state, task_list, fluent=['names']) == {'roads'}, "Fluent names are not excluded"
+    assert planner.plan(init_state, task_list) == exp_0, "The dry run should not modify the planner"
+
+    # rigid variables are shared by copies and snapshots, fluent variables are copied
+    state = init_state.copy().declare_rigid(rigid)
+    assert state.rigid_names() == rigid and init_state.rigid_names() == frozenset(), "Rigid names are not declared"
+    state_copy = state.copy()
+    assert state_copy.roads is state.roads and state_copy.names is state.names, "Rigid variables should be shared"
+    assert state_copy.visited is not state.visited and state_copy == state, "Fluent variables should be copied"
+    assert 'roads' in str(state) and '__rigid__' not in str(state), "Unexpected state string"
+    for snapshot_store in (None, StateSnapshotStore()):
+        planner = IPyHOP(methods, actions, snapshot_store=snapshot_store)
+        assert planner.plan(state, task_list) == exp_0, "Result plan and expected plan are not same"
+        states = [node['state'] for _, node in planner.sol_tree.nodes(data=True) if node.get('state') is not None]
+        assert states and all(node_state.roads is state.roads for node_state in states), \
+            "Snapshots should share rigid variables"
+    assert state.visited == init_state.visited, "Planning should not modify the initial state"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+File Description: Rovers Navigation Test File. Checks that the paths of the rovers NavigationIndex are the ones the
+breadth first search over whole paths (that it replaces) returns.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+import os
+from examples.rovers.domain.actions import actions
+from examples.rovers.domain.methods import methods
+from examples.rovers.rovers_example import init_rovers
+
+
+def bfs_path(can_traverse, r, f, t):
+    # the breadth first search previously used by the rovers methods
+    rover_can_traverse = can_traverse[r]
+    curr_wp = f
+    paths = [*map(lambda y: (y,), filter(lambda x: x[0] == curr_wp, rover_can_traverse))]
+    new_paths = paths
+    visited = set()
+    while True:
+        if any(map(lambda x: x[-1][1] == t, new_paths)) or paths == []:
+            break
+        active_path = paths.pop(0)
+        curr_wp = active_path[-1][1]
+        viable_traversals = filter(lambda x: x[0] == curr_wp and x[1] not in visited, rover_can_traverse)
+        new_paths = [(*active_path, traversal) for traversal in viable_traversals]
+        paths += new_paths
+        visited.add(curr_wp)
+    usable_paths = [*filter(lambda x: x[-1][1] == t, new_paths)]
+    if len(usable_paths) > 0:
+        return usable_paths[0]
+    else:
+        return None
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    problems_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'rovers', 'problems')
+    n_paths = 0
+    for name in ('p01.pddl', 'p04.pddl', 'p08.pddl'):
+        with open(os.path.join(problems_dir, name), 'r') as problem_file:
+            _, _, rigid = init_rovers(problem_file.read(), actions, methods)
+        can_traverse, navigation = rigid['can_traverse'], rigid['navigation']
+        waypoints = rigid['type_dict']['waypoint']
+        for r in can_traverse:
+            for f in waypoints:
+                for t in waypoints:
+                    if f == t:
+                        continue
+                    exp_0 = bfs_path(can_traverse, r, f, t)
+                    assert navigation.path(r, f, t) == exp_0, "Result path and expected path are not same"
+                    assert navigation.reachable(r, f, t) == (exp_0 is not None), "Unexpected reachability"
+                    assert navigation.distance(r, f, t) == (None if exp_0 is None else len(exp_0))
+                    n_paths += exp_0 is not None
+    assert n_paths > 0, "Expected reachable waypoints"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+File Description: Search Strategy Test File. Checks that every search strategy finds a plan and produces a solution
+tree that works with hddl_plan_str and replan.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, DepthFirstSearch, LimitedDiscrepancySearch, BestFirstSearch, \
+    BeamSearch
+
+
+def a_taxi(state, x):
+    state.loc = x
+    state.cost += 10
+    return state
+
+
+def a_walk(state, x):
+    state.loc = x
+    state.cost += 1
+    return state
+
+
+def a_visit(state, x):
+    # the park can only be visited after the zoo
+    if state.loc == x and (x != 'park' or 'zoo' in state.visited):
+        state.visited = state.visited | {x}
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_taxi, a_walk, a_visit])
+actions.declare_action_models({'a_taxi': [1, 0], 'a_walk': [1, 0], 'a_visit': [1, 0]},
+                              {'a_taxi': 10.0, 'a_walk': 1.0, 'a_visit': 0.0})
+
+
+def tm_go_taxi(state, x):
+    yield [('a_taxi', x)]
+
+
+def tm_go_walk(state, x):
+    yield [('a_walk', x)]
+
+
+def tm_tour(state, x, y):
+    # the first instance visits the places out of order
+    for first, second in [(x, y), (y, x)]:
+        yield [('go', first), ('a_visit', first), ('go', second), ('a_visit', second)]
+
+
+def tm_get_to(state, x):
+    # never ends: a taxi, then ever longer detours on foot
+    yield [('a_taxi', x)]
+    detour = 1
+    while True:
+        yield [('a_walk', 'somewhere')] * detour + [('a_walk', x)]
+        detour += 1
+
+
+methods = Methods()
+methods.declare_task_methods('go', [tm_go_taxi, tm_go_walk])
+methods.declare_task_methods('tour', [tm_tour])
+methods.declare_task_methods('get_to', [tm_get_to])
+
+
+init_state = State("init_state")
+init_state.loc = 'home'
+init_state.cost = 0
+init_state.visited = frozenset()
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('tour', 'park', 'zoo')]
+    exp_taxi = [('a_taxi', 'zoo'), ('a_visit', 'zoo'), ('a_taxi', 'park'), ('a_visit', 'park')]
+    exp_walk = [('a_walk', 'zoo'), ('a_visit', 'zoo'), ('a_walk', 'park'), ('a_visit', 'park')]
+
+    expected_plans = [(DepthFirstSearch(), exp_taxi), (LimitedDiscrepancySearch(), exp_taxi),
+                      (BestFirstSearch(), exp_walk), (BeamSearch(2), exp_walk)]
+    for strategy, exp_plan in expected_plans:
+        planner = IPyHOP(methods, actions, search_strategy=strategy)
+        plan = planner.plan(init_state, task_list)
+        assert plan == exp_plan, "Result plan and expected plan are not same for " + type(strategy).__name__
+        hddl_str = planner.hddl_plan_str()
+        assert hddl_str.startswith("==>\n") and hddl_str.endswith("<==\n"), "Invalid hddl plan string"
+        # the agent is sent back home before going to the park, replan from there
+        fail_state = planner.simulate(init_state)[2]
+        fail_state.loc = 'home'
+        result = planner.replan(fail_state, 2)
+        assert result is not False, "Replanning failed for " + type(strategy).__name__
+
+    # instances are generated lazily, so methods that never stop yielding instances can be ranked
+    for strategy in (BestFirstSearch(), BeamSearch(2), BestFirstSearch(lookahead=3)):
+        planner = IPyHOP(methods, actions, search_strategy=strategy)
+        plan = planner.plan(init_state, [('get_to', 'zoo')])
+        assert plan == [('a_walk', 'somewhere'), ('a_walk', 'zoo')], "Unexpected plan for " + type(strategy).__name__
+    planner = IPyHOP(methods, actions, search_strategy=BestFirstSearch(lookahead=1))
+    assert planner.plan(init_state, [('get_to', 'zoo')]) == [('a_taxi', 'zoo')], "Unexpected plan for lookahead=1"
+
+    # limited discrepancy search needs a discrepancy to skip the first tour instance
+    strategy = LimitedDiscrepancySearch()
+    IPyHOP(methods, actions, search_strategy=strategy).plan(init_state, task_list)
+    assert strategy.discrepancy_limit == 1, "Expected a discrepancy limit of 1"
+
+    # beam search is incomplete, a beam of one only keeps the first tour instance
+    planner = IPyHOP(methods, actions, search_strategy=BeamSearch(1))
+    assert planner.plan(init_state, task_list) is False, "Planning should fail with beam_width=1"
+
+    # a discrepancy limit that is too low makes planning fail
+    planner = IPyHOP(methods, actions, search_strategy=LimitedDiscrepancySearch(max_discrepancies=0))
+    assert planner.plan(init_state, task_list) is False, "Planning should fail with max_discrepancies=0"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+File Description: Planning Session Test File. Checks that planning sessions can be stepped and interleaved, and give
+the same results as blocking plan and replan calls.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_step])
+
+
+def tm_detour(state, n):
+    yield [('a_step', 1), ('a_step', 3)]
+
+
+def tm_count(state, n):
+    if state.count < n:
+        yield [('a_step', state.count + 1), ('count', n)]
+    else:
+        yield []
+
+
+methods = Methods()
+methods.declare_task_methods('count', [tm_detour, tm_count])
+
+
+init_state = State("init_state")
+init_state.count = 0
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    exp_0 = [('a_step', n) for n in range(1, 5)]
+    exp_1 = [('a_step', n) for n in range(1, 8)]
+
+    # two planning problems interleaved one node expansion at a time
+    planner_0, planner_1 = IPyHOP(methods, actions), IPyHOP(methods, actions)
+    sessions = [planner_0.plan_session(init_state, [('count', 4)]),
+                planner_1.plan_session(init_state, [('count', 7)])]
+    steps = 0
+    while not all(session.done for session in sessions):
+        for session in sessions:
+            session.step(max_expansions=1)
+        steps += 1
+    assert sessions[0].result == exp_0 and sessions[1].result == exp_1, "Result plans and expected plans are not same"
+    # the last step only completes the session
+    assert steps == planner_1.node_expansions + 1, "Expected one node expansion per step"
+    assert sessions[0].step(), "A finished session stays finished"
+
+    # stepping gives the same solution tree as a blocking plan call
+    planner = IPyHOP(methods, actions)
+    assert planner.plan(init_state, [('count', 7)]) == exp_1, "Result plan and expected plan are not same"
+    assert [*planner.sol_tree.nodes] == [*planner_1.sol_tree.nodes], "Solution trees are not same"
+
+    # a replan session repairs the plan like replan
+    fail_state = planner.simulate(init_state)[3]
+    fail_state.count = 1
+    exp_2 = planner.replan(fail_state.copy(), 3)
+    planner.plan(init_state, [('count', 7)])
+    session = planner.replan_session(fail_state.copy(), 3)
+    while not session.step(max_expansions=2):
+        assert session.reason == 'expansions', "Expected the expansion budget to be exhausted"
+    assert session.result == exp_2, "Result repair and expected repair are not same"
+
+    # a new planning call discards the unfinished session
+    session = planner.plan_session(init_state, [('count', 7)])
+    session.step(max_expansions=1)
+    planner.plan(init_state, [('count', 4)])
+    try:
+        session.step()
+        assert False, "A discarded session cannot be stepped"
+    except ValueError:
+        pass
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
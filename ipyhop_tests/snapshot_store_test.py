@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+File Description: State Snapshot Store Test File. Checks that the snapshot store shares equal state snapshots without
+changing the plans found by IPyHOP, and that it forgets the snapshots of backtracked nodes.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, IPyHOP, StateSnapshotStore
+
+
+def a_step(state, n):
+    if state.count == n - 1:
+        state.count = n
+        return state
+
+
+def a_try(state, k):
+    state.tries.append(k)
+    return state
+
+
+actions = Actions()
+actions.declare_actions([a_step, a_try])
+
+
+def tm_run(state, n):
+    yield [('count', n)]
+
+
+def tm_detour(state, n):
+    yield [('a_step', 1), ('a_step', 3)]
+
+
+def tm_count(state, n):
+    if state.count < n:
+        yield [('a_step', state.count + 1), ('count', n)]
+    else:
+        yield []
+
+
+def tm_search(state, n):
+    # every attempt records itself, so the snapshots of its steps are new, and all but the last one fail
+    for k in range(50):
+        yield [('a_try', k), ('steps', n, k == 49)]
+
+
+def tm_steps(state, n, last):
+    if state.count < n:
+        yield [('a_step', state.count + 1), ('steps', n, last)]
+    elif last:
+        yield [('a_step', n + 1)]
+
+
+methods = Methods()
+methods.declare_task_methods('run', [tm_run])
+methods.declare_task_methods('count', [tm_detour, tm_count])
+methods.declare_task_methods('search', [tm_search])
+methods.declare_task_methods('steps', [tm_steps])
+
+
+init_state = State("init_state")
+init_state.count = 0
+init_state.roads = {'a': ['b', 'c'], 'b': ['a'], 'c': ['a']}
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    task_list = [('run', 6)]
+    planner = IPyHOP(methods, actions)
+    exp_0 = planner.plan(init_state, task_list)
+    store = StateSnapshotStore()
+    planner = IPyHOP(methods, actions, snapshot_store=store)
+    assert planner.plan(init_state, task_list) == exp_0, "Result plan and expected plan are not same"
+
+    # equal snapshots are shared, and unchanged variables share the value of the parent snapshot
+    nodes = planner.sol_tree.nodes
+    run_id, count_id = 1, next(planner.sol_tree.successors(1))
+    assert nodes[run_id]['state'] is nodes[count_id]['state'], "Equal snapshots should be shared"
+    states = [nodes[x]['state'] for x in nodes if nodes[x]['type'] == 'T']
+    assert all(state.roads is states[0].roads for state in states), "Unchanged variables should be shared"
+    assert [state.count for state in states] == [0, 0, 1, 2, 3, 4, 5, 6], "Snapshots should keep their values"
+    # snapshots do not share anything with the planner's state
+    planner.state.roads['a'].append('d')
+    assert states[-1].roads['a'] == ['b', 'c'], "Snapshots should not change with the planner's state"
+
+    report = store.memory_report()
+    assert report['snapshots_stored'] < report['snapshots_requested'], "Some snapshots should be shared"
+    assert report['store_bytes'] < report['copy_bytes'], "The store should use less memory than copies"
+
+    # replanning works on shared snapshots
+    fail_state = planner.simulate(init_state)[3]
+    fail_state.count = 1
+    exp_1 = IPyHOP(methods, actions)
+    exp_1.plan(init_state, task_list)
+    assert planner.replan(fail_state.copy(), 3) == exp_1.replan(fail_state.copy(), 3), "Repairs are not same"
+
+    # the snapshots of backtracked nodes are forgotten, the store only holds the snapshots of the solution tree
+    search_state = init_state.copy()
+    search_state.tries = []
+    planner = IPyHOP(methods, actions, snapshot_store=store)
+    assert planner.plan(search_state, [('search', 5)]) == [('a_try', 49)] + [('a_step', i) for i in range(1, 7)]
+    held = {id(node['state']) for _, node in planner.sol_tree.nodes(data=True) if node.get('state') is not None}
+    report = store.memory_report()
+    assert report['snapshots_requested'] > 50, "Every attempt should request snapshots"
+    assert len(store) <= len(held) and report['snapshots_stored'] == len(store), "Store should not grow with attempts"
+    assert report['values_stored'] <= 2 * len(held), "Values of forgotten snapshots should be forgotten"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
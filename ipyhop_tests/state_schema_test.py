@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+File Description: State Schema Test File. Checks that the states generated by state_schema copy, compare, hash and
+pickle like States, and that IPyHOP finds the same plans with them.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from copy import deepcopy
+import pickle
+import sys
+from timeit import timeit
+from ipyhop import Methods, Actions, State, IPyHOP, StateSnapshotStore, state_schema, SCALAR, SET, DICT, \
+    DICT_OF_SETS
+
+
+def a_move(state, agent, a, b):
+    if state.loc[agent] == a and b in state.roads[a]:
+        state.loc[agent] = b
+        state.visited.add(b)
+        state.moves += 1
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_move])
+
+
+def gm_travel(state, agent, goal):
+    a = state.loc[agent]
+    for b in sorted(state.roads[a]):
+        if b not in state.visited:
+            yield [('a_move', agent, a, b), ('loc', agent, goal)]
+
+
+def tm_tour(state, agent, goals):
+    yield [('loc', agent, goal) for goal in goals]
+
+
+methods = Methods()
+methods.declare_goal_methods('loc', [gm_travel])
+methods.declare_task_methods('tour', [tm_tour])
+
+
+init_state = State("init_state")
+init_state.loc = {'me': 'a'}
+init_state.visited = {'a'}
+init_state.roads = {'a': {'b', 'c'}, 'b': {'a'}, 'c': {'a', 'd'}, 'd': {'c', 'e'}, 'e': {'d'}}
+init_state.moves = 0
+
+TravelState = state_schema('TravelState', {'loc': DICT, 'visited': SET, 'roads': DICT_OF_SETS, 'moves': SCALAR})
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    state = TravelState.from_vars(vars(init_state))
+    assert type(state) is TravelState and state == init_state and init_state == state, "Conversion failed"
+    assert state_schema('TravelState', TravelState._schema) is TravelState, "Schema classes should be reused"
+    assert str(state) == str(init_state), "Unexpected state string"
+
+    # copies copy the containers, so modifying a copy leaves the original unchanged
+    state_copy = state.copy()
+    assert type(state_copy) is TravelState and state_copy == state and hash(state_copy) == hash(state)
+    state_copy.loc['me'] = 'b'
+    state_copy.visited.add('b')
+    state_copy.roads['a'].add('e')
+    state_copy.moves += 1
+    assert state == init_state and state_copy != state, "Copies should be independent"
+    for state_clone in (deepcopy(state), pickle.loads(pickle.dumps(state))):
+        assert type(state_clone) is TravelState and state_clone == state, "Deep copy or pickle failed"
+
+    # variables outside the schema are rejected, and no memory is spent on an instance __dict__
+    try:
+        state_copy.movs = 2
+        assert False, "Unknown variables should be rejected"
+    except AttributeError:
+        pass
+    assert TravelState.__dictoffset__ == 0 and 'movs' not in vars(state_copy), "Schema states should have no __dict__"
+    assert sys.getsizeof(state_copy) < sys.getsizeof(init_state) + sys.getsizeof(vars(init_state))
+
+    # rigid variables are shared by copies
+    rigid_state = state.copy().declare_rigid(['roads'])
+    rigid_copy = rigid_state.copy()
+    assert rigid_copy.rigid_names() == {'roads'} and rigid_copy.roads is rigid_state.roads
+    assert rigid_copy.visited is not rigid_state.visited, "Fluent variables should be copied"
+
+    # IPyHOP finds the same plans with schema states
+    task_list = [('tour', 'me', ('d', 'e'))]
+    exp_0 = IPyHOP(methods, actions).plan(init_state, task_list)
+    assert exp_0 == [('a_move', 'me', 'a', 'c'), ('a_move', 'me', 'c', 'd'), ('a_move', 'me', 'd', 'e')]
+    for snapshot_store in (None, StateSnapshotStore()):
+        planner = IPyHOP(methods, actions, snapshot_store=snapshot_store)
+        assert planner.plan(state, task_list) == exp_0, "Result plan and expected plan are not same"
+        assert type(planner.state) is TravelState and planner.state.moves == 3
+    assert state == init_state, "Planning should not modify the initial state"
+
+    # the specialized copy is faster than the deep copy of a State
+    assert timeit(state.copy, number=2000) < timeit(init_state.copy, number=2000), "Schema copy should be faster"
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+File Description: Tail Splicing Test File. Checks that IPyHOP with tail splicing finds the same plans and repairs
+as without it, with recursive method instances spliced in as siblings so the solution tree stays shallow.
+"""
+
+# ******************************************    Libraries to be imported    ****************************************** #
+from ipyhop import Methods, Actions, State, MultiGoal, IPyHOP, LimitedDiscrepancySearch, mgm_split_multigoal, \
+    PlannerInstrumentation
+
+
+def a_move(state, a, b):
+    if state.loc == a and b in state.roads[a]:
+        state.loc = b
+        return state
+
+
+def a_deliver(state, o):
+    if state.loc == state.address[o] and not state.delivered[o]:
+        state.delivered[o] = True
+        return state
+
+
+actions = Actions()
+actions.declare_actions([a_move, a_deliver])
+
+
+def tm_travel(state, goal):
+    # dead ends (and cycles, pruned by the branch cycle check) make the planner backtrack into spliced nodes
+    if state.loc == goal:
+        yield []
+    for b in sorted(state.roads[state.loc]):
+        yield [('a_move', state.loc, b), ('travel', goal)]
+
+
+def gm_deliver(state, o, val):
+    if val:
+        yield [('travel', state.address[o]), ('a_deliver', o)]
+
+
+def mgm_split(state, multigoal):
+    yield mgm_split_multigoal(state, multigoal)
+
+
+methods = Methods()
+methods.declare_task_methods('travel', [tm_travel])
+methods.declare_goal_methods('delivered', [gm_deliver])
+methods.declare_multigoal_methods(None, [mgm_split])
+
+
+def new_problem():
+    state = State('init_state')
+    state.loc = 'a'
+    state.roads = {'a': {'b', 'c'}, 'b': {'a', 'x'}, 'c': {'a', 'd', 'g'}, 'd': {'c', 'e'}, 'e': {'d', 'f', 'g'},
+                   'f': {'e'}, 'g': {'c', 'e'}, 'x': {'b'}}
+    state.address = {'o1': 'f', 'o2': 'c'}
+    state.delivered = {'o1': False, 'o2': False}
+    goal = MultiGoal('goal')
+    goal.delivered = {'o1': True, 'o2': True}
+    return state, goal
+
+
+def max_depth(planner) -> int:
+    return max(node['depth'] for node_id, node in planner.sol_tree.nodes(data=True))
+
+
+# ******************************************        Main Program Start      ****************************************** #
+def main():
+    state, goal = new_problem()
+    task_list = [('travel', 'f'), ('travel', 'a')]
+    for tasks in (task_list, [goal]):
+        planner = IPyHOP(methods, actions)
+        exp_0 = planner.plan(state, tasks)
+        assert exp_0, "Planning failed"
+        spliced_planner = IPyHOP(methods, actions, tail_splicing=True)
+        assert spliced_planner.plan(state, tasks) == exp_0, "Result plan and expected plan are not same"
+        assert max_depth(spliced_planner) < max_depth(planner), "Tail splicing should make the tree shallower"
+        assert spliced_planner.node_expansions <= planner.node_expansions
+        # instrumented planners splice tails too
+        instrumentation = PlannerInstrumentation()
+        instrumented_planner = IPyHOP(methods, actions, tail_splicing=True, instrumentation=instrumentation)
+        assert instrumented_planner.plan(state, tasks) == exp_0, "Instrumented plan and expected plan are not same"
+        assert max_depth(instrumented_planner) == max_depth(spliced_planner), "Unexpected instrumented tree depth"
+        assert instrumentation.report()['timers']['networkx'] > 0, "Node insertions should be timed"
+        # spliced tails are written as children of the node they were spliced from
+        if tasks is task_list:
+            assert spliced_planner.hddl_plan_str() == planner.hddl_plan_str(), "IPC plans are not same"
+    assert exp_0[:2] == [('a_move', 'a', 'c'), ('a_move', 'c', 'd')], "Unexpected plan"
+
+    # depth bounds no longer bound recursive decompositions
+    assert IPyHOP(methods, actions).plan(state, task_list, initial_max_depth=4) is False
+    exp_1 = IPyHOP(methods, actions, tail_splicing=True).plan(state, task_list, initial_max_depth=4)
+    assert exp_1 == IPyHOP(methods, actions).plan(state, task_list), "Unexpected depth bounded plan"
+
+    # repairs are the same as without splicing (the road c - d is closed after the first move)
+    for search_strategy in (None, LimitedDiscrepancySearch()):
+        results = []
+        for tail_splicing in (False, True):
+            planner = IPyHOP(methods, actions, search_strategy=search_strategy, tail_splicing=tail_splicing)
+            plan = planner.plan(state, task_list)
+            failed_state = state.copy()
+            failed_state.loc = 'c'
+            failed_state.roads = {**state.roads, 'c': {'a', 'g'}, 'd': {'e'}}
+            results.append((plan, planner.replan(failed_state, 1)))
+        assert results[0] == results[1], "Result repair and expected repair are not same"
+    assert results[1][1][0][1:4] == [('a_move', 'c', 'g'), ('a_move', 'g', 'e'), ('a_move', 'e', 'f')]
+
+
+# ******************************************        Main Program End        ****************************************** #
+# ******************************************    Demo / Test Routine         ****************************************** #
+if __name__ == '__main__':
+    try:
+        main()
+        print('\nFile executed successfully!\n')
+    except KeyboardInterrupt:
+        print('\nProcess interrupted by user. Bye!')
+
+"""
+Author(s): Paul Zaidins
+Repository: https://github.com/pzaidins2/IPyHOP
+"""
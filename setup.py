@@ -3,7 +3,7 @@ from setuptools import setup
 setup(
     name='IPyHOPPER',
     version='0.0.1',
-    packages=[ 'ipyhop' ],
+    packages=[ 'ipyhop', 'ipyhop.bench' ],
     url='https://github.com/pzaidins2/IPyHOPPER.git',
     license='',
     author='paulz',